@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""Compare ``parser.get_object_name`` against the legacy implementation that built its dispatch dict per call.
+
+Usage::
+
+    python -m benchmarks.bench_names [PATH ...]
+
+Without paths the top-level modules of the Python standard library are used as corpus. Every attribute, call,
+decorator, argument and class of the corpus is named, like the class collector does.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import pathlib
+import sysconfig
+import timeit
+from typing import TYPE_CHECKING
+
+from benchmarks import bench_parser
+from flake8_cohesion import parser
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+def legacy_get_object_name(obj: ast.AST) -> str:
+    """Return the name of a given object the way it was done before the module level dispatch table."""
+    name_dispatch: dict[type[ast.AST], str] = {
+        ast.Name: "id",
+        ast.Attribute: "attr",
+        ast.Call: "func",
+        ast.FunctionDef: "name",
+        ast.ClassDef: "name",
+        ast.Subscript: "value",
+        ast.arg: "arg",
+    }
+
+    while not isinstance(obj, str):
+        obj = getattr(obj, name_dispatch[type(obj)])
+
+    return obj
+
+
+def named_nodes(trees: Iterable[ast.AST]) -> list[ast.AST]:
+    """Return the nodes of the trees that are named while collecting classes."""
+    nodes: list[ast.AST] = []
+    for tree in trees:
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.Attribute, ast.Call, ast.arg, ast.ClassDef)):
+                nodes.append(node)
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                nodes.extend(node.decorator_list)
+
+    return nodes
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    argument_parser.add_argument("paths", nargs="*", type=pathlib.Path)
+    argument_parser.add_argument("--repeat", type=int, default=5)
+    args = argument_parser.parse_args()
+
+    roots = args.paths or sorted(pathlib.Path(sysconfig.get_paths()["stdlib"]).glob("*.py"))
+    files = [file for root in roots for file in ([root] if root.is_file() else sorted(root.rglob("*.py")))]
+    nodes = named_nodes(bench_parser.load_trees(files))
+
+    # the legacy implementation cannot name every node, e.g. immediately called lambdas
+    legacy_nodes = []
+    for node in nodes:
+        try:
+            name = legacy_get_object_name(node)
+        except KeyError:
+            continue
+        if parser.get_object_name(node) != name:
+            raise SystemExit(f"names differ for {ast.dump(node)}")
+        legacy_nodes.append(node)
+
+    def run(get_object_name: object) -> float:
+        def target() -> None:
+            for node in legacy_nodes:
+                get_object_name(node)  # type: ignore[operator]
+
+        return min(timeit.repeat(target, number=1, repeat=args.repeat))
+
+    legacy = run(legacy_get_object_name)
+    current = run(parser.get_object_name)
+
+    print(f"nodes:    {len(nodes)} ({len(nodes) - len(legacy_nodes)} unnamed by legacy)")
+    print(f"legacy:   {legacy * 1e9 / len(legacy_nodes):.0f}ns per call")
+    print(f"current:  {current * 1e9 / len(legacy_nodes):.0f}ns per call")
+    print(f"speedup:  {legacy / current:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""Compare the single-pass class collector against the legacy per-predicate ``ast.walk`` structure builder.
+
+Usage::
+
+    python -m benchmarks.bench_parser [PATH ...]
+
+Without paths the top-level modules of the Python standard library are used as corpus.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import pathlib
+import sysconfig
+import timeit
+from typing import TYPE_CHECKING
+
+from flake8_cohesion import module
+from flake8_cohesion import parser
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+def legacy_create_structure(file_ast_node: ast.AST, strict: bool) -> dict:
+    """Build the module structure the way it was done before the single-pass collector."""
+    result = {}
+
+    for module_class in parser.get_module_classes(file_ast_node):
+        class_methods = {str(method.name): method for method in parser.get_class_methods(module_class)}
+        result[parser.get_object_name(module_class)] = {
+            "cohesion": None,
+            "lineno": module_class.lineno,
+            "col_offset": module_class.col_offset,
+            "variables": list(parser.get_all_class_variable_names(module_class, strict)),
+            "functions": {
+                method_name: {
+                    "variables": list(parser.get_all_class_variable_names_used_in_method(method)),
+                    "bounded": parser.is_class_method_bound(method),
+                    "staticmethod": parser.is_class_method_staticmethod(method),
+                    "classmethod": parser.is_class_method_classmethod(method),
+                    "property": parser.is_class_method_property(method),
+                    "abstractmethod": parser.is_class_method_abstractmethod(method),
+                    "passing": parser.is_class_method_only_passing(method),
+                }
+                for method_name, method in class_methods.items()
+            },
+        }
+
+    return result
+
+
+def normalize(structure: dict) -> dict:
+    """Return a structure with order independent variable collections."""
+    return {
+        class_name: {
+            **class_structure,
+            "variables": sorted(class_structure["variables"]),
+            "functions": {
+                function_name: {**function_structure, "variables": sorted(function_structure["variables"])}
+                for function_name, function_structure in class_structure["functions"].items()
+            },
+        }
+        for class_name, class_structure in structure.items()
+    }
+
+
+def load_trees(paths: Iterable[pathlib.Path]) -> list[ast.AST]:
+    trees = []
+    for path in paths:
+        try:
+            trees.append(parser.get_ast_node_from_file(path))
+        except (SyntaxError, ValueError):
+            continue
+
+    return trees
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    argument_parser.add_argument("paths", nargs="*", type=pathlib.Path)
+    argument_parser.add_argument("--repeat", type=int, default=3)
+    args = argument_parser.parse_args()
+
+    roots = args.paths or sorted(pathlib.Path(sysconfig.get_paths()["stdlib"]).glob("*.py"))
+    files = [file for root in roots for file in ([root] if root.is_file() else sorted(root.rglob("*.py")))]
+    trees = load_trees(files)
+
+    for strict in (False, True):
+        for tree in trees:
+            expected = normalize(legacy_create_structure(tree, strict))
+            structure = module.Module._create_structure(tree, strict)
+            # the legacy structure is keyed by plain class names, later classes overwrite earlier namesakes
+            by_name = {class_structure.name: class_structure for class_structure in structure.values()}
+            if normalize(by_name) != expected:
+                raise SystemExit("collector output differs from legacy output")
+
+    def run(create_structure: object) -> float:
+        def target() -> None:
+            for tree in trees:
+                create_structure(tree, False)  # type: ignore[operator]
+
+        return min(timeit.repeat(target, number=1, repeat=args.repeat))
+
+    legacy = run(legacy_create_structure)
+    single_pass = run(module.Module._create_structure)
+
+    print(f"files:       {len(trees)}")
+    print(f"legacy:      {legacy:.3f}s")
+    print(f"single pass: {single_pass:.3f}s")
+    print(f"speedup:     {legacy / single_pass:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""Synthetic and real-world source corpora for the benchmarks."""
+
+from __future__ import annotations
+
+import pathlib
+import sysconfig
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterator
+
+    # name and source of a file
+    Source = tuple[str, str]
+
+
+SCALES = {
+    "small": 1,
+    "medium": 4,
+    "large": 16,
+}
+
+
+def generate_class(name: str, methods: int, attributes: int, indent: str = "", asynchronous: bool = False) -> str:
+    """Return the source of a class whose methods use overlapping windows of its attributes."""
+    keyword = "async def" if asynchronous else "def"
+    lines = [f"{indent}class {name}:", f"{indent}    def __init__(self):"]
+    lines.extend(f"{indent}        self.attribute_{i} = {i}" for i in range(attributes))
+    for method in range(methods):
+        lines.append(f"{indent}    {keyword} method_{method}(self, value):")
+        used = [(method + offset) % max(attributes, 1) for offset in range(min(3, attributes))]
+        lines.extend(f"{indent}        self.attribute_{i} += value" for i in used)
+        lines.append(f"{indent}        self.method_{(method + 1) % methods}(value)")
+    lines.append(f"{indent}    @property")
+    lines.append(f"{indent}    def total(self):")
+    lines.append(f"{indent}        return {' + '.join(f'self.attribute_{i}' for i in range(attributes)) or 0}")
+    return "\n".join(lines) + "\n"
+
+
+def many_small_classes(scale: int) -> Iterator[Source]:
+    """Yield files with many small classes."""
+    for file in range(10 * scale):
+        yield f"small_{file}.py", "".join(generate_class(f"Small{i}", 3, 4) for i in range(50))
+
+
+def few_huge_classes(scale: int) -> Iterator[Source]:
+    """Yield files with few classes that have hundreds of methods and attributes."""
+    for file in range(scale):
+        yield f"huge_{file}.py", "".join(generate_class(f"Huge{i}", 250, 150) for i in range(2))
+
+
+def async_services(scale: int) -> Iterator[Source]:
+    """Yield files with classes of async methods that define nested helper functions."""
+    for file in range(10 * scale):
+        classes = []
+        for i in range(50):
+            header, *body = generate_class(f"Service{i}", 6, 4, asynchronous=True).splitlines()
+            helper = [
+                "    async def helper(self):",
+                "        async def nested():",
+                "            return self.attribute_0",
+            ]
+            classes.append("\n".join([header, *helper, "        return await nested()", *body]) + "\n")
+        yield f"service_{file}.py", "".join(classes)
+
+
+def generated_serializers(scale: int) -> Iterator[Source]:
+    """Yield files of generated code with many structurally identical classes that only differ in their names."""
+    for file in range(10 * scale):
+        classes = []
+        for i in range(50):
+            header, *body = generate_class(f"Serializer{i}", 4, 4).splitlines()
+            meta = ["    class Meta:", "        fields = ['attribute_0', 'attribute_1']"]
+            classes.append("\n".join([header, *meta, *body]) + "\n")
+        yield f"serializers_{file}.py", "".join(classes)
+
+
+def nested_class(level: int, depth: int) -> str:
+    """Return the source of a class that contains the classes of all deeper levels."""
+    header, *body = generate_class(f"Level{level}", 3, 3, "    " * level).splitlines()
+    nested = nested_class(level + 1, depth).splitlines() if level + 1 < depth else []
+    return "\n".join([header, *nested, *body]) + "\n"
+
+
+def deep_nesting(scale: int) -> Iterator[Source]:
+    """Yield files with deeply nested classes."""
+    for file in range(5 * scale):
+        yield f"nested_{file}.py", nested_class(0, 40)
+
+
+def stdlib(scale: int) -> Iterator[Source]:
+    """Yield the top-level modules of the standard library, the whole standard library on the large scale."""
+    root = pathlib.Path(sysconfig.get_paths()["stdlib"])
+    paths = sorted(root.rglob("*.py")) if scale >= SCALES["large"] else sorted(root.glob("*.py"))
+    for path in paths:
+        try:
+            yield str(path.relative_to(root)), path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            continue
+
+
+CORPORA: dict[str, Callable[[int], Iterator[Source]]] = {
+    "many_small_classes": many_small_classes,
+    "few_huge_classes": few_huge_classes,
+    "deep_nesting": deep_nesting,
+    "async_services": async_services,
+    "generated_serializers": generated_serializers,
+    "stdlib": stdlib,
+}
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""Benchmark parsing, structure building and scoring over synthetic and real-world corpora.
+
+Usage::
+
+    python -m benchmarks.run [--scale small|medium|large] [--corpus NAME ...] [--output FILE] [--compare FILE]
+
+Every corpus is timed per phase (best of ``--repeat`` runs) and its peak memory of a full run is measured with
+tracemalloc. ``--output`` saves the results as JSON, ``--compare`` prints the ratio to a previously saved run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import TYPE_CHECKING
+
+import flake8_cohesion
+from benchmarks import corpora
+from flake8_cohesion import module
+from flake8_cohesion import parser
+from flake8_cohesion import vectorized
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    Results = dict[str, dict[str, float]]
+
+
+PHASES = ("parse", "structure", "memoized", "scoring")
+
+
+def parse(sources: Sequence[corpora.Source]) -> list[tuple[ast.AST, bytes]]:
+    # the trees are paired with their encoded source, sources that cannot be parsed are skipped
+    trees = []
+    for _, source in sources:
+        try:
+            trees.append((parser.get_ast_node_from_string(source), source.encode("utf-8")))
+        except (SyntaxError, ValueError):
+            continue
+
+    return trees
+
+
+def build(trees: Sequence[tuple[ast.AST, bytes]]) -> list[module.Module]:
+    modules = []
+    for tree, _ in trees:
+        file_module = module.Module(tree)
+        file_module.structure  # noqa: B018
+        modules.append(file_module)
+
+    return modules
+
+
+def structure(trees: Sequence[tuple[ast.AST, bytes]]) -> None:
+    for tree, _ in trees:
+        module.Module._create_structure(tree, False)
+
+
+def structure_memoized(trees: Sequence[tuple[ast.AST, bytes]]) -> None:
+    # every repetition starts with an empty memo, so only identical classes within the corpus are hits
+    module.structure_memo.resize(module.DEFAULT_MEMO_SIZE)
+    module.structure_memo.clear()
+    for tree, source in trees:
+        module.Module._create_structure(tree, False, source=source)
+
+    module.structure_memo.resize(0)
+
+
+def score(modules: Sequence[module.Module]) -> None:
+    for file_module in modules:
+        for class_name in file_module.classes:
+            file_module.structure[class_name].cohesion = None
+            file_module.class_cohesion_percentage(class_name)
+
+
+def score_vectorized(modules: Sequence[module.Module]) -> None:
+    vectorized.score([class_structure for file_module in modules for class_structure in file_module.structure.values()])
+
+
+def best_of(repeat: int, function: object, *args: object) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)  # type: ignore[operator]
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def run_corpus(sources: Sequence[corpora.Source], repeat: int) -> dict[str, float]:
+    trees = parse(sources)
+    modules = build(trees)
+
+    result = {
+        "files": float(len(sources)),
+        "classes": float(sum(len(file_module.classes) for file_module in modules)),
+        "parse": best_of(repeat, parse, sources),
+        "structure": best_of(repeat, structure, trees),
+        "memoized": best_of(repeat, structure_memoized, trees),
+        "scoring": best_of(repeat, score, modules),
+    }
+    if vectorized.HAS_NUMPY:
+        result["vectorized"] = best_of(repeat, score_vectorized, modules)
+    del trees, modules
+
+    tracemalloc.start()
+    for file_module in build(parse(sources)):
+        file_module.class_results()
+    result["peak_memory"] = float(tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+
+    return result
+
+
+def compare(results: Results, baseline: Results) -> None:
+    print(f"{'corpus':<20} {'metric':<12} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    for corpus, metrics in results.items():
+        for metric in (*PHASES, "vectorized", "peak_memory"):
+            if corpus not in baseline or metric not in baseline[corpus] or metric not in metrics:
+                continue
+            before = baseline[corpus][metric]
+            after = metrics[metric]
+            ratio = after / before if before else float("nan")
+            print(f"{corpus:<20} {metric:<12} {before:>12.4f} {after:>12.4f} {ratio:>8.2f}")
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    argument_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    argument_parser.add_argument("--scale", choices=corpora.SCALES, default="small")
+    argument_parser.add_argument("--corpus", choices=corpora.CORPORA, action="append")
+    argument_parser.add_argument("--repeat", type=int, default=3)
+    argument_parser.add_argument("--output", help="save the results as JSON")
+    argument_parser.add_argument("--compare", help="compare against results saved with --output")
+    args = argument_parser.parse_args(argv)
+
+    scale = corpora.SCALES[args.scale]
+    results: Results = {}
+    print(
+        f"{'corpus':<20} {'files':>6} {'classes':>8} {'parse':>8} {'struct':>8} {'memo':>8} {'score':>8} "
+        f"{'peak MiB':>9}"
+    )
+    for name in args.corpus or corpora.CORPORA:
+        sources = list(corpora.CORPORA[name](scale))
+        metrics = run_corpus(sources, args.repeat)
+        results[name] = metrics
+        print(
+            f"{name:<20} {metrics['files']:>6.0f} {metrics['classes']:>8.0f} {metrics['parse']:>8.3f} "
+            f"{metrics['structure']:>8.3f} {metrics['memoized']:>8.3f} {metrics['scoring']:>8.3f} "
+            f"{metrics['peak_memory'] / 2**20:>9.1f}"
+        )
+
+    if args.output:
+        document = {
+            "version": flake8_cohesion.__version__,
+            "python": platform.python_version(),
+            "scale": args.scale,
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(document, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if baseline.get("scale") != args.scale:
+            print(f"warning: comparing scale {args.scale} against {baseline.get('scale')}", file=sys.stderr)
+        compare(results, baseline["results"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+
+import sys
+
+from flake8_cohesion import cli
+
+if __name__ == "__main__":
+    sys.exit(cli.main())
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import concurrent.futures
+import fnmatch
+import itertools
+import os
+import pathlib
+from typing import TYPE_CHECKING
+
+from flake8_cohesion import module
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Generator
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+
+    from flake8_cohesion import diff
+    from flake8_cohesion.hierarchy import ClassIndex
+    from flake8_cohesion.module import ClassResult
+
+    ChunkFuture = concurrent.futures.Future[list["FileResult"]]
+
+
+DEFAULT_CHUNK_SIZE = 16
+# number of submitted chunks per worker, bounds the memory of pending results
+PENDING_CHUNKS_PER_WORKER = 4
+
+DEFAULT_EXCLUDE = (".svn", "CVS", ".bzr", ".hg", ".git", "__pycache__", ".tox", ".nox", ".eggs", "*.egg")
+
+EXECUTORS: dict[str, Callable[..., concurrent.futures.Executor]] = {
+    "process": concurrent.futures.ProcessPoolExecutor,
+    "thread": concurrent.futures.ThreadPoolExecutor,
+}
+
+
+class FileResult:
+    """Per-class cohesion results of a single file."""
+
+    __slots__ = ("path", "classes", "error")
+
+    def __init__(self, path: str, classes: Sequence[ClassResult], error: str | None = None) -> None:
+        self.path = path
+        self.classes = classes
+        self.error = error
+
+    def records(self, cohesion_below: float | None = None) -> Iterator[Record]:
+        """Yield the classes of the file, only the ones with a cohesion of ``cohesion_below`` or lower if given."""
+        for name, lineno, col_offset, cohesion, *_ in self.classes:
+            if cohesion_below is None or cohesion <= cohesion_below:
+                yield Record(self.path, name, lineno, col_offset, cohesion)
+
+
+class OptionError(ValueError):
+    """Raised for an option that requires another option."""
+
+    def __init__(self, option: str, required_option: str) -> None:
+        super().__init__(f"{option} requires {required_option}")
+
+
+class Record:
+    """Cohesion of a single class of a file."""
+
+    __slots__ = ("path", "name", "lineno", "col_offset", "cohesion")
+
+    def __init__(self, path: str, name: str, lineno: int, col_offset: int, cohesion: float) -> None:
+        self.path = path
+        self.name = name
+        self.lineno = lineno
+        self.col_offset = col_offset
+        self.cohesion = cohesion
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.path!r}, {self.name!r}, {self.lineno!r}, {self.cohesion!r})"
+
+
+def discover(paths: Iterable[str], exclude: Sequence[str] = DEFAULT_EXCLUDE) -> Iterator[str]:
+    """Yield the python files of the given files and directories in a stable order.
+
+    Like flake8, a file or directory is excluded if its name or its absolute path matches an ``exclude`` pattern.
+    """
+
+    for path in paths:
+        if pathlib.Path(path).is_dir():
+            yield from _discover_directory(path, exclude)
+        else:
+            yield path
+
+
+def _discover_directory(path: str, exclude: Sequence[str]) -> Iterator[str]:
+    for root, directories, files in os.walk(path):
+        directories[:] = sorted(directory for directory in directories if not _excluded(root, directory, exclude))
+        for file_name in sorted(files):
+            if file_name.endswith(".py") and not _excluded(root, file_name, exclude):
+                yield str(pathlib.Path(root, file_name))
+
+
+def _excluded(root: str, name: str, exclude: Sequence[str]) -> bool:
+    absolute_path = str(pathlib.Path(root, name).absolute())
+    return any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(absolute_path, pattern) for pattern in exclude)
+
+
+def score_many(
+    items: Iterable[str | os.PathLike[str] | tuple[str, str | bytes]],
+    strict: bool = False,
+    workers: int | None = 1,
+    executor: str = "process",
+    cohesion_below: float | None = None,
+    max_violations: int | None = None,
+    on_error: Callable[[str, str], None] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ignore_decorators: Iterable[str] = (),
+) -> Iterator[Record]:
+    """Yield the cohesion of every class in many files or in-memory sources.
+
+    If ``cohesion_below`` is given, only classes with this cohesion or lower are yielded and ``max_violations``
+    stops the scan after that many of them. Files that cannot be read or parsed are skipped after passing their
+    path and error to ``on_error``. See :func:`scan` for ``workers`` and ``executor``.
+    """
+    if max_violations is not None and cohesion_below is None:
+        raise OptionError("max_violations", "cohesion_below")
+
+    if max_violations is not None and max_violations <= 0:
+        return
+
+    file_results = scan(items, strict, workers, chunk_size, executor=executor, ignore_decorators=ignore_decorators)
+    try:
+        yield from itertools.islice(_records(file_results, cohesion_below, on_error), max_violations)
+    finally:
+        file_results.close()
+
+
+def _records(
+    file_results: Iterable[FileResult],
+    cohesion_below: float | None,
+    on_error: Callable[[str, str], None] | None,
+) -> Iterator[Record]:
+    for file_result in file_results:
+        if file_result.error is None:
+            yield from file_result.records(cohesion_below)
+        elif on_error is not None:
+            on_error(file_result.path, file_result.error)
+
+
+def scan(
+    items: Iterable[str | os.PathLike[str] | tuple[str, str | bytes]],
+    strict: bool = False,
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    line_ranges: Mapping[str, Sequence[diff.LineRange]] | None = None,
+    executor: str = "process",
+    ignore_decorators: Iterable[str] = (),
+    class_index: ClassIndex | None = None,
+) -> Generator[FileResult, None, None]:
+    """Yield the results of all files in chunks of ``chunk_size`` files as soon as a worker has finished them.
+
+    The files are scored in a ``process`` or ``thread`` pool of ``workers`` workers, the results are therefore not
+    ordered. With a single worker the files are scored in the calling thread in order. If ``line_ranges`` is given,
+    only the classes overlapping the line ranges of their file are scored. Chunks that have not been started yet are
+    cancelled when the iteration is stopped early. A ``class_index`` is sent to every worker once.
+    """
+    workers = workers or os.cpu_count() or 1
+    ignore_decorators = tuple(ignore_decorators)
+    iterator = iter(items)
+    chunks = iter(lambda: list(itertools.islice(iterator, chunk_size)), [])
+    if workers == 1:
+        for chunk in chunks:
+            yield from score_files(
+                chunk, strict, _chunk_line_ranges(chunk, line_ranges), ignore_decorators, class_index
+            )
+
+        return
+
+    with EXECUTORS[executor](max_workers=workers, initializer=_initialize_worker, initargs=(class_index,)) as pool:
+        # submitted lazily, once the results of earlier chunks are consumed
+        futures = (
+            pool.submit(score_files, chunk, strict, _chunk_line_ranges(chunk, line_ranges), ignore_decorators)
+            for chunk in chunks
+        )
+        yield from _completed(futures, workers * PENDING_CHUNKS_PER_WORKER)
+
+
+def _initialize_worker(class_index: ClassIndex | None) -> None:
+    global _worker_class_index
+    _worker_class_index = class_index
+
+
+def _completed(futures: Iterator[ChunkFuture], max_pending: int) -> Iterator[FileResult]:
+    # results are yielded as soon as their chunk is finished, chunks that have not been started yet are cancelled when
+    # the iteration is stopped early
+    pending = set(itertools.islice(futures, max_pending))
+    try:
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+            pending.update(itertools.islice(futures, len(done)))
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _chunk_line_ranges(
+    chunk: Sequence[str | os.PathLike[str] | tuple[str, str | bytes]],
+    line_ranges: Mapping[str, Sequence[diff.LineRange]] | None,
+) -> Mapping[str, Sequence[diff.LineRange]] | None:
+    # only the line ranges of its own files are sent with a chunk
+    if line_ranges is None:
+        return None
+
+    return {path: line_ranges.get(path, []) for path in map(item_path, chunk)}
+
+
+def score_files(
+    items: Sequence[str | os.PathLike[str] | tuple[str, str | bytes]],
+    strict: bool = False,
+    line_ranges: Mapping[str, Sequence[diff.LineRange]] | None = None,
+    ignore_decorators: Iterable[str] = (),
+    class_index: ClassIndex | None = None,
+) -> list[FileResult]:
+    """Return the cohesion of every class in a chunk of python files.
+
+    Without a ``class_index`` the index a worker was initialized with by :func:`scan` is used, if any.
+    """
+    class_index = class_index if class_index is not None else _worker_class_index
+    if line_ranges is None:
+        return [score_file(item, strict, None, ignore_decorators, class_index) for item in items]
+
+    return [
+        score_file(item, strict, line_ranges.get(item_path(item), []), ignore_decorators, class_index) for item in items
+    ]
+
+
+# class index of a pool worker, it is only sent once per worker instead of with every chunk
+_worker_class_index: ClassIndex | None = None
+
+
+def score_file(
+    item: str | os.PathLike[str] | tuple[str, str | bytes],
+    strict: bool = False,
+    line_ranges: Sequence[diff.LineRange] | None = None,
+    ignore_decorators: Iterable[str] = (),
+    class_index: ClassIndex | None = None,
+) -> FileResult:
+    """Return the cohesion of every class in a python file, or only of the classes overlapping the line ranges.
+
+    The item is either the path of a file or a tuple of a name and the content of a source. Methods with any of
+    ``ignore_decorators`` are not considered. Classes inherit the methods of their bases in the ``class_index``.
+    """
+    path = item_path(item)
+    module_name = class_index.module_name(path) if class_index is not None else ""
+    options = (strict, line_ranges, ignore_decorators, module_name, class_index)
+    try:
+        if isinstance(item, tuple):
+            file_module = module.Module.from_string(item[1], *options)
+        else:
+            file_module = module.Module.from_path(path, *options)
+
+        classes = file_module.class_results()
+    except (OSError, SyntaxError, ValueError, RecursionError) as e:
+        # unreadable, unparsable or too deeply nested files must not abort the scan of a whole tree
+        return FileResult(path, [], f"{type(e).__name__}: {e}")
+
+    return FileResult(path, classes)
+
+
+def item_path(item: str | os.PathLike[str] | tuple[str, str | bytes]) -> str:
+    """Return the path of a file or the name of an in-memory source."""
+    return item[0] if isinstance(item, tuple) else os.fspath(item)
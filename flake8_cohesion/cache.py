@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import pathlib
+from typing import TYPE_CHECKING
+
+import flake8_cohesion
+from flake8_cohesion import storage
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from collections.abc import Sequence
+
+    from flake8_cohesion.module import ClassResult
+
+
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+EVICTION_INTERVAL = 128
+EVICTION_LOW_WATERMARK = 0.9
+# bumped whenever the meaning of cached results changes between releases of the same version
+RESULT_FORMAT = 2
+
+_SUFFIX = ".json"
+
+
+def cache_key(source: bytes, strict: bool, ignore_decorators: Iterable[str] = ()) -> str:
+    """Return the cache key of a source for the current plugin version, result format and options."""
+    digest = hashlib.sha256()
+    digest.update(f"{flake8_cohesion.__version__}\0{RESULT_FORMAT}\0{strict:d}\0".encode())
+    digest.update(f"{','.join(sorted(set(ignore_decorators)))}\0".encode())
+    digest.update(source)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Size bounded on-disk LRU cache of per-class cohesion results as returned by ``Module.class_results``.
+
+    Every entry is a single file that is written to a temporary file first and then atomically moved into place,
+    so several processes may share one cache directory. Reading an entry updates its modification time, which is
+    used as recency for the eviction. The eviction runs when the cache is opened, i.e. once per run, and every
+    ``EVICTION_INTERVAL`` writes of long runs. It removes the least recently used entries until the cache is below
+    ``EVICTION_LOW_WATERMARK`` of ``max_size`` bytes.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.directory = pathlib.Path(directory)
+        self.max_size = max_size
+        self._writes = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # runs writing fewer than EVICTION_INTERVAL entries would otherwise never evict
+        self.evict()
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self.directory / (key + _SUFFIX)
+
+    def get(self, key: str) -> list[ClassResult] | None:
+        """Return the cached results of a key or None on a cache miss."""
+        path = self._path(key)
+        try:
+            with path.open(encoding="utf-8") as file:
+                results = [
+                    (str(name), int(lineno), int(col_offset), float(cohesion), int(variables), int(functions))
+                    for name, lineno, col_offset, cohesion, variables, functions in json.load(file)
+                ]
+
+            os.utime(path)
+        except (OSError, TypeError, ValueError):
+            return None
+
+        return results
+
+    def set(self, key: str, results: Sequence[ClassResult]) -> None:  # noqa: A003
+        """Store the results of a key."""
+        try:
+            storage.atomic_write_json(self._path(key), results)
+        except OSError:
+            return
+
+        self._writes += 1
+        if self._writes % EVICTION_INTERVAL == 0:
+            self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used entries if the cache exceeds its maximum size."""
+        entries = sorted(self._entries())
+        total_size = sum(size for _, size, _ in entries)
+        if total_size <= self.max_size:
+            return
+
+        target_size = self.max_size * EVICTION_LOW_WATERMARK
+        for _, size, path in entries:
+            if total_size <= target_size:
+                break
+
+            with contextlib.suppress(OSError):
+                path.unlink()
+
+            total_size -= size
+
+    def _entries(self) -> Iterator[tuple[float, int, pathlib.Path]]:
+        for path in self.directory.glob("*" + _SUFFIX):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+
+            yield stat.st_mtime, stat.st_size, path
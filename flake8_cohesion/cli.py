@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import pathlib
+import sys
+from typing import TYPE_CHECKING
+
+import flake8_cohesion
+from flake8_cohesion import batch
+from flake8_cohesion import diff
+from flake8_cohesion import extension
+from flake8_cohesion import hierarchy
+from flake8_cohesion import module
+from flake8_cohesion import report
+from flake8_cohesion import server
+from flake8_cohesion import shard
+from flake8_cohesion import stats
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+
+    from flake8_cohesion.batch import FileResult
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "merge":
+        return merge_main(argv[1:])
+
+    args = _parse_args(argv)
+    exclude = _split_list(args.exclude)
+    ignore_decorators = _split_list(args.cohesion_ignore_decorators)
+    module.structure_memo.resize(args.cohesion_memo_size)
+    class_index = _class_index(args, exclude, ignore_decorators)
+    if args.serve:
+        return serve_main(args, ignore_decorators, class_index)
+
+    return scan_main(args, exclude, ignore_decorators, class_index)
+
+
+def merge_main(argv: Sequence[str]) -> int:
+    """Report the merged partial results of all shards and return the exit code of the whole scan."""
+    args = create_merge_argument_parser().parse_args(argv)
+    try:
+        partial_result = shard.merge(args.partials)
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"flake8-cohesion merge: {e}\n")
+        return 2
+
+    _report_merged(partial_result, args)
+    for path, error in partial_result.errors:
+        sys.stderr.write(f"{path}: {error}\n")
+
+    missing_shards = partial_result.missing_shards
+    if missing_shards:
+        missing = ", ".join(f"{index}/{partial_result.count}" for index in missing_shards)
+        sys.stderr.write(f"flake8-cohesion merge: missing shards {missing}\n")
+
+    failed = missing_shards or partial_result.errors or partial_result.violations(args.cohesion_below)
+    return int(bool(failed))
+
+
+def _report_merged(partial_result: shard.PartialResult, args: argparse.Namespace) -> None:
+    """Report the classes of merged partial results and write their statistics, if requested."""
+    reporter = report.REPORTERS[args.format](sys.stdout, args.cohesion_below)
+    aggregator = stats.Aggregator() if args.stats else None
+    for path, classes in partial_result.file_results():
+        reporter.write(path, classes)
+        if aggregator is not None:
+            aggregator.add_classes(path, classes)
+
+    if aggregator is not None:
+        aggregator.save_to(args.stats, args.stats_depth)
+
+
+def create_merge_argument_parser() -> argparse.ArgumentParser:
+    argument_parser = argparse.ArgumentParser(
+        prog="flake8-cohesion merge",
+        description="Combine the partial results of all shards of a scan into one report.",
+    )
+    argument_parser.add_argument("partials", nargs="+", metavar="FILE", help="partial results written by --partial")
+    argument_parser.add_argument(
+        "--cohesion-below",
+        type=float,
+        default=extension.CohesionChecker._cohesion_below,
+        help="only show cohesion results with this percentage or lower",
+    )
+    argument_parser.add_argument(
+        "--format",
+        choices=sorted(report.REPORTERS),
+        default="default",
+        help="output format, jsonl and csv report every class regardless of the threshold",
+    )
+    add_stats_arguments(argument_parser)
+    return argument_parser
+
+
+def _parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    argument_parser = create_argument_parser()
+    args = argument_parser.parse_args(argv)
+    if args.serve and (args.diff or args.diff_base):
+        # the requests are read from stdin, a diff can not be read from there as well
+        argument_parser.error("--serve can not be combined with --diff or --diff-base")
+
+    return args
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    argument_parser = argparse.ArgumentParser(
+        prog="flake8-cohesion",
+        description="Measure the cohesion of the classes in python files and directories.",
+    )
+    argument_parser.add_argument("paths", nargs="*", default=["."], help="files and directories to scan")
+    argument_parser.add_argument(
+        "--cohesion-below",
+        type=float,
+        default=extension.CohesionChecker._cohesion_below,
+        help="only show cohesion results with this percentage or lower",
+    )
+    argument_parser.add_argument("--cohesion-strict", action="store_true", help="count variables from class definition")
+    argument_parser.add_argument(
+        "--cohesion-ignore-decorators",
+        default="",
+        help="comma separated names of further decorators whose methods are not considered, e.g. cached_property",
+    )
+    argument_parser.add_argument(
+        "--cohesion-memo-size",
+        type=int,
+        default=0,
+        help="number of structurally identical classes to analyze once per process, 0 disables the memo",
+    )
+    argument_parser.add_argument(
+        "--class-index",
+        metavar="FILE",
+        help="index the classes of all paths into FILE, classes inherit the methods of their indexed bases",
+    )
+    argument_parser.add_argument(
+        "--format",
+        choices=sorted(report.REPORTERS),
+        default="default",
+        help="output format, jsonl and csv report every class regardless of the threshold",
+    )
+    diff_group = argument_parser.add_mutually_exclusive_group()
+    diff_group.add_argument(
+        "--diff",
+        action="store_true",
+        help="only score classes touched by the unified diff read from stdin",
+    )
+    diff_group.add_argument(
+        "--diff-base",
+        metavar="REF",
+        help="only score classes touched by the changes since the git revision REF",
+    )
+    argument_parser.add_argument(
+        "--exclude",
+        default=",".join(batch.DEFAULT_EXCLUDE),
+        help="comma separated file and directory name patterns to skip",
+    )
+    argument_parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        help="number of worker processes, defaults to the number of CPUs",
+    )
+    argument_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=batch.DEFAULT_CHUNK_SIZE,
+        help="number of files handed to a worker process at once",
+    )
+    argument_parser.add_argument(
+        "--shard",
+        metavar="I/N",
+        type=_shard,
+        help="only scan the files of shard I of N, files are assigned to shards by a stable hash of their path",
+    )
+    argument_parser.add_argument(
+        "--partial",
+        metavar="FILE",
+        help="write the results to FILE to be combined with the results of other shards by the merge command",
+    )
+    add_stats_arguments(argument_parser)
+    argument_parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="answer JSON-RPC requests line by line on stdin and keep open files in memory, e.g. for editors",
+    )
+    argument_parser.add_argument("--socket", metavar="PATH", help="serve on a Unix socket instead of stdin")
+    argument_parser.add_argument("--version", action="version", version=flake8_cohesion.__version__)
+    return argument_parser
+
+
+def add_stats_arguments(argument_parser: argparse.ArgumentParser) -> None:
+    argument_parser.add_argument(
+        "--stats",
+        metavar="FILE",
+        help="write the cohesion count, mean, percentiles and histogram of every directory to FILE",
+    )
+    argument_parser.add_argument(
+        "--stats-depth",
+        metavar="N",
+        type=int,
+        default=None,
+        help="roll the statistics up to the directories of the first N path components",
+    )
+
+
+def _shard(value: str) -> tuple[int, int]:
+    try:
+        return shard.parse_shard(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
+
+def _split_list(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _class_index(
+    args: argparse.Namespace,
+    exclude: Sequence[str],
+    ignore_decorators: Sequence[str],
+) -> hierarchy.ClassIndex | None:
+    if not args.class_index:
+        return None
+
+    class_index = hierarchy.ClassIndex.load_from(
+        args.class_index,
+        strict=args.cohesion_strict,
+        ignore_decorators=ignore_decorators,
+    )
+    if class_index.update(batch.discover(args.paths, exclude)):
+        class_index.save_to(args.class_index)
+
+    return class_index
+
+
+def serve_main(
+    args: argparse.Namespace,
+    ignore_decorators: Sequence[str],
+    class_index: hierarchy.ClassIndex | None,
+) -> int:
+    """Answer the requests of editor integrations on stdin or a socket until the server is shut down."""
+    cohesion_server = server.CohesionServer(args.cohesion_below, args.cohesion_strict, ignore_decorators, class_index)
+    if args.socket:
+        server.serve_socket(cohesion_server, args.socket)
+    else:
+        server.serve_stdio(cohesion_server)
+
+    return 0
+
+
+def scan_main(
+    args: argparse.Namespace,
+    exclude: Sequence[str],
+    ignore_decorators: Sequence[str],
+    class_index: hierarchy.ClassIndex | None,
+) -> int:
+    """Report the classes of all scanned files and return the exit code of the scan."""
+    files, line_ranges = _files(args, exclude)
+    reporter = report.REPORTERS[args.format](sys.stdout, args.cohesion_below)
+    partial_result = None
+    if args.partial:
+        partial_result = shard.PartialResult(args.shard or (1, 1), args.cohesion_strict, ignore_decorators)
+
+    aggregator = stats.Aggregator() if args.stats else None
+    file_results = batch.scan(
+        files,
+        args.cohesion_strict,
+        args.workers,
+        args.chunk_size,
+        line_ranges,
+        ignore_decorators=ignore_decorators,
+        class_index=class_index,
+    )
+    failed = _report(_recorded(file_results, partial_result, aggregator), reporter, args.cohesion_below)
+    if partial_result is not None:
+        partial_result.save_to(args.partial)
+
+    if aggregator is not None:
+        aggregator.save_to(args.stats, args.stats_depth)
+
+    return int(failed)
+
+
+def _files(
+    args: argparse.Namespace,
+    exclude: Sequence[str],
+) -> tuple[Iterable[str], dict[str, list[diff.LineRange]] | None]:
+    """Return the files of a shard of the scan and the changed lines of a diff, if any."""
+    line_ranges = None
+    if args.diff or args.diff_base:
+        diff_lines = sys.stdin if args.diff else diff.git_diff(args.diff_base)
+        line_ranges = diff.parse_unified_diff(diff_lines)
+        files: Iterable[str] = changed_files(line_ranges, args.paths, exclude)
+    else:
+        files = batch.discover(args.paths, exclude)
+
+    if args.shard is not None:
+        files = shard.select(files, *args.shard)
+
+    return files, line_ranges
+
+
+def changed_files(
+    line_ranges: Mapping[str, Sequence[diff.LineRange]],
+    paths: Iterable[str],
+    exclude: Sequence[str] = batch.DEFAULT_EXCLUDE,
+) -> list[str]:
+    """Return the existing python files of a diff that are located below any of the paths."""
+    roots = [pathlib.Path(path).resolve() for path in paths]
+
+    def selected(path: str) -> bool:
+        file_path = pathlib.Path(path)
+        absolute_path = file_path.resolve()
+        return (
+            path.endswith(".py")
+            and file_path.is_file()
+            and not any(fnmatch.fnmatch(part, pattern) for part in file_path.parts for pattern in exclude)
+            and any(absolute_path == root or root in absolute_path.parents for root in roots)
+        )
+
+    return sorted(path for path, ranges in line_ranges.items() if ranges and selected(path))
+
+
+def _report(file_results: Iterable[FileResult], reporter: report.Reporter, cohesion_below: float) -> bool:
+    """Report the classes of all files and return whether any file failed or has a class of low cohesion."""
+    failed = False
+    for file_result in file_results:
+        if file_result.error is not None:
+            sys.stderr.write(f"{file_result.path}: {file_result.error}\n")
+            failed = True
+            continue
+
+        reporter.write(file_result.path, file_result.classes)
+        failed = failed or any(result[3] <= cohesion_below for result in file_result.classes)
+
+    return failed
+
+
+def _recorded(
+    file_results: Iterable[FileResult],
+    partial_result: shard.PartialResult | None,
+    aggregator: stats.Aggregator | None,
+) -> Iterator[FileResult]:
+    """Yield the file results of a scan, they are added to the partial result and the statistics first, if any."""
+    for file_result in file_results:
+        if partial_result is not None:
+            partial_result.add(file_result)
+
+        if aggregator is not None and file_result.error is None:
+            aggregator.add_classes(file_result.path, file_result.classes)
+
+        yield file_result
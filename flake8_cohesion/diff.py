@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import bisect
+import re
+import subprocess  # noqa: S404
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    # first and last line of a hunk in the new file, both inclusive
+    LineRange = tuple[int, int]
+
+
+_NEW_FILE_PREFIX = "+++ "
+_HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+def parse_unified_diff(lines: Iterable[str]) -> dict[str, list[LineRange]]:
+    """Return the changed line ranges of every file in a unified diff, keyed by the path of the new file.
+
+    Hunks that only delete lines are mapped to the line preceding the deletion, so the class they were removed
+    from is still considered changed.
+    """
+    result: dict[str, list[LineRange]] = {}
+    ranges: list[LineRange] | None = None
+
+    for line in lines:
+        if line.startswith(_NEW_FILE_PREFIX):
+            ranges = _file_ranges(result, line)
+            continue
+
+        match = _HUNK_HEADER.match(line)
+        if match is not None and ranges is not None:
+            ranges.append(_hunk_range(match))
+
+    return result
+
+
+def _file_ranges(result: dict[str, list[LineRange]], line: str) -> list[LineRange] | None:
+    """Return the ranges of the new file of a file header, None if the file is deleted."""
+    path = line.removeprefix(_NEW_FILE_PREFIX).rstrip("\r\n").split("\t", 1)[0]
+    if path == "/dev/null":
+        return None
+
+    return result.setdefault(path.removeprefix("b/"), [])
+
+
+def _hunk_range(match: re.Match[str]) -> LineRange:
+    start = int(match.group(1))
+    count = 1 if match.group(2) is None else int(match.group(2))
+    if count == 0:
+        return max(start, 1), max(start, 1)
+
+    return start, start + count - 1
+
+
+def git_diff(base: str, cwd: str | None = None) -> list[str]:
+    """Return the lines of the diff between a git revision and the working tree without context lines.
+
+    The whole working tree is diffed, the paths of the new files are relative to ``cwd`` even if they are outside
+    of it, e.g. ``../pkg/a.py``.
+    """
+    toplevel, relative_toplevel = _git_toplevel(cwd)
+    completed = subprocess.run(  # noqa: S603,S607
+        [
+            "git",
+            "diff",
+            "--no-color",
+            "--no-ext-diff",
+            f"--dst-prefix=b/{relative_toplevel}",
+            "-U0",
+            base,
+            "--",
+            "*.py",
+        ],
+        cwd=toplevel,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return completed.stdout.splitlines()
+
+
+def _git_toplevel(cwd: str | None = None) -> tuple[str, str]:
+    """Return the top-level directory of the git working tree containing a directory and the path to it from there.
+
+    The relative path is empty or ends with a slash, e.g. ``../``.
+    """
+    completed = subprocess.run(  # noqa: S603,S607
+        ["git", "rev-parse", "--show-toplevel", "--show-cdup"],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    toplevel, relative_toplevel = completed.stdout.split("\n")[:2]
+    return toplevel, relative_toplevel
+
+
+def overlaps(start: int, end: int, ranges: Iterable[LineRange]) -> bool:
+    """Return whether the lines from start to end overlap any of the ranges."""
+    return any(range_start <= end and start <= range_end for range_start, range_end in ranges)
+
+
+class SortedLineRanges:
+    """Line ranges sorted and merged once, so an overlap is found by bisection instead of scanning all ranges."""
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, ranges: Iterable[LineRange]) -> None:
+        self.starts: list[int] = []
+        self.ends: list[int] = []
+        for start, end in sorted(ranges):
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """Return whether the lines from start to end overlap any of the ranges."""
+        # the merged ranges are disjoint, only the last one starting at or before end can overlap
+        index = bisect.bisect_right(self.starts, end) - 1
+        return index >= 0 and start <= self.ends[index]
@@ -2,20 +2,43 @@
 
 from __future__ import annotations
 
+import os
 from typing import TYPE_CHECKING
 
 import flake8_cohesion
+from flake8_cohesion import batch
+from flake8_cohesion import cache
+from flake8_cohesion import hierarchy
+from flake8_cohesion import module
+from flake8_cohesion import parser as cohesion_parser
+from flake8_cohesion import profiling
 
 if TYPE_CHECKING:
     import ast
     from collections.abc import Generator
+    from collections.abc import Iterator
+    from collections.abc import Sequence
     from typing import Protocol
 
     from flake8.options import manager
 
+    from flake8_cohesion import metrics
+    from flake8_cohesion.module import ClassResult
+
     class Options(Protocol):
         cohesion_below: float
         cohesion_strict: bool
+        cohesion_ignore_decorators: list[str]
+        cohesion_cache_dir: str | None
+        cohesion_cache_size: int
+        cohesion_memo_size: int
+        cohesion_profile: str | None
+        cohesion_class_index: str | None
+        cohesion_max_lcom4: int | None
+        cohesion_min_tcc: float | None
+        cohesion_min_lcc: float | None
+        cohesion_max_nodes: int | None
+        cohesion_max_seconds: float | None
         ...
 
 
@@ -26,11 +49,27 @@ class CohesionChecker:
 
     _code = "H601"
     _error_tmpl = "H601 class has low ({0:.2f}%) cohesion"
+    _lcom4_error_tmpl = "H602 class has {0} disconnected groups of methods (LCOM4)"
+    _tcc_error_tmpl = "H603 class has low ({0:.2f}) tight class cohesion (TCC)"
+    _lcc_error_tmpl = "H604 class has low ({0:.2f}) loose class cohesion (LCC)"
+    _budget_class_tmpl = "H605 class exceeds the analysis budget, cohesion ({0:.2f}%) approximated from {1}/{2} methods"
+    _budget_file_tmpl = "H606 file exceeds the analysis time budget ({0:g}s), remaining classes are skipped"
     _cohesion_below = 50.0
     _strict = False
+    _ignore_decorators: tuple[str, ...] = ()
+    _max_lcom4: int | None = None
+    _min_tcc: float | None = None
+    _min_lcc: float | None = None
+    _cache: cache.ResultCache | None = None
+    _class_index: hierarchy.ClassIndex | None = None
+    _budget: cohesion_parser.AnalysisBudget | None = None
 
-    def __init__(self, tree: ast.AST) -> None:
+    def __init__(self, tree: ast.AST, lines: Sequence[str] | None = None, filename: str = "stdin") -> None:
         self._tree = tree
+        self._lines = lines
+        self._filename = filename
+        self._module: module.Module | None = None
+        self._encoded_source: bytes | None = None
 
     @classmethod
     def add_options(cls: type[CohesionChecker], parser: manager.OptionManager) -> None:
@@ -50,25 +89,275 @@ class CohesionChecker:
             "parse_from_config": "True",
         }
         parser.add_option(flag, **kwargs)
+        flag = "--cohesion-ignore-decorators"
+        kwargs = {
+            "action": "store",
+            "default": "",
+            "comma_separated_list": True,
+            "help": "names of further decorators whose methods are not considered, e.g. cached_property,overload",
+            "parse_from_config": "True",
+        }
+        parser.add_option(flag, **kwargs)
+        flag = "--cohesion-cache-dir"
+        kwargs = {
+            "action": "store",
+            "default": None,
+            "help": "directory to cache cohesion results of unchanged files in",
+            "parse_from_config": "True",
+        }
+        parser.add_option(flag, **kwargs)
+        flag = "--cohesion-cache-size"
+        kwargs = {
+            "action": "store",
+            "type": int,
+            "default": cache.DEFAULT_MAX_SIZE // (1024 * 1024),
+            "help": "maximum size of the cohesion cache directory in megabytes",
+            "parse_from_config": "True",
+        }
+        parser.add_option(flag, **kwargs)
+        flag = "--cohesion-memo-size"
+        kwargs = {
+            "action": "store",
+            "type": int,
+            "default": 0,
+            "help": "number of structurally identical classes to analyze once per process, 0 disables the memo",
+            "parse_from_config": "True",
+        }
+        parser.add_option(flag, **kwargs)
+        flag = "--cohesion-profile"
+        kwargs = {
+            "action": "store",
+            "default": None,
+            "help": f"directory to collect timings in, summarized at exit (default: ${profiling.ENVIRONMENT_VARIABLE})",
+            "parse_from_config": "True",
+        }
+        parser.add_option(flag, **kwargs)
+        flag = "--cohesion-class-index"
+        kwargs = {
+            "action": "store",
+            "default": None,
+            "help": "file to keep an index of the checked classes in, classes inherit methods of indexed bases",
+            "parse_from_config": "True",
+        }
+        parser.add_option(flag, **kwargs)
+        flag = "--cohesion-max-lcom4"
+        kwargs = {
+            "action": "store",
+            "type": int,
+            "default": None,
+            "help": "report classes with more disconnected groups of methods (H602), disabled by default",
+            "parse_from_config": "True",
+        }
+        parser.add_option(flag, **kwargs)
+        flag = "--cohesion-min-tcc"
+        kwargs = {
+            "action": "store",
+            "type": float,
+            "default": None,
+            "help": "report classes with a lower tight class cohesion between 0 and 1 (H603), disabled by default",
+            "parse_from_config": "True",
+        }
+        parser.add_option(flag, **kwargs)
+        flag = "--cohesion-min-lcc"
+        kwargs = {
+            "action": "store",
+            "type": float,
+            "default": None,
+            "help": "report classes with a lower loose class cohesion between 0 and 1 (H604), disabled by default",
+            "parse_from_config": "True",
+        }
+        parser.add_option(flag, **kwargs)
+        flag = "--cohesion-max-nodes"
+        kwargs = {
+            "action": "store",
+            "type": int,
+            "default": None,
+            "help": "approximate the cohesion of classes with more syntax nodes from their first methods (H605)",
+            "parse_from_config": "True",
+        }
+        parser.add_option(flag, **kwargs)
+        flag = "--cohesion-max-seconds"
+        kwargs = {
+            "action": "store",
+            "type": float,
+            "default": None,
+            "help": "skip the remaining classes of a file once its analysis took longer (H605, H606)",
+            "parse_from_config": "True",
+        }
+        parser.add_option(flag, **kwargs)
 
     @classmethod
     def parse_options(cls: type[CohesionChecker], options: Options) -> None:
         cls._cohesion_below = options.cohesion_below
         cls._strict = options.cohesion_strict
+        cls._ignore_decorators = tuple(options.cohesion_ignore_decorators)
+        cls._max_lcom4 = options.cohesion_max_lcom4
+        cls._min_tcc = options.cohesion_min_tcc
+        cls._min_lcc = options.cohesion_min_lcc
+        cls._budget = cls._create_budget(options)
+        cls._cache = cls._create_cache(options)
+        cls._class_index = cls._create_class_index(options)
+        module.structure_memo.resize(options.cohesion_memo_size)
+        cls._enable_profiling(options)
+
+    @staticmethod
+    def _enable_profiling(options: Options) -> None:
+        profile_directory = options.cohesion_profile or os.environ.get(profiling.ENVIRONMENT_VARIABLE)
+        if profile_directory:
+            profiling.enable(profile_directory)
+
+    @staticmethod
+    def _create_budget(options: Options) -> cohesion_parser.AnalysisBudget | None:
+        if options.cohesion_max_nodes is None and options.cohesion_max_seconds is None:
+            return None
+
+        return cohesion_parser.AnalysisBudget(options.cohesion_max_nodes, options.cohesion_max_seconds)
+
+    @staticmethod
+    def _create_cache(options: Options) -> cache.ResultCache | None:
+        if not options.cohesion_cache_dir:
+            return None
+
+        return cache.ResultCache(options.cohesion_cache_dir, options.cohesion_cache_size * 1024 * 1024)
+
+    @staticmethod
+    def _create_class_index(options: Options) -> hierarchy.ClassIndex | None:
+        if not options.cohesion_class_index:
+            return None
+
+        # built once in the main process before the files are checked, unchanged files are not parsed again
+        class_index = hierarchy.ClassIndex.load_from(
+            options.cohesion_class_index,
+            strict=options.cohesion_strict,
+            ignore_decorators=options.cohesion_ignore_decorators,
+        )
+        exclude = [*getattr(options, "exclude", batch.DEFAULT_EXCLUDE), *getattr(options, "extend_exclude", ())]
+        if class_index.update(batch.discover(getattr(options, "filenames", None) or ["."], exclude)):
+            class_index.save_to(options.cohesion_class_index)
 
+        return class_index
+
+    @profiling.profiled("CohesionChecker.run")
     def run(self) -> Generator[tuple[int, int, str, type[CohesionChecker]], None, None]:  # noqa: TAE002
-        file_module = flake8_cohesion.module.Module(self._tree, self._strict)
-        file_module.filter_below(float(self._cohesion_below))
-
-        for class_name in file_module.classes:
-            cohesion_percentage = file_module.class_cohesion_percentage(class_name)
-            yield (  # noqa: TMN002
-                file_module.structure[class_name]["lineno"],
-                file_module.structure[class_name]["col_offset"],
-                self._error_tmpl.format(cohesion_percentage),
-                type(self),
+        class_results = self._timed_class_results()
+        truncated_classes = self._truncated_classes()
+        budget_exceeded = self._budget is not None and self._module is not None and self._module.budget_exceeded
+        self._count_budget(truncated_classes, budget_exceeded)
+        yield from self._cohesion_errors(class_results, truncated_classes)
+        yield from self._metric_errors()
+        if budget_exceeded and self._budget is not None:
+            yield 1, 0, self._budget_file_tmpl.format(self._budget.max_seconds), type(self)
+
+    def _count_budget(self, truncated_classes: dict[str, module.ClassInfo], budget_exceeded: bool) -> None:
+        profiler = profiling.active
+        if profiler is not None and self._budget is not None:
+            profiler.count("budget.truncated_classes", len(truncated_classes))
+            profiler.count("budget.exceeded_files", int(budget_exceeded))
+
+    def _cohesion_errors(
+        self,
+        class_results: Sequence[ClassResult],
+        truncated_classes: dict[str, module.ClassInfo],
+    ) -> Generator[tuple[int, int, str, type[CohesionChecker]], None, None]:  # noqa: TAE002
+        cohesion_below = float(self._cohesion_below)
+        for class_name, lineno, col_offset, cohesion_percentage, _, _ in class_results:
+            class_structure = truncated_classes.get(class_name)
+            if class_structure is not None:
+                method_count = len(class_structure.functions)
+                total_method_count = method_count + class_structure.skipped_methods
+                message = self._budget_class_tmpl.format(cohesion_percentage, method_count, total_method_count)
+                yield lineno, col_offset, message, type(self)
+            elif cohesion_percentage <= cohesion_below:
+                yield (  # noqa: TMN002
+                    lineno,
+                    col_offset,
+                    self._error_tmpl.format(cohesion_percentage),
+                    type(self),
+                )
+
+    def _timed_class_results(self) -> Sequence[ClassResult]:
+        profiler = profiling.active
+        if profiler is None:
+            return self._class_results()
+
+        with profiler.file(self._filename):
+            return self._class_results()
+
+    def _truncated_classes(self) -> dict[str, module.ClassInfo]:
+        """Return the classes that exceeded the budget, cached results are never truncated."""
+        if self._budget is None or self._module is None:
+            return {}
+
+        return {
+            class_name: class_structure
+            for class_name, class_structure in self._module.structure.items()
+            if class_structure.truncated
+        }
+
+    def _metric_errors(self) -> Generator[tuple[int, int, str, type[CohesionChecker]], None, None]:  # noqa: TAE002
+        if self._max_lcom4 is None and self._min_tcc is None and self._min_lcc is None:
+            return
+
+        file_module = self._get_module()
+        for class_name, class_structure in file_module.structure.items():
+            if class_structure.truncated:
+                continue
+
+            for message in self._metric_messages(file_module.class_metrics(class_name)):
+                yield class_structure.lineno, class_structure.col_offset, message, type(self)
+
+    def _metric_messages(self, class_metrics: metrics.Metrics) -> Iterator[str]:
+        if self._max_lcom4 is not None and class_metrics.lcom4 > self._max_lcom4:
+            yield self._lcom4_error_tmpl.format(class_metrics.lcom4)
+
+        if self._min_tcc is not None and class_metrics.tcc < self._min_tcc:
+            yield self._tcc_error_tmpl.format(class_metrics.tcc)
+
+        if self._min_lcc is not None and class_metrics.lcc < self._min_lcc:
+            yield self._lcc_error_tmpl.format(class_metrics.lcc)
+
+    def _get_module(self) -> module.Module:
+        if self._module is None:
+            class_index = self._class_index
+            module_name = class_index.module_name(self._filename) if class_index is not None else ""
+            # the tree flake8 already parsed is analyzed, the file is not parsed again
+            self._module = module.Module.from_tree(
+                self._tree,
+                self._strict,
+                ignore_decorators=self._ignore_decorators,
+                module_name=module_name,
+                class_index=class_index,
+                source=self._source(),
+                budget=self._budget,
             )
 
+        return self._module
+
+    def _class_results(self) -> Sequence[ClassResult]:
+        source = self._source()
+        # results depending on other files through the class index are not cached
+        if self._cache is None or source is None or self._class_index is not None:
+            return self._score()
+
+        key = cache.cache_key(source, self._strict, self._ignore_decorators)
+        results = self._cache.get(key)
+        if results is None:
+            results = self._score()
+            if not self._truncated_classes() and not self._get_module().budget_exceeded:
+                self._cache.set(key, results)
+
+        return results
+
+    def _source(self) -> bytes | None:
+        # encoded once per file, it is both hashed for the cache key and analyzed
+        if self._encoded_source is None and self._lines is not None:
+            self._encoded_source = "".join(self._lines).encode("utf-8", "surrogatepass")
+
+        return self._encoded_source
+
+    def _score(self) -> list[ClassResult]:
+        return self._get_module().class_results()
+
     @property
     def cohesion_below(self) -> float:
         return self._cohesion_below
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib
+from typing import TYPE_CHECKING
+from typing import Any
+
+import flake8_cohesion
+from flake8_cohesion import module
+from flake8_cohesion import parser
+from flake8_cohesion import storage
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Sequence
+
+
+# bumped whenever the meaning of persisted indexes changes between releases of the same version
+INDEX_FORMAT = 1
+
+
+def module_name(path: str | os.PathLike[str], root: str | os.PathLike[str] = ".") -> str:
+    """Return the dotted name of the module of a python file relative to a root directory."""
+    relative_path = _relative_path(pathlib.Path(path), pathlib.Path(root))
+    return ".".join(part for part in relative_path.with_suffix("").parts if part != relative_path.anchor)
+
+
+def _relative_path(path: pathlib.Path, root: pathlib.Path) -> pathlib.Path:
+    """Return a path relative to a root directory, paths outside of the root are returned resolved."""
+    resolved_path = path.resolve()
+    try:
+        return resolved_path.relative_to(root.resolve())
+    except ValueError:
+        return resolved_path
+
+
+class IndexedClass:
+    """File, bases and methods of an indexed class."""
+
+    __slots__ = ("path", "bases", "methods")
+
+    def __init__(self, path: str, bases: tuple[str, ...], methods: dict[str, module.MethodInfo]) -> None:
+        self.path = path
+        self.bases = bases
+        self.methods = methods
+
+
+class FileRecord:
+    """Modification time, size and content hash of an indexed file and the names of its classes."""
+
+    __slots__ = ("mtime_ns", "size", "digest", "classes")
+
+    def __init__(self, mtime_ns: int, size: int, digest: str, classes: list[str]) -> None:
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+        self.classes = classes
+
+
+class ClassIndex:
+    """Project wide map of fully qualified class names to their bases and methods.
+
+    Files are re-indexed if their modification time or size changed and their content hash differs. Files of
+    looked up classes are checked once per index, so a long-lived or persisted index never serves stale entries.
+    The methods a class inherits are resolved through the index and memoized until a file is re-indexed. Classes
+    are indexed with the ``strict`` and ``ignore_decorators`` options of the checker, a persisted index built with
+    other options is discarded.
+    """
+
+    def __init__(
+        self,
+        root: str | os.PathLike[str] = ".",
+        strict: bool = False,
+        ignore_decorators: Iterable[str] = (),
+    ) -> None:
+        self.root = pathlib.Path(root).resolve()
+        self.strict = strict
+        self.ignore_decorators = tuple(sorted(set(ignore_decorators)))
+        self.classes: dict[str, IndexedClass] = {}
+        self.files: dict[str, FileRecord] = {}
+        self._inherited: dict[str, dict[str, module.MethodInfo]] = {}
+        self._checked: set[str] = set()
+
+    def module_name(self, path: str | os.PathLike[str]) -> str:
+        return module_name(path, self.root)
+
+    def update(self, paths: Iterable[str | os.PathLike[str]]) -> int:
+        """Index new and changed files and return the number of files that were (re-)indexed."""
+        return sum(self.refresh(path) for path in paths)
+
+    def refresh(self, path: str | os.PathLike[str]) -> bool:
+        """Re-index a file if it changed and return whether its entries were replaced.
+
+        Relative paths are resolved against the root.
+        """
+        key = str(_relative_path(self.root / path, self.root))
+        self._checked.add(key)
+        record = self.files.get(key)
+        try:
+            stat = (self.root / key).stat()
+            if record is not None and (record.mtime_ns, record.size) == (stat.st_mtime_ns, stat.st_size):
+                return False
+
+            source = (self.root / key).read_bytes()
+        except OSError:
+            if record is None:
+                return False
+
+            self._remove(key)
+            return True
+
+        digest = hashlib.sha256(source).hexdigest()
+        if record is not None and record.digest == digest:
+            record.mtime_ns, record.size = stat.st_mtime_ns, stat.st_size
+            return False
+
+        self._remove(key)
+        self._index(key, source, FileRecord(stat.st_mtime_ns, stat.st_size, digest, []))
+        return True
+
+    def _remove(self, key: str) -> None:
+        record = self.files.pop(key, None)
+        if record is None:
+            return
+
+        for name in record.classes:
+            self.classes.pop(name, None)
+
+        self._inherited.clear()
+
+    def _index(self, key: str, source: bytes, record: FileRecord) -> None:
+        self.files[key] = record
+        self._inherited.clear()
+        name = module_name(self.root / key, self.root)
+        try:
+            structure = module.Module.from_string(
+                source,
+                self.strict,
+                ignore_decorators=self.ignore_decorators,
+                module_name=name,
+            ).structure
+        except (SyntaxError, ValueError):
+            return
+
+        prefix = parser.get_module_prefix(name)
+        for qualname, class_structure in structure.items():
+            class_name = f"{prefix}.{qualname}" if prefix else qualname
+            self.classes[class_name] = IndexedClass(key, class_structure.bases, class_structure.functions)
+            record.classes.append(class_name)
+
+    def lookup(self, class_name: str) -> IndexedClass | None:
+        """Return an indexed class by its fully qualified name, its file is re-indexed first if it changed."""
+        indexed_class = self.classes.get(class_name)
+        if indexed_class is not None and indexed_class.path not in self._checked and self.refresh(indexed_class.path):
+            return self.classes.get(class_name)
+
+        return indexed_class
+
+    def inherited_methods(self, bases: Sequence[str]) -> dict[str, module.MethodInfo]:
+        """Return the methods of the indexed bases and their ancestors, earlier definitions take precedence."""
+        result: dict[str, module.MethodInfo] = {}
+        for base in bases:
+            for method_name, method_info in self._methods(base, frozenset()).items():
+                result.setdefault(method_name, method_info)
+
+        return result
+
+    def _methods(self, class_name: str, seen: frozenset[str]) -> dict[str, module.MethodInfo]:
+        # own and inherited methods of a class, seen guards against cyclic bases
+        result = self._inherited.get(class_name)
+        if result is not None:
+            return result
+
+        indexed_class = self.lookup(class_name)
+        if indexed_class is None or class_name in seen:
+            return {}
+
+        result = dict(indexed_class.methods)
+        for base in indexed_class.bases:
+            for method_name, method_info in self._methods(base, seen | {class_name}).items():
+                result.setdefault(method_name, method_info)
+
+        self._inherited[class_name] = result
+        return result
+
+    def save_to(self, path: str | os.PathLike[str]) -> None:
+        """Write the index to a file atomically, paths are stored relative to the root."""
+        document = self._header()
+        document["files"] = {
+            key: [record.mtime_ns, record.size, record.digest, record.classes] for key, record in self.files.items()
+        }
+        document["classes"] = {
+            class_name: self._dump_class(indexed_class) for class_name, indexed_class in self.classes.items()
+        }
+        storage.atomic_write_json(path, document)
+
+    def _header(self) -> dict[str, object]:
+        # a persisted index is only valid for the same release and options
+        return {
+            "version": flake8_cohesion.__version__,
+            "format": INDEX_FORMAT,
+            "strict": self.strict,
+            "ignore_decorators": list(self.ignore_decorators),
+        }
+
+    @staticmethod
+    def _dump_class(indexed_class: IndexedClass) -> list[object]:
+        methods = {
+            method_name: [sorted(method_info.variables), method_info.flags, sorted(method_info.calls)]
+            for method_name, method_info in indexed_class.methods.items()
+        }
+        return [indexed_class.path, list(indexed_class.bases), methods]
+
+    @classmethod
+    def load_from(
+        cls,
+        path: str | os.PathLike[str],
+        root: str | os.PathLike[str] = ".",
+        strict: bool = False,
+        ignore_decorators: Iterable[str] = (),
+    ) -> ClassIndex:
+        """Return a persisted index, or an empty index if the file is missing, invalid or built differently."""
+        index = cls(root, strict, ignore_decorators)
+        header = index._header()
+        try:
+            with pathlib.Path(path).open(encoding="utf-8") as file:
+                document = json.load(file)
+
+            if {key: document[key] for key in header} != header:
+                return index
+
+            files = {
+                key: FileRecord(int(mtime_ns), int(size), str(digest), list(classes))
+                for key, (mtime_ns, size, digest, classes) in document["files"].items()
+            }
+            classes = {class_name: cls._parse_class(*fields) for class_name, fields in document["classes"].items()}
+        except (OSError, KeyError, TypeError, ValueError):
+            return index
+
+        index.files = files
+        index.classes = classes
+        return index
+
+    @staticmethod
+    def _parse_class(key: str, bases: list[str], methods: dict[str, list[Any]]) -> IndexedClass:
+        method_infos = {
+            method_name: module.MethodInfo(module.intern_names(variables), int(flags), module.intern_names(calls))
+            for method_name, (variables, flags, calls) in methods.items()
+        }
+        return IndexedClass(str(key), tuple(bases), method_infos)
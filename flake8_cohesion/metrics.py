@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+
+    from flake8_cohesion.module import ClassInfo
+
+
+class UnionFind:
+    """Disjoint sets of the integers ``0`` to ``size - 1`` with path halving and union by size."""
+
+    __slots__ = ("parents", "sizes", "count")
+
+    def __init__(self, size: int) -> None:
+        self.parents = list(range(size))
+        self.sizes = [1] * size
+        self.count = size
+
+    def find(self, item: int) -> int:
+        parents = self.parents
+        while parents[item] != item:
+            parents[item] = parents[parents[item]]
+            item = parents[item]
+
+        return item
+
+    def union(self, first: int, second: int) -> None:
+        first = self.find(first)
+        second = self.find(second)
+        if first == second:
+            return
+
+        if self.sizes[first] < self.sizes[second]:
+            first, second = second, first
+
+        self.parents[second] = first
+        self.sizes[first] += self.sizes[second]
+        self.count -= 1
+
+    def union_all(self, items: Iterable[int]) -> None:
+        """Merge the sets of all items."""
+        iterator = iter(items)
+        first = next(iterator, None)
+        if first is None:
+            return
+
+        for item in iterator:
+            self.union(first, item)
+
+    def connected_pairs(self) -> int:
+        """Return the number of unordered pairs of items that are in the same set."""
+        roots = (item for item in range(len(self.parents)) if self.find(item) == item)
+        return sum(self.sizes[root] * (self.sizes[root] - 1) // 2 for root in roots)
+
+    def copy(self) -> UnionFind:
+        result = UnionFind(0)
+        result.parents = list(self.parents)
+        result.sizes = list(self.sizes)
+        result.count = self.count
+        return result
+
+
+class IncidenceIndex:
+    """Method–attribute incidence of the relevant methods of a class, extended with the calls between them.
+
+    Names are stripped of leading and trailing underscores like in ``Module.class_cohesion_percentage`` and only the
+    variables of the class are attributes. ``attributes`` holds the attributes used by each method, ``calls`` the
+    indices of the relevant methods each method calls via ``self.method()`` and ``methods_by_attribute`` the
+    indices of the methods using an attribute.
+    """
+
+    __slots__ = ("methods", "attributes", "calls", "methods_by_attribute")
+
+    def __init__(self, class_structure: ClassInfo) -> None:
+        functions = [(name, function) for name, function in class_structure.functions.items() if function.relevant]
+        class_attributes = {name.strip("_") for name in class_structure.variables}
+        indices = {name: index for index, (name, _) in enumerate(functions)}
+
+        self.methods = tuple(name for name, _ in functions)
+        self.attributes = tuple(
+            frozenset(name.strip("_") for name in function.variables) & class_attributes for _, function in functions
+        )
+        self.calls = tuple(
+            frozenset(indices[name] for name in function.calls if name in indices and name != method_name)
+            for method_name, function in functions
+        )
+        self.methods_by_attribute = _methods_by_attribute(self.attributes)
+
+    def reachable_attributes(self) -> list[frozenset[str]]:
+        """Return the attributes each method uses directly or through the methods it calls transitively."""
+        # all methods of a cycle of calls reach the same attributes, so they are gathered once per component
+        result: list[frozenset[str]] = [frozenset()] * len(self.methods)
+        component_numbers = [-1] * len(self.methods)
+        for number, component in enumerate(self.call_components()):
+            for method in component:
+                component_numbers[method] = number
+
+            reachable = frozenset(self._component_attributes(component, component_numbers, result))
+            for method in component:
+                result[method] = reachable
+
+        return result
+
+    def _component_attributes(
+        self,
+        component: Sequence[int],
+        component_numbers: Sequence[int],
+        reachable_attributes: Sequence[frozenset[str]],
+    ) -> Iterator[str]:
+        """Yield the attributes of a component and those reachable from the components it calls."""
+        number = component_numbers[component[0]]
+        for method in component:
+            yield from self.attributes[method]
+            for called in self.calls[method]:
+                if component_numbers[called] != number:
+                    yield from reachable_attributes[called]
+
+    def call_components(self) -> list[list[int]]:
+        """Return the strongly connected components of the call graph, called components before their callers."""
+        return _ComponentSearch(self.calls).run()
+
+
+class _ComponentSearch:
+    """Iterative Tarjan search for the strongly connected components of a call graph."""
+
+    __slots__ = ("calls", "numbers", "lowlinks", "on_stack", "stack", "components", "counter")
+
+    def __init__(self, calls: Sequence[Iterable[int]]) -> None:
+        self.calls = calls
+        self.numbers = [-1] * len(calls)
+        self.lowlinks = [0] * len(calls)
+        self.on_stack = [False] * len(calls)
+        self.stack: list[int] = []
+        self.components: list[list[int]] = []
+        self.counter = 0
+
+    def run(self) -> list[list[int]]:
+        for root in range(len(self.calls)):
+            if self.numbers[root] == -1:
+                self._search(root)
+
+        return self.components
+
+    def _search(self, root: int) -> None:
+        work = [self._open(root)]
+        while work:
+            method, called_methods = work[-1]
+            called = self._next_unnumbered(method, called_methods)
+            if called is not None:
+                work.append(self._open(called))
+                continue
+
+            work.pop()
+            if work:
+                caller = work[-1][0]
+                self.lowlinks[caller] = min(self.lowlinks[caller], self.lowlinks[method])
+
+            if self.lowlinks[method] == self.numbers[method]:
+                self.components.append(self._close(method))
+
+    def _next_unnumbered(self, method: int, called_methods: Iterator[int]) -> int | None:
+        """Return the next method called by ``method`` that was not searched yet, lowering its lowlink on the way."""
+        for called in called_methods:
+            if self.numbers[called] == -1:
+                return called
+
+            if self.on_stack[called]:
+                self.lowlinks[method] = min(self.lowlinks[method], self.numbers[called])
+
+        return None
+
+    def _open(self, method: int) -> tuple[int, Iterator[int]]:
+        self.numbers[method] = self.lowlinks[method] = self.counter
+        self.counter += 1
+        self.stack.append(method)
+        self.on_stack[method] = True
+        return method, iter(self.calls[method])
+
+    def _close(self, method: int) -> list[int]:
+        """Pop the component whose root is ``method`` from the stack."""
+        component = []
+        member = -1
+        while member != method:
+            member = self.stack.pop()
+            self.on_stack[member] = False
+            component.append(member)
+
+        return component
+
+
+class Metrics:
+    """Lack of cohesion and class cohesion metrics of a class.
+
+    * ``lcom1``: number of pairs of methods that share no attribute
+    * ``lcom2``: ``lcom1`` minus the number of pairs sharing an attribute, but at least 0
+    * ``lcom3``: number of groups of methods connected by shared attributes
+    * ``lcom4``: number of groups of methods connected by shared attributes or calls
+    * ``tcc``: tight class cohesion, share of the pairs of methods using a common attribute directly or through
+      the methods they call
+    * ``lcc``: loose class cohesion, share of the pairs of methods connected directly or indirectly as for ``tcc``
+
+    ``tcc`` and ``lcc`` are 1.0 for classes with fewer than two relevant methods.
+    """
+
+    __slots__ = ("lcom1", "lcom2", "lcom3", "lcom4", "tcc", "lcc")
+
+    _fields = __slots__
+
+    def __init__(self, lcom1: int, lcom2: int, lcom3: int, lcom4: int, tcc: float, lcc: float) -> None:
+        self.lcom1 = lcom1
+        self.lcom2 = lcom2
+        self.lcom3 = lcom3
+        self.lcom4 = lcom4
+        self.tcc = tcc
+        self.lcc = lcc
+
+    def as_tuple(self) -> tuple[int, int, int, int, float, float]:
+        return self.lcom1, self.lcom2, self.lcom3, self.lcom4, self.tcc, self.lcc
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Metrics):
+            return NotImplemented
+
+        return self.as_tuple() == other.as_tuple()
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self._fields)
+        return f"{type(self).__name__}({fields})"
+
+
+def class_metrics(class_structure: ClassInfo) -> Metrics:
+    """Return all metrics of a class."""
+    return calculate(IncidenceIndex(class_structure))
+
+
+def calculate(index: IncidenceIndex) -> Metrics:
+    """Return all metrics of a class from its incidence index."""
+    method_count = len(index.methods)
+    pair_count = method_count * (method_count - 1) // 2
+
+    sharing_pairs = _sharing_pairs(index.attributes, index.methods_by_attribute)
+    lcom1 = pair_count - sharing_pairs
+    lcom2 = max(lcom1 - sharing_pairs, 0)
+
+    attribute_components = _attribute_components(method_count, index.methods_by_attribute)
+    lcom3 = attribute_components.count
+
+    call_components = attribute_components.copy()
+    for method, called in enumerate(index.calls):
+        call_components.union_all((method, *called))
+
+    lcom4 = call_components.count
+
+    if pair_count == 0:
+        return Metrics(lcom1, lcom2, lcom3, lcom4, 1.0, 1.0)
+
+    reachable_attributes = index.reachable_attributes()
+    methods_by_reachable_attribute = _methods_by_attribute(reachable_attributes)
+    direct_components = _attribute_components(method_count, methods_by_reachable_attribute)
+    tcc = _sharing_pairs(reachable_attributes, methods_by_reachable_attribute) / pair_count
+    lcc = direct_components.connected_pairs() / pair_count
+
+    return Metrics(lcom1, lcom2, lcom3, lcom4, tcc, lcc)
+
+
+def _attribute_components(method_count: int, methods_by_attribute: Mapping[str, list[int]]) -> UnionFind:
+    """Return the groups of methods connected by shared attributes."""
+    result = UnionFind(method_count)
+    for methods in methods_by_attribute.values():
+        result.union_all(methods)
+
+    return result
+
+
+def _methods_by_attribute(attributes: Sequence[Iterable[str]]) -> dict[str, list[int]]:
+    """Return the indices of the methods using each attribute."""
+    result: dict[str, list[int]] = {}
+    for method, method_attributes in enumerate(attributes):
+        for attribute in method_attributes:
+            result.setdefault(attribute, []).append(method)
+
+    return result
+
+
+def _sharing_pairs(attributes: Sequence[Iterable[str]], methods_by_attribute: Mapping[str, list[int]]) -> int:
+    """Return the number of pairs of methods sharing an attribute without enumerating the pairs."""
+    masks = {attribute: sum(1 << method for method in methods) for attribute, methods in methods_by_attribute.items()}
+    result = 0
+    for method, method_attributes in enumerate(attributes):
+        neighbours = 0
+        for attribute in method_attributes:
+            neighbours |= masks[attribute]
+
+        # only count the pairs with methods of a higher index
+        result += bin(neighbours >> (method + 1)).count("1")
+
+    return result
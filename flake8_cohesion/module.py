@@ -2,111 +2,578 @@
 
 from __future__ import annotations
 
+import ast
+import collections
+import enum
+import functools
 import operator
+import os
+import sys
+from collections.abc import Mapping
 from typing import TYPE_CHECKING
 
+from flake8_cohesion import diff
+from flake8_cohesion import metrics
 from flake8_cohesion import parser
+from flake8_cohesion import profiling
 
 if TYPE_CHECKING:
-    import ast
+    import mmap
     from collections.abc import Callable
+    from collections.abc import Iterable
+    from collections.abc import Iterator
     from collections.abc import Sequence
-    from typing import TypedDict
 
-    class FunctionDict(TypedDict):
-        variables: Sequence[str]
-        bounded: bool
-        staticmethod: bool  # noqa: A003,VNE003
-        classmethod: bool  # noqa: A003,VNE003
-        property: bool  # noqa: A003,VNE003
-        abstractmethod: bool
-        passing: bool
+    from flake8_cohesion.hierarchy import ClassIndex
 
-    class StructureDict(TypedDict):
-        cohesion: float | None
-        lineno: int
-        col_offset: int
-        variables: Sequence[str]
-        functions: dict[str, FunctionDict]
+    # class name, lineno, col_offset, cohesion, variable count, relevant function count
+    ClassResult = tuple[str, int, int, float, int, int]
+    # fingerprint of a class, strict and decorator table
+    MemoKey = tuple[bytes, bool, "DecoratorTable"]
+
+
+class MethodFlag(enum.IntFlag):
+    BOUNDED = enum.auto()
+    STATICMETHOD = enum.auto()
+    CLASSMETHOD = enum.auto()
+    PROPERTY = enum.auto()
+    ABSTRACTMETHOD = enum.auto()
+    PASSING = enum.auto()
+    IGNORED = enum.auto()
+
+
+_BOUNDED = int(MethodFlag.BOUNDED)
+_PASSING = int(MethodFlag.PASSING)
+_DECORATOR_TO_FLAG = {
+    "staticmethod": int(MethodFlag.STATICMETHOD),
+    "classmethod": int(MethodFlag.CLASSMETHOD),
+    "property": int(MethodFlag.PROPERTY),
+    "abstractmethod": int(MethodFlag.ABSTRACTMETHOD),
+}
+
+IRRELEVANT_METHOD_FLAGS = functools.reduce(
+    operator.or_, _DECORATOR_TO_FLAG.values(), int(MethodFlag.PASSING | MethodFlag.IGNORED)
+)
+
+_FUNCTION_KEY_TO_FLAG = {
+    "bounded": MethodFlag.BOUNDED,
+    "staticmethod": MethodFlag.STATICMETHOD,
+    "classmethod": MethodFlag.CLASSMETHOD,
+    "property": MethodFlag.PROPERTY,
+    "abstractmethod": MethodFlag.ABSTRACTMETHOD,
+    "passing": MethodFlag.PASSING,
+}
+
+_EMPTY_NAMES: frozenset[str] = frozenset()
+
+DEFAULT_MEMO_SIZE = 4096
+
+
+class DecoratorTable:
+    """Method flags of decorator names, a set of decorators is classified with a single set intersection."""
+
+    __slots__ = ("names", "flags")
+
+    def __init__(self, flags: Mapping[str, int]) -> None:
+        self.flags = dict(flags)
+        self.names = frozenset(self.flags)
+
+    def classify(self, decorators: frozenset[str]) -> int:
+        """Return the combined flags of the known decorators."""
+        flags = 0
+        for decorator in self.names & decorators:
+            flags |= self.flags[decorator]
+
+        return flags
+
+
+DEFAULT_DECORATOR_TABLE = DecoratorTable(_DECORATOR_TO_FLAG)
+
+
+@functools.lru_cache(maxsize=None)
+def decorator_table(ignore_decorators: frozenset[str] = _EMPTY_NAMES) -> DecoratorTable:
+    """Return the table of the builtin decorators extended by decorators whose methods are ignored.
+
+    Decorators are matched by their last name component, so ``functools.cached_property`` and ``cached_property``
+    are equivalent.
+    """
+    if not ignore_decorators:
+        return DEFAULT_DECORATOR_TABLE
+
+    flags = dict.fromkeys((name.rsplit(".", 1)[-1] for name in ignore_decorators), int(MethodFlag.IGNORED))
+    flags.update(_DECORATOR_TO_FLAG)
+    return DecoratorTable(flags)
+
+
+def intern_names(names: Iterable[str]) -> frozenset[str]:
+    """Return a frozenset of interned names."""
+    interned = frozenset(sys.intern(name) for name in names)
+    return interned or _EMPTY_NAMES
+
+
+class MethodInfo(Mapping):
+    """Variables and flags of a class method.
+
+    Read-only mapping access with the keys ``variables``, ``bounded``, ``staticmethod``, ``classmethod``,
+    ``property``, ``abstractmethod`` and ``passing`` is kept for compatibility with the former dict structure.
+    ``calls`` are the names of the bound methods the method calls via ``self.method()``.
+    """
+
+    __slots__ = ("variables", "flags", "calls")
+
+    _keys = ("variables", *_FUNCTION_KEY_TO_FLAG)
+
+    def __init__(self, variables: frozenset[str], flags: int, calls: frozenset[str] = _EMPTY_NAMES) -> None:
+        self.variables = variables
+        self.flags = flags
+        self.calls = calls
+
+    @property
+    def relevant(self) -> bool:
+        """Return whether the method is considered when calculating class cohesion."""
+        return not self.flags & IRRELEVANT_METHOD_FLAGS
+
+    def __getitem__(self, key: str) -> frozenset[str] | bool:
+        if key == "variables":
+            return self.variables
+
+        return bool(self.flags & _FUNCTION_KEY_TO_FLAG[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(variables={set(self.variables)!r}, flags={MethodFlag(self.flags)!r})"
+
+
+class ClassInfo(Mapping):
+    """Location, variables and methods of a class.
+
+    Read-only mapping access with the keys ``cohesion``, ``lineno``, ``col_offset``, ``variables`` and
+    ``functions`` is kept for compatibility with the former dict structure. Nested classes are linked through the
+    qualified names of their ``parent`` and ``children``. ``metrics`` memoizes the additional cohesion metrics.
+    ``bases`` are the fully qualified names of the base classes. ``truncated`` classes exceeded the analysis budget,
+    their cohesion is approximated without the ``skipped_methods``.
+    """
+
+    __slots__ = (
+        "cohesion",
+        "lineno",
+        "col_offset",
+        "variables",
+        "functions",
+        "name",
+        "parent",
+        "children",
+        "metrics",
+        "bases",
+        "truncated",
+        "skipped_methods",
+    )
+
+    _keys = ("cohesion", "lineno", "col_offset", "variables", "functions")
+
+    def __init__(
+        self,
+        lineno: int,
+        col_offset: int,
+        variables: frozenset[str],
+        functions: dict[str, MethodInfo],
+        cohesion: float | None = None,
+        name: str = "",
+        parent: str | None = None,
+        children: tuple[str, ...] = (),
+        bases: tuple[str, ...] = (),
+        truncated: bool = False,
+        skipped_methods: int = 0,
+    ) -> None:
+        self.cohesion = cohesion
+        self.lineno = lineno
+        self.col_offset = col_offset
+        self.variables = variables
+        self.functions = functions
+        self.name = name
+        self.parent = parent
+        self.children = children
+        self.bases = bases
+        self.truncated = truncated
+        self.skipped_methods = skipped_methods
+        self.metrics: metrics.Metrics | None = None
+
+    def __getitem__(self, key: str) -> float | frozenset[str] | dict[str, MethodInfo] | None:
+        if key not in self._keys:
+            raise KeyError(key)
+
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(lineno={self.lineno!r}, col_offset={self.col_offset!r}, cohesion={self.cohesion!r})"
+        )
+
+
+class ClassTemplate:
+    """Structure of a class relative to the outermost class it is defined in.
+
+    Qualified names are suffixes of the qualified name of the outermost class and lines are offsets to its line, so
+    one template serves all structurally identical classes. The bases are kept as written and resolved per module.
+    """
+
+    __slots__ = (
+        "suffix",
+        "name",
+        "depth",
+        "line_offset",
+        "col_offset",
+        "parent",
+        "children",
+        "base_names",
+        "variables",
+        "functions",
+        "truncated",
+        "skipped_methods",
+    )
+
+    def __init__(
+        self,
+        parsed_class: parser.ParsedClass,
+        strict: bool,
+        decorators: DecoratorTable = DEFAULT_DECORATOR_TABLE,
+        root: parser.ParsedClass | None = None,
+    ) -> None:
+        prefix_length = len(root.qualname) if root is not None else 0
+        parent = parsed_class.parent
+        self.suffix = parsed_class.qualname[prefix_length:]
+        self.name = parsed_class.name
+        self.depth = parsed_class.depth
+        self.line_offset = parsed_class.node.lineno - (root.node.lineno if root is not None else 0)
+        self.col_offset = parsed_class.node.col_offset
+        self.parent = parent.qualname[prefix_length:] if parent is not None else None
+        self.children = tuple(child.qualname[prefix_length:] for child in parsed_class.children)
+        self.base_names = parser.get_class_base_names(parsed_class.node)
+        self.variables = intern_names(parsed_class.variable_names(strict))
+        self.functions = {
+            method.name: Module._create_method_info(method, decorators) for method in parsed_class.methods
+        }
+        self.truncated = parsed_class.truncated
+        self.skipped_methods = parsed_class.skipped_methods
+
+
+class StructureMemo:
+    """In-process LRU memo of the class templates of outermost classes by their fingerprint.
+
+    ``hits`` and ``misses`` count the lookups since the memo was created or cleared.
+    """
+
+    __slots__ = ("maxsize", "hits", "misses", "_entries")
+
+    def __init__(self, maxsize: int = DEFAULT_MEMO_SIZE) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: collections.OrderedDict[MemoKey, tuple[ClassTemplate, ...]] = collections.OrderedDict()
+
+    def get(self, key: MemoKey) -> tuple[ClassTemplate, ...] | None:
+        templates = self._entries.get(key)
+        if templates is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return templates
+
+    def set(self, key: MemoKey, templates: tuple[ClassTemplate, ...]) -> None:  # noqa: A003
+        self._entries[key] = templates
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def resize(self, maxsize: int) -> None:
+        """Change the number of memoized classes, ``0`` disables the memo."""
+        self.maxsize = maxsize
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# disabled unless a size is configured, e.g. with --cohesion-memo-size
+structure_memo = StructureMemo(0)
 
 
 class Module:
-    def __init__(self, module_ast_node: ast.AST, strict: bool = False) -> None:
-        self.structure = self._create_structure(module_ast_node, strict)
+    """Structure and cohesion of the classes of a module.
+
+    ``module_name`` is the dotted name of the module, it is used to resolve the bases of its classes. If a
+    ``class_index`` is given, classes additionally inherit the methods of their indexed bases that they do not
+    override, so variables set up by a base class count towards the cohesion of its subclasses. If the encoded
+    ``source`` of the tree is given, the structure of structurally identical classes is taken from the
+    :data:`structure_memo`. Within a ``budget``, classes that exceed it are ``truncated`` and classes after the time
+    of the file ran out are skipped, see :attr:`budget_exceeded`. If ``class_nodes`` are given, only these classes
+    of the tree and the classes nested in them are analyzed.
+    """
+
+    def __init__(
+        self,
+        module_ast_node: ast.AST,
+        strict: bool = False,
+        line_ranges: Sequence[diff.LineRange] | None = None,
+        ignore_decorators: Iterable[str] = (),
+        module_name: str = "",
+        class_index: ClassIndex | None = None,
+        source: bytes | mmap.mmap | None = None,
+        budget: parser.AnalysisBudget | None = None,
+        class_nodes: Sequence[ast.ClassDef] | None = None,
+    ) -> None:
+        self._module_ast_node = module_ast_node
+        self._strict = strict
+        self._line_ranges = line_ranges
+        self._decorator_table = decorator_table(frozenset(ignore_decorators))
+        self._module_name = module_name
+        self._class_index = class_index
+        self._source = source
+        self._budget = budget
+        self._class_nodes = class_nodes
+        self._file_budget: parser.AnalysisBudget | None = None
+        self._structure: dict[str, ClassInfo] | None = None
 
-        for class_name in self.structure.keys():
-            self.class_cohesion_percentage(class_name)
+    @property
+    def structure(self) -> dict[str, ClassInfo]:
+        """Return the structure of all classes, it is built on first access and cohesion is only scored on demand."""
+        if self._structure is None:
+            self._file_budget = self._budget.start() if self._budget is not None else None
+            self._structure = self._create_structure(
+                self._module_ast_node,
+                self._strict,
+                self._line_ranges,
+                self._decorator_table,
+                self._module_name,
+                self._class_index,
+                self._source,
+                self._file_budget,
+                self._class_nodes,
+            )
+            # the source is only needed to look up memoized classes, the file it was mapped from may be closed
+            self._source = None
+
+        return self._structure
+
+    @property
+    def budget_exceeded(self) -> bool:
+        """Return whether the time of the budget ran out while building the structure, later classes are missing."""
+        # the budget is only spent while the structure is built
+        self.structure
+        return self._file_budget is not None and self._file_budget.expired
 
     @property
     def classes(self) -> Sequence[str]:
         return list(self.structure.keys())
 
     def functions(self, class_name: str) -> Sequence[str]:
-        return list(self.structure[class_name]["functions"].keys())
+        return list(self.structure[class_name].functions.keys())
+
+    def relevant_functions(self, class_name: str) -> Sequence[str]:
+        return [
+            function_name
+            for function_name, function in self.structure[class_name].functions.items()
+            if function.relevant
+        ]
+
+    def parent(self, class_name: str) -> str | None:
+        """Return the qualified name of the class a class is nested in."""
+        return self.structure[class_name].parent
+
+    def children(self, class_name: str) -> Sequence[str]:
+        """Return the qualified names of the classes nested in a class."""
+        return list(self.structure[class_name].children)
 
     def class_variables(self, class_name: str) -> Sequence[str]:
-        return self.structure[class_name]["variables"]
+        return list(self.structure[class_name].variables)
 
     def function_variables(self, class_name: str, function_name: str) -> Sequence[str]:
-        return self.structure[class_name]["functions"][function_name]["variables"]
+        return list(self.structure[class_name].functions[function_name].variables)
 
     @classmethod
-    def from_string(cls, python_string: str, strict: bool = False) -> Module:
+    def from_string(
+        cls,
+        python_string: str | bytes,
+        strict: bool = False,
+        line_ranges: Sequence[diff.LineRange] | None = None,
+        ignore_decorators: Iterable[str] = (),
+        module_name: str = "",
+        class_index: ClassIndex | None = None,
+        budget: parser.AnalysisBudget | None = None,
+    ) -> Module:
         module_ast_node = parser.get_ast_node_from_string(python_string)
+        if isinstance(python_string, str):
+            python_string = python_string.encode("utf-8", "surrogatepass")
+
+        options = (strict, line_ranges, ignore_decorators, module_name, class_index)
+        return cls(module_ast_node, *options, python_string, budget)
+
+    @classmethod
+    def from_tree(
+        cls,
+        module_ast_node: ast.AST,
+        strict: bool = False,
+        line_ranges: Sequence[diff.LineRange] | None = None,
+        ignore_decorators: Iterable[str] = (),
+        module_name: str = "",
+        class_index: ClassIndex | None = None,
+        source: str | bytes | None = None,
+        budget: parser.AnalysisBudget | None = None,
+    ) -> Module:
+        """Return the module of an already parsed tree, e.g. the tree flake8 passes to its plugins.
+
+        The ``source`` the tree was parsed from is optional, it is only used to look up structurally identical classes
+        in the :data:`structure_memo`. The lines flake8 passes to its plugins can be joined to a source.
+        """
+        if isinstance(source, str):
+            source = source.encode("utf-8", "surrogatepass")
+
+        options = (strict, line_ranges, ignore_decorators, module_name, class_index)
+        return cls(module_ast_node, *options, source, budget)
+
+    @classmethod
+    def from_class_nodes(
+        cls,
+        class_nodes: Iterable[ast.ClassDef],
+        module_ast_node: ast.AST | None = None,
+        strict: bool = False,
+        ignore_decorators: Iterable[str] = (),
+        module_name: str = "",
+        class_index: ClassIndex | None = None,
+        budget: parser.AnalysisBudget | None = None,
+    ) -> Module:
+        """Return a module restricted to already parsed classes and the classes nested in them.
+
+        If the tree the classes are part of is given, classes are named by their qualified name in the tree and their
+        bases are resolved with the imports of the tree, otherwise they are named like top-level classes.
+        """
+        class_nodes = list(class_nodes)
+        if module_ast_node is None:
+            module_ast_node = ast.Module(body=list(class_nodes), type_ignores=[])
+
+        options = (strict, None, ignore_decorators, module_name, class_index)
+        return cls(module_ast_node, *options, budget=budget, class_nodes=class_nodes)
+
+    @classmethod
+    def from_path(
+        cls,
+        path: str | os.PathLike[str],
+        strict: bool = False,
+        line_ranges: Sequence[diff.LineRange] | None = None,
+        ignore_decorators: Iterable[str] = (),
+        module_name: str = "",
+        class_index: ClassIndex | None = None,
+        budget: parser.AnalysisBudget | None = None,
+    ) -> Module:
+        """Return the module of a python file, decoded according to its encoding declaration.
+
+        Regular files are memory-mapped, if the :data:`structure_memo` is enabled the structure is built while the
+        file is mapped.
+        """
+        options = (strict, line_ranges, ignore_decorators, module_name, class_index)
+        if not structure_memo.maxsize or line_ranges is not None:
+            return cls(parser.get_ast_node_from_file(path), *options, budget=budget)
+
+        with parser.open_source(path) as source:
+            module_ast_node = parser.get_ast_node_from_string(source)  # type: ignore[arg-type]
+            file_module = cls(module_ast_node, *options, source, budget)
+            # built while the file is mapped
+            file_module.structure
+
+        return file_module
+
+    @classmethod
+    def from_paths(
+        cls,
+        paths: Iterable[str | os.PathLike[str]],
+        strict: bool = False,
+        ignore_decorators: Iterable[str] = (),
+    ) -> Iterator[tuple[str, Module]]:
+        """Yield the path and module of many python files, see :func:`flake8_cohesion.batch.score_many` for scoring."""
+        for path in paths:
+            yield os.fspath(path), cls.from_path(path, strict, ignore_decorators=ignore_decorators)
+
+    @profiling.profiled("Module.class_results")
+    def class_results(self) -> list[ClassResult]:
+        return [self.class_result(class_name) for class_name in self.structure]
+
+    def class_result(self, class_name: str) -> ClassResult:
+        class_structure = self.structure[class_name]
+        return (
+            class_name,
+            class_structure.lineno,
+            class_structure.col_offset,
+            self.class_cohesion_percentage(class_name),
+            len(class_structure.variables),
+            len(self.relevant_functions(class_name)),
+        )
 
-        return cls(module_ast_node, strict)
+    def filter_below(self, percentage: float) -> Iterator[str]:
+        """Yield the names of the classes with a cohesion of percentage or lower."""
 
-    def filter_below(self, percentage: float) -> None:
         def predicate(class_name: str) -> bool:
             class_percentage = self.class_cohesion_percentage(class_name)
             return operator.le(class_percentage, percentage)
 
-        self._filter(predicate)
+        yield from self._filter(predicate)
+
+    def filter_above(self, percentage: float) -> Iterator[str]:
+        """Yield the names of the classes with a cohesion of percentage or higher."""
 
-    def filter_above(self, percentage: float) -> None:
         def predicate(class_name: str) -> bool:
             class_percentage = self.class_cohesion_percentage(class_name)
             return operator.ge(class_percentage, percentage)
 
-        self._filter(predicate)
+        yield from self._filter(predicate)
 
-    def _filter(self, predicate: Callable[[str], bool] = lambda class_name: True) -> None:
-        self.structure = {
-            class_name: class_structure
-            for class_name, class_structure in self.structure.items()
-            if predicate(class_name)
-        }
+    def _filter(self, predicate: Callable[[str], bool] = lambda class_name: True) -> Iterator[str]:
+        return (class_name for class_name in self.structure if predicate(class_name))
 
+    @profiling.profiled("Module.class_cohesion_percentage")
     def class_cohesion_percentage(self, class_name: str) -> float:
-        class_percentage = self._calculate_class_percentage(class_name)
+        """Return the memoized cohesion of a class, it is calculated on the first call."""
+        class_structure = self.structure[class_name]
+        if class_structure.cohesion is None:
+            class_structure.cohesion = self._calculate_class_percentage(class_name)
+
+        return class_structure.cohesion
 
-        self.structure[class_name]["cohesion"] = class_percentage
+    def class_metrics(self, class_name: str) -> metrics.Metrics:
+        """Return the memoized LCOM1-4, TCC and LCC metrics of a class, they are calculated on the first call."""
+        class_structure = self.structure[class_name]
+        if class_structure.metrics is None:
+            class_structure.metrics = metrics.class_metrics(class_structure)
 
-        return class_percentage
+        return class_structure.metrics
 
     def _calculate_class_percentage(self, class_name: str) -> float:
-        cohesion = self.structure[class_name]["cohesion"]
-        if cohesion is not None:
-            return cohesion
-
-        relevant_functions = {
-            k: v
-            for k, v in self.structure[class_name]["functions"].items()
-            if (v["staticmethod"] is False)
-            and (v["classmethod"] is False)
-            and (v["property"] is False)
-            and (v["abstractmethod"] is False)
-            and (v["passing"] is False)
-        }
+        class_structure = self.structure[class_name]
+
+        relevant_functions = [function for function in class_structure.functions.values() if function.relevant]
 
         total_function_variable_count = sum(
-            len({e.strip("_") for e in function_structure["variables"]})
-            for function_structure in relevant_functions.values()
+            len({e.strip("_") for e in function_structure.variables}) for function_structure in relevant_functions
         )
 
-        total_class_variable_count = len({e.strip("_") for e in self.structure[class_name]["variables"]}) * len(
-            relevant_functions
-        )
+        total_class_variable_count = len({e.strip("_") for e in class_structure.variables}) * len(relevant_functions)
 
         if total_class_variable_count == 0:
             return 100.0
@@ -114,77 +581,302 @@ class Module:
         return round((total_function_variable_count / total_class_variable_count) * 100, 2)
 
     @staticmethod
-    def _create_structure(file_ast_node: ast.AST, strict: bool) -> dict[str, StructureDict]:
-        module_classes = parser.get_module_classes(file_ast_node)
-
-        result: dict[str, StructureDict] = {}
-
-        for module_class in module_classes:
-            class_name = parser.get_object_name(module_class)
-
-            class_variable_names = list(parser.get_all_class_variable_names(module_class, strict))
-
-            class_methods = parser.get_class_methods(module_class)
-
-            class_method_name_to_method = {str(method.name): method for method in class_methods}
-
-            class_method_name_to_variable_names = {
-                method_name: list(parser.get_all_class_variable_names_used_in_method(method))
-                for method_name, method in class_method_name_to_method.items()
-            }
-
-            class_method_name_to_boundedness = {
-                method_name: parser.is_class_method_bound(method)
-                for method_name, method in class_method_name_to_method.items()
-            }
-
-            class_method_name_to_staticmethodness = {
-                method_name: parser.is_class_method_staticmethod(method)
-                for method_name, method in class_method_name_to_method.items()
-            }
-
-            class_method_name_to_classmethodness = {
-                method_name: parser.is_class_method_classmethod(method)
-                for method_name, method in class_method_name_to_method.items()
-            }
-
-            class_method_name_to_propertyness = {
-                method_name: parser.is_class_method_property(method)
-                for method_name, method in class_method_name_to_method.items()
-            }
-
-            class_method_name_to_abstractmethodness = {
-                method_name: parser.is_class_method_abstractmethod(method)
-                for method_name, method in class_method_name_to_method.items()
-            }
-
-            class_method_name_to_only_passing = {
-                method_name: parser.is_class_method_only_passing(method)
-                for method_name, method in class_method_name_to_method.items()
-            }
-
-            cohesion = None
-            lineno = module_class.lineno
-            col_offset = module_class.col_offset
-            variables = class_variable_names
-            functions: dict[str, FunctionDict] = {
-                method_name: {
-                    "variables": class_method_name_to_variable_names[method_name],
-                    "bounded": class_method_name_to_boundedness[method_name],
-                    "staticmethod": class_method_name_to_staticmethodness[method_name],
-                    "classmethod": class_method_name_to_classmethodness[method_name],
-                    "property": class_method_name_to_propertyness[method_name],
-                    "abstractmethod": class_method_name_to_abstractmethodness[method_name],
-                    "passing": class_method_name_to_only_passing[method_name],
-                }
-                for method_name in class_method_name_to_method.keys()
-            }
-            result[class_name] = {
-                "cohesion": cohesion,
-                "lineno": lineno,
-                "col_offset": col_offset,
-                "variables": variables,
-                "functions": functions,
-            }
+    @profiling.profiled("Module._create_structure")
+    def _create_structure(
+        file_ast_node: ast.AST,
+        strict: bool,
+        line_ranges: Sequence[diff.LineRange] | None = None,
+        decorators: DecoratorTable = DEFAULT_DECORATOR_TABLE,
+        module_name: str = "",
+        class_index: ClassIndex | None = None,
+        source: bytes | mmap.mmap | None = None,
+        budget: parser.AnalysisBudget | None = None,
+        class_nodes: Sequence[ast.ClassDef] | None = None,
+    ) -> dict[str, ClassInfo]:
+        imports = parser.get_module_imports(file_ast_node, module_name)
+        templates = Module._templates(file_ast_node, strict, line_ranges, decorators, source, budget, class_nodes)
+        classes = [
+            (
+                root_qualname + template.suffix,
+                Module._create_class_info(template, root_qualname, root_lineno, imports, module_name, class_index),
+            )
+            for template, root_qualname, root_lineno in templates
+        ]
+        result = dict(classes)
+        if len(result) < len(classes):
+            return Module._disambiguate(classes)
 
         return result
+
+    @staticmethod
+    def _disambiguate(classes: Sequence[tuple[str, ClassInfo]]) -> dict[str, ClassInfo]:
+        """Return classes with the same qualified name, e.g. conditionally redefined ones, under distinct names.
+
+        Definitions after the first one are named after their line, e.g. ``Cls@12``, and so are the classes nested in
+        them, e.g. ``Cls@12.Inner``. The order of the classes is kept.
+        """
+        names: dict[int, str] = {}
+        taken: set[str] = set()
+        # distinct names of the definitions of every qualified name by their line
+        definitions: dict[str, dict[int, str]] = {}
+        # enclosing classes precede the classes nested in them
+        for qualname, class_info in sorted(classes, key=lambda item: (item[1].lineno, item[1].col_offset)):
+            name = qualname
+            if class_info.parent in definitions:
+                parent = Module._enclosing_definition(definitions[class_info.parent], class_info.lineno)
+                name = parent + qualname.removeprefix(class_info.parent)
+                class_info.parent = parent
+
+            if name in taken:
+                name = f"{name}@{class_info.lineno}"
+
+            definitions.setdefault(qualname, {})[class_info.lineno] = name
+            names[id(class_info)] = name
+            taken.add(name)
+
+        result = {names[id(class_info)]: class_info for _, class_info in classes}
+        Module._link_children(result)
+        return result
+
+    @staticmethod
+    def _enclosing_definition(definitions: Mapping[int, str], lineno: int) -> str:
+        # definitions of the same qualified name are not nested in each other, the last one before a line encloses it
+        return definitions[max(definition_lineno for definition_lineno in definitions if definition_lineno <= lineno)]
+
+    @staticmethod
+    def _link_children(structure: Mapping[str, ClassInfo]) -> None:
+        for class_info in structure.values():
+            class_info.children = ()
+
+        for name, class_info in sorted(structure.items(), key=lambda item: item[1].lineno):
+            if class_info.parent is not None:
+                parent_info = structure[class_info.parent]
+                parent_info.children = (*parent_info.children, name)
+
+    @staticmethod
+    def _templates(
+        file_ast_node: ast.AST,
+        strict: bool,
+        line_ranges: Sequence[diff.LineRange] | None,
+        decorators: DecoratorTable,
+        source: bytes | mmap.mmap | None,
+        budget: parser.AnalysisBudget | None,
+        class_nodes: Sequence[ast.ClassDef] | None,
+    ) -> list[tuple[ClassTemplate, str, int]]:
+        # class templates with the qualified name and line of the outermost class they are relative to
+        scoped_nodes: Sequence[tuple[str, ast.AST]]
+        if class_nodes is not None:
+            scoped_nodes = parser.get_class_scopes(file_ast_node, class_nodes)
+        elif line_ranges is not None:
+            scoped_nodes = parser.get_classes_in_lines(file_ast_node, line_ranges)
+        elif source is None or not structure_memo.maxsize or not isinstance(file_ast_node, ast.Module):
+            scoped_nodes = [("", file_ast_node)]
+        else:
+            return Module._memoized_templates(file_ast_node, source, strict, decorators, budget)
+
+        return [
+            (ClassTemplate(parsed_class, strict, decorators), "", 0)
+            for scope, node in scoped_nodes
+            for parsed_class in parser.collect_classes(node, scope=scope, budget=budget)
+            if line_ranges is None or parser.overlaps_lines(parsed_class.node, line_ranges)
+        ]
+
+    @staticmethod
+    def _memoized_templates(
+        file_ast_node: ast.Module,
+        source: bytes | mmap.mmap,
+        strict: bool,
+        decorators: DecoratorTable,
+        budget: parser.AnalysisBudget | None = None,
+    ) -> list[tuple[ClassTemplate, str, int]]:
+        # outermost classes of the module body are looked up by their fingerprint, the classes of all other
+        # statements and of the outermost classes that are not memoized yet are collected in a single pass
+        lines = parser.SourceLines(source)
+        result: list[tuple[ClassTemplate, str, int]] = []
+        statements = [statement for statement in file_ast_node.body if not isinstance(statement, ast.ClassDef)]
+        missed: dict[MemoKey, ast.ClassDef] = {}
+        # classes structurally identical to a missed class, they are looked up once it is memoized
+        duplicates: list[tuple[MemoKey, ast.ClassDef]] = []
+        for class_node in (statement for statement in file_ast_node.body if isinstance(statement, ast.ClassDef)):
+            key = Module._memo_key(class_node, lines, strict, decorators)
+            class_templates = Module._memo_lookup(key, missed)
+            if class_templates is not None:
+                result.extend(Module._relative_to(class_templates, class_node))
+            elif key is None:
+                statements.append(class_node)
+            elif key in missed:
+                duplicates.append((key, class_node))
+            else:
+                missed[key] = class_node
+                statements.append(class_node)
+
+        # collected in the order of the module, the time of a budget runs out at the same class
+        statements.sort(key=lambda statement: (statement.lineno, statement.col_offset))
+        result.extend(Module._collected_templates(statements, missed, strict, decorators, budget))
+        result.extend(Module._duplicate_templates(duplicates, strict, decorators, budget))
+        # the classes of all statements in the order of parser.collect_classes on the whole module, i.e. by depth and
+        # then by position
+        result.sort(key=lambda item: (item[0].depth, item[2] + item[0].line_offset, item[0].col_offset))
+        return result
+
+    @staticmethod
+    def _memo_key(
+        class_node: ast.ClassDef,
+        lines: parser.SourceLines,
+        strict: bool,
+        decorators: DecoratorTable,
+    ) -> MemoKey | None:
+        # only classes whose name can be located in their source are memoized
+        fingerprint = parser.get_class_fingerprint(class_node, lines)
+        return (fingerprint, strict, decorators) if fingerprint is not None else None
+
+    @staticmethod
+    def _memo_lookup(key: MemoKey | None, missed: Mapping[MemoKey, ast.ClassDef]) -> tuple[ClassTemplate, ...] | None:
+        # duplicates of a missed class are not looked up before it is memoized
+        if key is None or key in missed:
+            return None
+
+        return structure_memo.get(key)
+
+    @staticmethod
+    def _relative_to(
+        class_templates: Iterable[ClassTemplate],
+        root: ast.ClassDef,
+    ) -> Iterator[tuple[ClassTemplate, str, int]]:
+        return ((template, root.name, root.lineno) for template in class_templates)
+
+    @staticmethod
+    def _duplicate_templates(
+        duplicates: Iterable[tuple[MemoKey, ast.ClassDef]],
+        strict: bool,
+        decorators: DecoratorTable,
+        budget: parser.AnalysisBudget | None = None,
+    ) -> list[tuple[ClassTemplate, str, int]]:
+        result: list[tuple[ClassTemplate, str, int]] = []
+        for key, statement in duplicates:
+            class_templates = structure_memo.get(key)
+            if class_templates is None:
+                class_templates = Module._memoize_again(key, statement, strict, decorators, budget)
+
+            result.extend(Module._relative_to(class_templates, statement))
+
+        return result
+
+    @staticmethod
+    def _memoize_again(
+        key: MemoKey,
+        statement: ast.ClassDef,
+        strict: bool,
+        decorators: DecoratorTable,
+        budget: parser.AnalysisBudget | None = None,
+    ) -> tuple[ClassTemplate, ...]:
+        # the identical class was truncated or evicted again
+        parsed_classes = parser.collect_classes(ast.Module(body=[statement], type_ignores=[]), budget=budget)
+        if not parsed_classes:
+            # the time of the budget ran out before the class
+            return ()
+
+        return Module._memoize(key, parsed_classes, strict, decorators)
+
+    @staticmethod
+    def _collected_templates(
+        statements: list[ast.stmt],
+        missed: Mapping[MemoKey, ast.ClassDef],
+        strict: bool,
+        decorators: DecoratorTable,
+        budget: parser.AnalysisBudget | None = None,
+    ) -> list[tuple[ClassTemplate, str, int]]:
+        # the classes of the missed outermost classes are memoized, the classes of other statements are not
+        keys = {id(class_node): key for key, class_node in missed.items()}
+        result: list[tuple[ClassTemplate, str, int]] = []
+        grouped: dict[int, list[parser.ParsedClass]] = {}
+        for parsed_class in parser.collect_classes(ast.Module(body=statements, type_ignores=[]), budget=budget):
+            root = parsed_class
+            while root.parent is not None:
+                root = root.parent
+
+            if id(root.node) in keys:
+                grouped.setdefault(id(root.node), []).append(parsed_class)
+            else:
+                result.append((ClassTemplate(parsed_class, strict, decorators), "", 0))
+
+        for root_id, parsed_classes in grouped.items():
+            root = parsed_classes[0]
+            class_templates = Module._memoize(keys[root_id], parsed_classes, strict, decorators)
+            result.extend((template, root.name, root.node.lineno) for template in class_templates)
+
+        return result
+
+    @staticmethod
+    def _memoize(
+        key: MemoKey,
+        parsed_classes: Sequence[parser.ParsedClass],
+        strict: bool,
+        decorators: DecoratorTable,
+    ) -> tuple[ClassTemplate, ...]:
+        # templates relative to the outermost class, the first of the parsed classes, truncated ones are not memoized
+        root = parsed_classes[0]
+        class_templates = tuple(
+            ClassTemplate(parsed_class, strict, decorators, root) for parsed_class in parsed_classes
+        )
+        if not any(template.truncated for template in class_templates):
+            structure_memo.set(key, class_templates)
+
+        return class_templates
+
+    @staticmethod
+    def _create_class_info(
+        template: ClassTemplate,
+        root_qualname: str,
+        root_lineno: int,
+        imports: Mapping[str, str],
+        module_name: str,
+        class_index: ClassIndex | None,
+    ) -> ClassInfo:
+        functions = dict(template.functions)
+        variables = template.variables
+        bases = parser.resolve_bases(template.base_names, imports, module_name)
+        if class_index is not None:
+            variables = Module._inherit_methods(functions, variables, class_index.inherited_methods(bases))
+
+        return ClassInfo(
+            lineno=root_lineno + template.line_offset,
+            col_offset=template.col_offset,
+            variables=variables,
+            functions=functions,
+            # the outermost class of a template is named after the class it is used for
+            name=template.name if template.suffix else root_qualname,
+            parent=None if template.parent is None else root_qualname + template.parent,
+            children=tuple(root_qualname + child for child in template.children),
+            bases=bases,
+            truncated=template.truncated,
+            skipped_methods=template.skipped_methods,
+        )
+
+    @staticmethod
+    def _inherit_methods(
+        functions: dict[str, MethodInfo],
+        variables: frozenset[str],
+        inherited_methods: Mapping[str, MethodInfo],
+    ) -> frozenset[str]:
+        """Add the inherited methods that are not overridden to the functions and return all variables."""
+        for method_name, method_info in inherited_methods.items():
+            if method_name not in functions:
+                functions[method_name] = method_info
+                variables = variables | method_info.variables
+
+        return intern_names(variables)
+
+    @staticmethod
+    def _create_method_info(
+        method: parser.ParsedMethod,
+        decorators: DecoratorTable = DEFAULT_DECORATOR_TABLE,
+    ) -> MethodInfo:
+        flags = decorators.classify(method.decorators)
+        if method.bounded:
+            flags |= _BOUNDED
+
+        if method.passing:
+            flags |= _PASSING
+
+        return MethodInfo(intern_names(method.instance_variable_names), flags, intern_names(method.method_calls))
@@ -3,19 +3,46 @@
 from __future__ import annotations
 
 import ast
+import builtins
+import contextlib
+import hashlib
 import itertools
+import mmap
+import operator
+import pathlib
+import re
+import time
 from typing import TYPE_CHECKING
 
+from flake8_cohesion import diff
+from flake8_cohesion import profiling
+
 if TYPE_CHECKING:
+    import os
     from collections.abc import Iterable
+    from collections.abc import Iterator
+    from collections.abc import Mapping
+    from collections.abc import Sequence
 
     NameDispatchKey = type[ast.AST]
 
 
 BOUND_METHOD_ARGUMENT_NAME = "self"
 
+FUNCTION_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+_ONLY_PASSING_TYPES = (*FUNCTION_TYPES, ast.arguments, ast.Pass, ast.arg)
+
+# the line ends recognized by bytes.splitlines and the tokenizer
+_LINE_END = re.compile(rb"\r\n?|\n")
+
+# the keyword of a class definition up to its name
+_CLASS_KEYWORD = re.compile(rb"class\s+")
 
-def is_class_method_bound(method: ast.FunctionDef, arg_name: str = BOUND_METHOD_ARGUMENT_NAME) -> bool:
+
+def is_class_method_bound(
+    method: ast.FunctionDef | ast.AsyncFunctionDef, arg_name: str = BOUND_METHOD_ARGUMENT_NAME
+) -> bool:
     """Return whether a class method is bound to the class."""
     if not method.args.args:
         return False
@@ -27,43 +54,42 @@ def is_class_method_bound(method: ast.FunctionDef, arg_name: str = BOUND_METHOD_
     return first_arg_name == arg_name
 
 
-def is_class_method_classmethod(method: ast.FunctionDef) -> bool:
+def is_class_method_classmethod(method: ast.FunctionDef | ast.AsyncFunctionDef) -> bool:
     """Return whether a class method is a classmethod."""
     return class_method_has_decorator(method, "classmethod")
 
 
-def is_class_method_staticmethod(method: ast.FunctionDef) -> bool:
+def is_class_method_staticmethod(method: ast.FunctionDef | ast.AsyncFunctionDef) -> bool:
     """Return whether a class method is a staticmethod."""
     return class_method_has_decorator(method, "staticmethod")
 
 
-def is_class_method_property(method: ast.FunctionDef) -> bool:
+def is_class_method_property(method: ast.FunctionDef | ast.AsyncFunctionDef) -> bool:
     """Return whether a class method is a property."""
     return class_method_has_decorator(method, "property")
 
 
-def is_class_method_abstractmethod(method: ast.FunctionDef) -> bool:
+def is_class_method_abstractmethod(method: ast.FunctionDef | ast.AsyncFunctionDef) -> bool:
     """Return whether a class method is a abstractmethod."""
     return class_method_has_decorator(method, "abstractmethod")
 
 
-def is_class_method_only_passing(method: ast.FunctionDef) -> bool:
+def is_class_method_only_passing(method: ast.FunctionDef | ast.AsyncFunctionDef) -> bool:
     """Return whether a class method contains only a pass statement."""
-    allowed_ast_types = (ast.FunctionDef, ast.arguments, ast.Pass, ast.arg)
-    return all(isinstance(child, allowed_ast_types) for child in ast.walk(method))
+    return all(isinstance(child, _ONLY_PASSING_TYPES) for child in ast.walk(method))
 
 
-def class_method_has_decorator(method: ast.FunctionDef, decorator: str) -> bool:
+def class_method_has_decorator(method: ast.FunctionDef | ast.AsyncFunctionDef, decorator: str) -> bool:
     """Return whether a class method has a specific decorator."""
     return decorator in [get_object_name(d) for d in method.decorator_list]
 
 
-def get_class_methods(cls: ast.ClassDef) -> Iterable[ast.FunctionDef]:
-    """Return methods associated with a given class."""
-    return [node for node in cls.body if isinstance(node, ast.FunctionDef)]
+def get_class_methods(cls: ast.ClassDef) -> Iterable[ast.FunctionDef | ast.AsyncFunctionDef]:
+    """Return methods, including async methods, associated with a given class."""
+    return [node for node in cls.body if isinstance(node, FUNCTION_TYPES)]
 
 
-def get_all_class_variable_names_used_in_method(method: ast.FunctionDef) -> set[str]:
+def get_all_class_variable_names_used_in_method(method: ast.FunctionDef | ast.AsyncFunctionDef) -> set[str]:
     """Return the names of all instance variables associated with a given method."""
     return {get_object_name(variable) for variable in get_instance_variables(method)}
 
@@ -90,13 +116,16 @@ def get_instance_variables(
     bound_name_classifier: str = BOUND_METHOD_ARGUMENT_NAME,
 ) -> Iterable[ast.Attribute]:
     """Return instance variables used in an AST node."""
-    node_attributes = [
-        child
-        for child in ast.walk(node)
-        if isinstance(child, ast.Attribute) and get_attribute_name_id(child) == bound_name_classifier
-    ]
-    node_function_call_names = [get_object_name(child) for child in ast.walk(node) if isinstance(child, ast.Call)]
-    return [attribute for attribute in node_attributes if get_object_name(attribute) not in node_function_call_names]
+    node_attributes = []
+    node_function_call_names = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Attribute):
+            if get_attribute_name_id(child) == bound_name_classifier:
+                node_attributes.append(child)
+        elif isinstance(child, ast.Call):
+            node_function_call_names.add(get_object_name(child))
+
+    return [attribute for attribute in node_attributes if attribute.attr not in node_function_call_names]
 
 
 def get_attribute_name_id(attr: ast.Attribute) -> str | None:
@@ -105,26 +134,72 @@ def get_attribute_name_id(attr: ast.Attribute) -> str | None:
 
 
 def get_class_variables(cls: ast.ClassDef) -> Iterable[ast.expr]:
-    """Return class variables associated with a given class."""
-    return [target for node in cls.body if isinstance(node, ast.Assign) for target in node.targets]
+    """Return class variables associated with a given class, unpacking targets are flattened."""
+    return [
+        variable
+        for node in cls.body
+        if isinstance(node, ast.Assign)
+        for target in node.targets
+        for variable in _flatten_target(target)
+    ]
+
+
+def _flatten_target(target: ast.expr) -> Iterator[ast.expr]:
+    if isinstance(target, (ast.Tuple, ast.List)):
+        for element in target.elts:
+            yield from _flatten_target(element)
+    else:
+        yield target
+
+
+# field holding the name of a node, or the node to take the name from
+_NAME_FIELDS: dict[NameDispatchKey, str] = {
+    ast.Name: "id",
+    ast.Attribute: "attr",
+    ast.Call: "func",
+    ast.FunctionDef: "name",
+    ast.AsyncFunctionDef: "name",
+    ast.ClassDef: "name",
+    ast.Subscript: "value",
+    ast.Starred: "value",
+    ast.arg: "arg",
+}
+
+_CONSTANT_NAMES: dict[NameDispatchKey, str] = {
+    ast.Lambda: "<lambda>",
+}
 
 
 def get_object_name(obj: ast.AST) -> str:
-    """Return the name of a given object."""
-    name_dispatch: dict[NameDispatchKey, str] = {
-        ast.Name: "id",
-        ast.Attribute: "attr",
-        ast.Call: "func",
-        ast.FunctionDef: "name",
-        ast.ClassDef: "name",
-        ast.Subscript: "value",
-        ast.arg: "arg",
-    }
+    """Return the name of a given object.
 
-    while not isinstance(obj, str):
-        obj = getattr(obj, name_dispatch[type(obj)])
+    Nodes without a name, e.g. immediately called lambdas or ``(a or b)()``, are named after their node type, such
+    as ``<lambda>`` or ``<BoolOp>``, which cannot collide with an identifier.
+    """
+    node_type = type(obj)
+    # fast paths of the by far most common nodes
+    if node_type is ast.Name:
+        return obj.id  # type: ignore[attr-defined]
 
-    return obj
+    if node_type is ast.Attribute:
+        return obj.attr  # type: ignore[attr-defined]
+
+    return _resolve_object_name(obj, node_type)
+
+
+def _resolve_object_name(obj: ast.AST, node_type: NameDispatchKey) -> str:
+    """Follow the name fields of nested nodes until a name is found."""
+    while True:
+        field = _NAME_FIELDS.get(node_type)
+        if field is None:
+            return _CONSTANT_NAMES.get(node_type) or f"<{node_type.__name__}>"
+
+        value = getattr(obj, field)
+        if isinstance(value, str):
+            return value
+
+        obj = value
+        node_type = type(obj)
 
 
 def get_module_classes(node: ast.AST) -> list[ast.ClassDef]:
@@ -132,6 +207,587 @@ def get_module_classes(node: ast.AST) -> list[ast.ClassDef]:
     return [child for child in ast.walk(node) if isinstance(child, ast.ClassDef)]
 
 
-def get_ast_node_from_string(string: str) -> ast.AST:
-    """Return an AST node from a string."""
+class ParsedMethod:
+    """Names and flags of a class method gathered by a :class:`ClassCollector`."""
+
+    __slots__ = ("node", "name", "decorators", "bounded", "passing", "attributes", "calls", "method_calls")
+
+    def __init__(self, node: ast.FunctionDef | ast.AsyncFunctionDef, decorators: frozenset[str], bounded: bool) -> None:
+        self.node = node
+        self.name = node.name
+        self.decorators = decorators
+        self.bounded = bounded
+        self.passing = True
+        self.attributes: set[str] = set()
+        self.calls: set[str] = set()
+        self.method_calls: set[str] = set()
+
+    def has_decorator(self, decorator: str) -> bool:
+        """Return whether the method has a specific decorator."""
+        return decorator in self.decorators
+
+    @property
+    def instance_variable_names(self) -> set[str]:
+        """Return the names of all instance variables used in the method."""
+        return self.attributes - self.calls
+
+
+class ParsedClass:
+    """Names and methods of a class gathered by a :class:`ClassCollector`."""
+
+    __slots__ = (
+        "node",
+        "name",
+        "qualname",
+        "depth",
+        "parent",
+        "children",
+        "methods",
+        "attributes",
+        "calls",
+        "method_calls",
+        "skipped_methods",
+        "truncated",
+    )
+
+    def __init__(self, node: ast.ClassDef, depth: int, qualname: str, parent: ParsedClass | None = None) -> None:
+        self.node = node
+        self.name = node.name
+        self.qualname = qualname
+        self.depth = depth
+        self.parent = parent
+        self.children: list[ParsedClass] = []
+        if parent is not None:
+            parent.children.append(self)
+
+        self.methods: list[ParsedMethod] = []
+        self.attributes: set[str] = set()
+        self.calls: set[str] = set()
+        self.method_calls: set[str] = set()
+        # set by a BudgetedClassCollector if the class was not collected completely
+        self.skipped_methods = 0
+        self.truncated = False
+
+    @property
+    def class_variable_names(self) -> set[str]:
+        """Return the names of all variables assigned in the class definition."""
+        return {get_object_name(variable) for variable in get_class_variables(self.node)}
+
+    @property
+    def instance_variable_names(self) -> set[str]:
+        """Return the names of all instance variables used in the class."""
+        return self.attributes - self.calls
+
+    def variable_names(self, strict: bool) -> set[str]:
+        """Return the names of all class and instance variables associated with the class."""
+        if strict:
+            return self.class_variable_names | self.instance_variable_names
+
+        return self.instance_variable_names
+
+
+class ClassCollector(ast.NodeVisitor):
+    """Collect classes, methods, decorators, instance variables and calls of a tree in a single traversal.
+
+    The result is equivalent to combining :func:`get_module_classes`, :func:`get_class_methods`,
+    :func:`get_instance_variables` and the ``is_class_method_*`` predicates, but every node is only visited once.
+    Methods may be ``async``, the names used in functions nested in a method are attributed to the method. Calls of
+    bound methods (``self.method()``) are additionally collected as ``method_calls``. Classes are named by their
+    qualified name (``Outer.Inner``, ``function.<locals>.Cls``) relative to ``scope``, the qualified name of the
+    scope the traversal starts in, and linked to their enclosing class.
+    """
+
+    def __init__(self, bound_name_classifier: str = BOUND_METHOD_ARGUMENT_NAME, scope: str = "") -> None:
+        self.classes: list[ParsedClass] = []
+        self._bound_name_classifier = bound_name_classifier
+        self._depth = 0
+        self._scopes: list[ParsedClass | ParsedMethod] = []
+        self._passing_methods: list[ParsedMethod] = []
+        self._names: list[str] = scope.split(".") if scope else []
+        self._enclosing_classes: list[ParsedClass] = []
+
+    def collect(self, node: ast.AST) -> list[ParsedClass]:
+        """Return the classes of a tree in the order of :func:`get_module_classes`."""
+        self.visit(node)
+        # ast.walk traverses breadth first, i.e. the pre-order sorted by depth
+        return sorted(self.classes, key=operator.attrgetter("depth"))
+
+    def visit(self, node: ast.AST) -> None:
+        if self._passing_methods and not isinstance(node, _ONLY_PASSING_TYPES):
+            for method in self._passing_methods:
+                method.passing = False
+
+            self._passing_methods.clear()
+
+        getattr(self, "visit_" + node.__class__.__name__, self.generic_visit)(node)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        self._depth += 1
+        for field in node._fields:
+            self._visit_field(getattr(node, field, None))
+
+        self._depth -= 1
+
+    def _visit_field(self, value: object) -> None:
+        if isinstance(value, list):
+            for item in value:
+                if isinstance(item, ast.AST):
+                    self.visit(item)
+
+        elif isinstance(value, ast.AST):
+            self.visit(value)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:  # noqa: N802
+        profiler = profiling.active
+        if profiler is None:
+            self._visit_class(node)
+            return
+
+        start = time.perf_counter()
+        self._visit_class(node)
+        profiler.record_class(node.name, time.perf_counter() - start)
+
+    def _visit_class(self, node: ast.ClassDef) -> None:
+        self._names.append(node.name)
+        parent = self._enclosing_classes[-1] if self._enclosing_classes else None
+        parsed_class = ParsedClass(node, self._depth, ".".join(self._names), parent)
+        self.classes.append(parsed_class)
+        self._enclosing_classes.append(parsed_class)
+        self._scopes.append(parsed_class)
+        self._depth += 1
+
+        for field, value in ast.iter_fields(node):
+            if field == "body":
+                self._visit_class_body(value, parsed_class)
+            else:
+                self._visit_field(value)
+
+        self._depth -= 1
+        self._close_scope()
+        self._enclosing_classes.pop()
+        self._names.pop()
+
+    def _visit_class_body(self, body: list[ast.stmt], parsed_class: ParsedClass) -> None:
+        for child in body:
+            if isinstance(child, FUNCTION_TYPES):
+                self._visit_method(child, parsed_class)
+            else:
+                self.visit(child)
+
+    def _visit_method(self, node: ast.FunctionDef | ast.AsyncFunctionDef, parsed_class: ParsedClass) -> None:
+        decorators = frozenset(get_object_name(d) for d in node.decorator_list)
+        method = ParsedMethod(node, decorators, is_class_method_bound(node))
+        parsed_class.methods.append(method)
+        self._scopes.append(method)
+        self._passing_methods.append(method)
+
+        self._visit_function_body(node)
+
+        if self._passing_methods:
+            self._passing_methods.remove(method)
+
+        self._close_scope()
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:  # noqa: N802
+        self._visit_function_body(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:  # noqa: N802
+        self._visit_function_body(node)
+
+    def _visit_function_body(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
+        self._names.append(node.name)
+        self._names.append("<locals>")
+        self.generic_visit(node)
+        del self._names[-2:]
+
+    def _close_scope(self) -> None:
+        # names are only added to the innermost scope and handed to the enclosing scope once it is closed
+        scope = self._scopes.pop()
+        if self._scopes:
+            parent = self._scopes[-1]
+            parent.attributes |= scope.attributes
+            parent.calls |= scope.calls
+            parent.method_calls |= scope.method_calls
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:  # noqa: N802
+        if self._scopes and get_attribute_name_id(node) == self._bound_name_classifier:
+            self._scopes[-1].attributes.add(node.attr)
+
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:  # noqa: N802
+        if self._scopes:
+            scope = self._scopes[-1]
+            scope.calls.add(get_object_name(node))
+            if isinstance(node.func, ast.Attribute) and get_attribute_name_id(node.func) == self._bound_name_classifier:
+                scope.method_calls.add(node.func.attr)
+
+        self.generic_visit(node)
+
+
+class AnalysisBudget:
+    """Maximum number of nodes collected per class and seconds spent per file.
+
+    :meth:`start` returns the budget of a single file, which records whether its time ran out.
+    """
+
+    __slots__ = ("max_nodes", "max_seconds", "deadline", "expired")
+
+    def __init__(self, max_nodes: int | None = None, max_seconds: float | None = None) -> None:
+        self.max_nodes = max_nodes
+        self.max_seconds = max_seconds
+        self.deadline: float | None = None
+        self.expired = False
+
+    def start(self) -> AnalysisBudget:
+        budget = AnalysisBudget(self.max_nodes, self.max_seconds)
+        if self.max_seconds is not None:
+            budget.deadline = time.perf_counter() + self.max_seconds
+
+        return budget
+
+
+class BudgetedClassCollector(ClassCollector):
+    """Class collector that stops within an :class:`AnalysisBudget`.
+
+    Once a class has used up its nodes, its remaining methods are skipped, so its cohesion is approximated from the
+    methods collected so far. Once the time of the file has run out, no further nodes are visited and the classes
+    being collected are truncated. The clock is only read every ``CLOCK_INTERVAL`` nodes.
+    """
+
+    CLOCK_INTERVAL = 1024
+
+    def __init__(
+        self,
+        budget: AnalysisBudget,
+        bound_name_classifier: str = BOUND_METHOD_ARGUMENT_NAME,
+        scope: str = "",
+    ) -> None:
+        super().__init__(bound_name_classifier, scope)
+        self._budget = budget
+        self._nodes = 0
+        self._class_starts: list[int] = []
+
+    def visit(self, node: ast.AST) -> None:
+        budget = self._budget
+        if budget.expired:
+            return
+
+        deadline = budget.deadline
+        if deadline is not None and not self._nodes % self.CLOCK_INTERVAL and time.perf_counter() > deadline:
+            budget.expired = True
+            for parsed_class in self._enclosing_classes:
+                parsed_class.truncated = True
+
+            return
+
+        self._nodes += 1
+        super().visit(node)
+
+    def _visit_class(self, node: ast.ClassDef) -> None:
+        self._class_starts.append(self._nodes)
+        super()._visit_class(node)
+        self._class_starts.pop()
+
+    def _visit_method(self, node: ast.FunctionDef | ast.AsyncFunctionDef, parsed_class: ParsedClass) -> None:
+        max_nodes = self._budget.max_nodes
+        if self._budget.expired or (max_nodes is not None and self._nodes - self._class_starts[-1] > max_nodes):
+            parsed_class.skipped_methods += 1
+            parsed_class.truncated = True
+            return
+
+        super()._visit_method(node, parsed_class)
+
+
+@profiling.profiled("parser.collect_classes")
+def collect_classes(
+    node: ast.AST,
+    bound_name_classifier: str = BOUND_METHOD_ARGUMENT_NAME,
+    scope: str = "",
+    budget: AnalysisBudget | None = None,
+) -> list[ParsedClass]:
+    """Return all classes of a tree together with their methods and variables, optionally within a budget."""
+    if budget is None:
+        return ClassCollector(bound_name_classifier, scope).collect(node)
+
+    return BudgetedClassCollector(budget, bound_name_classifier, scope).collect(node)
+
+
+def get_classes_in_lines(node: ast.AST, line_ranges: Sequence[diff.LineRange]) -> list[tuple[str, ast.ClassDef]]:
+    """Return the outermost classes of a tree that overlap any of the line ranges with their enclosing scope.
+
+    Only nodes overlapping a line range are descended into, so the cost depends on the size of the ranges rather
+    than on the size of the tree. The scope is the qualified name of the function the class is defined in, if any.
+    """
+    sorted_line_ranges = diff.SortedLineRanges(line_ranges)
+    result = []
+    stack: list[tuple[str, ast.AST]] = [("", node)]
+    while stack:
+        scope, current = stack.pop()
+        scope = _get_scope(scope, current)
+        for child in _overlapping_children(current, sorted_line_ranges):
+            if isinstance(child, ast.ClassDef):
+                result.append((scope, child))
+            else:
+                stack.append((scope, child))
+
+    return sorted(result, key=lambda scoped_class: scoped_class[1].lineno)
+
+
+def get_class_scopes(node: ast.AST, class_nodes: Iterable[ast.ClassDef]) -> list[tuple[str, ast.ClassDef]]:
+    """Return the given classes that are not nested in another given class with their enclosing scope.
+
+    Only nodes of the tree enclosing a given class are descended into. The scope is the qualified name of the class
+    or function the class is defined in, if any, classes that are not part of the tree get an empty scope.
+    """
+    targets = {id(class_node): class_node for class_node in class_nodes}
+    line_ranges = diff.SortedLineRanges(map(_get_line_range, targets.values()))
+    result: list[tuple[str, ast.ClassDef]] = []
+    stack: list[tuple[str, ast.AST]] = [("", node)]
+    while stack:
+        scope, current = stack.pop()
+        scope = _get_qualified_scope(scope, current)
+        for child in _overlapping_children(current, line_ranges):
+            target = targets.get(id(child))
+            if target is not None:
+                result.append((scope, target))
+            else:
+                stack.append((scope, child))
+
+    return _sorted_with_unreached(result, targets)
+
+
+def _get_line_range(class_node: ast.ClassDef) -> diff.LineRange:
+    return get_first_lineno(class_node), class_node.end_lineno or class_node.lineno
+
+
+def _get_qualified_scope(scope: str, node: ast.AST) -> str:
+    """Return the qualified name of the scope the children of a node are defined in, classes included."""
+    if isinstance(node, ast.ClassDef):
+        return f"{scope}.{node.name}" if scope else node.name
+
+    return _get_scope(scope, node)
+
+
+def _sorted_with_unreached(
+    result: list[tuple[str, ast.ClassDef]],
+    targets: Mapping[int, ast.ClassDef],
+) -> list[tuple[str, ast.ClassDef]]:
+    # classes that are not part of the tree get an empty scope
+    found = {id(class_node) for _, class_node in result}
+    if len(found) < len(targets):
+        # classes nested in a found class are collected with it
+        found.update(id(child) for _, class_node in result for child in ast.walk(class_node))
+        result.extend(("", class_node) for key, class_node in targets.items() if key not in found)
+
+    # sorted by line only, the nodes of classes with the same scope cannot be compared
+    return sorted(result, key=lambda item: item[1].lineno)
+
+
+def _get_scope(scope: str, node: ast.AST) -> str:
+    """Return the qualified name of the scope the children of a node are defined in."""
+    if not isinstance(node, FUNCTION_TYPES):
+        return scope
+
+    local_scope = f"{node.name}.<locals>"
+    return f"{scope}.{local_scope}" if scope else local_scope
+
+
+def _overlapping_children(node: ast.AST, line_ranges: diff.SortedLineRanges) -> Iterator[ast.AST]:
+    # nodes without a position, e.g. operators, can not be ruled out
+    for child in ast.iter_child_nodes(node):
+        end_lineno = getattr(child, "end_lineno", None)
+        if end_lineno is None or line_ranges.overlaps(get_first_lineno(child), end_lineno):
+            yield child
+
+
+def get_dotted_name(node: ast.expr) -> str | None:
+    """Return the dotted name of a name or attribute chain, subscripts such as ``Generic[T]`` are unwrapped."""
+    if isinstance(node, ast.Subscript):
+        node = node.value
+
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+
+    if not isinstance(node, ast.Name):
+        return None
+
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def get_module_imports(node: ast.AST, module_name: str = "") -> dict[str, str]:
+    """Return the fully qualified names of the names imported at the top level of a module.
+
+    ``module_name`` is the dotted name of the module, ending in ``__init__`` for packages, relative imports are
+    resolved against its package.
+    """
+    package = module_name.split(".")[:-1]
+    result: dict[str, str] = {}
+    for statement in getattr(node, "body", ()):
+        if isinstance(statement, ast.Import):
+            result.update(_imported_modules(statement))
+        elif isinstance(statement, ast.ImportFrom):
+            result.update(_imported_names(statement, package))
+
+    return result
+
+
+def _imported_modules(statement: ast.Import) -> Iterator[tuple[str, str]]:
+    """Yield the bound names and fully qualified names of the modules of an import statement."""
+    for alias in statement.names:
+        if alias.asname:
+            yield alias.asname, alias.name
+        else:
+            top_level = alias.name.partition(".")[0]
+            yield top_level, top_level
+
+
+def _imported_names(statement: ast.ImportFrom, package: list[str]) -> Iterator[tuple[str, str]]:
+    """Yield the bound names and fully qualified names of a from import, relative to a package if it is relative."""
+    parts = package[: len(package) - statement.level + 1] if statement.level else []
+    if statement.module:
+        parts = [*parts, statement.module]
+
+    for alias in statement.names:
+        if alias.name != "*":
+            yield alias.asname or alias.name, ".".join([*parts, alias.name])
+
+
+def get_class_bases(cls: ast.ClassDef, imports: Mapping[str, str], module_name: str = "") -> tuple[str, ...]:
+    """Return the fully qualified names of the bases of a class.
+
+    Bases are resolved against the imports of the module, builtins are kept as they are and other names are assumed
+    to be defined in the module itself. Bases that are no dotted names, e.g. calls, are skipped.
+    """
+    return resolve_bases(get_class_base_names(cls), imports, module_name)
+
+
+def get_class_base_names(cls: ast.ClassDef) -> tuple[str, ...]:
+    """Return the dotted names of the bases of a class as written, bases that are no dotted names are skipped."""
+    return tuple(dotted_name for dotted_name in map(get_dotted_name, cls.bases) if dotted_name is not None)
+
+
+def resolve_bases(base_names: Iterable[str], imports: Mapping[str, str], module_name: str = "") -> tuple[str, ...]:
+    """Return the fully qualified names of dotted base names, see :func:`get_class_bases`."""
+    prefix = get_module_prefix(module_name)
+    return tuple(_resolve_base(dotted_name, imports, prefix) for dotted_name in base_names)
+
+
+def _resolve_base(dotted_name: str, imports: Mapping[str, str], prefix: str) -> str:
+    first, _, rest = dotted_name.partition(".")
+    if first in imports:
+        return f"{imports[first]}.{rest}" if rest else imports[first]
+
+    if hasattr(builtins, first) or not prefix:
+        return dotted_name
+
+    return f"{prefix}.{dotted_name}"
+
+
+def get_module_prefix(module_name: str) -> str:
+    """Return the dotted name the classes of a module are qualified with, the module name without ``__init__``."""
+    parts = module_name.split(".") if module_name else []
+    if parts and parts[-1] == "__init__":
+        parts.pop()
+
+    return ".".join(parts)
+
+
+def get_class_fingerprint(cls: ast.ClassDef, lines: SourceLines) -> bytes | None:
+    """Return a hash of the source of a class without its name, structurally identical classes share it.
+
+    Hashing the source is two orders of magnitude faster than dumping the tree. ``None`` is returned if the name of
+    the class is not on the line of its ``class`` keyword.
+    """
+    header_index = cls.lineno - 1
+    header = lines[header_index]
+    keyword = _CLASS_KEYWORD.match(header, cls.col_offset)
+    name = cls.name.encode("utf-8")
+    if keyword is None or not header.startswith(name, keyword.end()):
+        return None
+
+    start = keyword.end()
+    end = start + len(name)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(lines.span(get_first_lineno(cls) - 1, header_index))
+    digest.update(header[:start])
+    digest.update(header[end:])
+    digest.update(lines.span(cls.lineno, cls.end_lineno or cls.lineno))
+    return digest.digest()
+
+
+class SourceLines:
+    """Lines of an encoded source as split by ``bytes.splitlines(keepends=True)``, a line is only copied if accessed.
+
+    Only the offsets of the lines are kept, so the lines of a memory-mapped file are read from the mapping.
+    """
+
+    __slots__ = ("source", "offsets")
+
+    def __init__(self, source: bytes | mmap.mmap) -> None:
+        self.source = source
+        self.offsets = [0, *(match.end() for match in _LINE_END.finditer(source))]
+        if self.offsets[-1] < len(source):
+            self.offsets.append(len(source))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> bytes:
+        line_index = index + len(self) if index < 0 else index
+        if not 0 <= line_index < len(self):
+            raise IndexError(index)
+
+        start, end = self.offsets[line_index], self.offsets[line_index + 1]
+        return self.source[start:end]
+
+    def span(self, start: int, stop: int) -> bytes:
+        """Return the source of the lines from ``start`` up to ``stop`` with a single copy."""
+        first, last = self.offsets[start], self.offsets[max(start, stop)]
+        return self.source[first:last]
+
+
+def overlaps_lines(node: ast.AST, line_ranges: Sequence[diff.LineRange]) -> bool:
+    """Return whether a node including its decorators overlaps any of the line ranges."""
+    first_lineno = get_first_lineno(node)
+    return diff.overlaps(first_lineno, getattr(node, "end_lineno", None) or first_lineno, line_ranges)
+
+
+def get_first_lineno(node: ast.AST) -> int:
+    """Return the first line of a node including its decorators."""
+    decorators = getattr(node, "decorator_list", None)
+    lineno: int = getattr(node, "lineno", 0)
+    return min(lineno, *(decorator.lineno for decorator in decorators)) if decorators else lineno
+
+
+def get_ast_node_from_file(path: str | os.PathLike[str]) -> ast.AST:
+    """Return an AST node from a python file, decoded according to its encoding declaration.
+
+    Regular files are memory-mapped and parsed without decoding them to a str first, so the only copy of the
+    source on the heap is the one made by the compiler.
+    """
+    with open_source(path) as source:
+        return get_ast_node_from_string(source)  # type: ignore[arg-type]
+
+
+@contextlib.contextmanager
+def open_source(path: str | os.PathLike[str]) -> Iterator[bytes | mmap.mmap]:
+    """Return a context manager of the encoded source of a python file, regular files are memory-mapped."""
+    with pathlib.Path(path).open("rb") as file:
+        try:
+            source = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # empty files and files that cannot be mapped, e.g. pipes
+            yield file.read()
+            return
+
+        with source:
+            yield source
+
+
+def get_ast_node_from_string(string: str | bytes) -> ast.AST:
+    """Return an AST node from a string, bytes are decoded according to their encoding declaration."""
     return ast.parse(string)
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import functools
+import heapq
+import inspect
+import json
+import multiprocessing.util
+import os
+import pathlib
+import sys
+import time
+from typing import TYPE_CHECKING
+from typing import TypeVar
+
+from flake8_cohesion import storage
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Generator
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from typing import Any
+    from typing import TextIO
+
+    # cumulative seconds and number of calls
+    FunctionStats = list[float]
+    # seconds and name of a file or class
+    Timing = tuple[float, str]
+
+
+ENVIRONMENT_VARIABLE = "FLAKE8_COHESION_PROFILE"
+# pid of the process that owns a profile directory, inherited by worker processes
+_OWNER_ENVIRONMENT_VARIABLE = "FLAKE8_COHESION_PROFILE_OWNER"
+DEFAULT_TOP = 10
+
+_FILE_PREFIX = "profile-"
+
+FunctionType = TypeVar("FunctionType", bound="Callable[..., Any]")
+
+
+class Profiler:
+    """Cumulative timings of the instrumented functions, files and classes and event counters of a single process.
+
+    The timings are dumped to ``<directory>/profile-<pid>.json`` once the process exits and are merged by
+    :func:`summary`.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], top: int = DEFAULT_TOP) -> None:
+        self.directory = pathlib.Path(directory)
+        self.top = top
+        self.functions: dict[str, FunctionStats] = {}
+        self.files: list[Timing] = []
+        self.classes: list[Timing] = []
+        self.counters: dict[str, int] = {}
+        self.current_file = ""
+
+    def record(self, name: str, elapsed: float) -> None:
+        stats = self.functions.setdefault(name, [0.0, 0])
+        stats[0] += elapsed
+        stats[1] += 1
+
+    def count(self, name: str, increment: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + increment
+
+    def record_class(self, name: str, elapsed: float) -> None:
+        _push(self.classes, (elapsed, f"{self.current_file}::{name}"), self.top)
+
+    @contextlib.contextmanager
+    def file(self, path: str) -> Iterator[None]:
+        """Time a file."""
+        self.current_file = path
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            _push(self.files, (time.perf_counter() - start, path), self.top)
+
+    def dump(self) -> None:
+        document = {
+            "functions": self.functions,
+            "files": self.files,
+            "classes": self.classes,
+            "counters": self.counters,
+        }
+        storage.atomic_write_json(self.directory / f"{_FILE_PREFIX}{os.getpid()}.json", document)
+
+
+def _push(timings: list[Timing], timing: Timing, top: int) -> None:
+    if len(timings) < top:
+        heapq.heappush(timings, timing)
+    else:
+        heapq.heappushpop(timings, timing)
+
+
+active: Profiler | None = None
+
+
+def enable(directory: str | os.PathLike[str], top: int = DEFAULT_TOP) -> Profiler:
+    """Enable profiling in this process.
+
+    The first process enabling a directory clears previous profiles and prints the merged summary of all processes
+    to stderr at exit. Worker processes inherit the ownership and only contribute their profiles.
+    """
+    global active
+
+    path = pathlib.Path(directory)
+    path.mkdir(parents=True, exist_ok=True)
+    profiler = Profiler(path, top)
+    if _OWNER_ENVIRONMENT_VARIABLE in os.environ:
+        _dump_at_exit(profiler)
+    else:
+        os.environ[_OWNER_ENVIRONMENT_VARIABLE] = str(os.getpid())
+        for stale in path.glob(f"{_FILE_PREFIX}*.json"):
+            with contextlib.suppress(OSError):
+                stale.unlink()
+
+        atexit.register(print_summary, path, top)
+
+    # forked worker processes inherit the profiler and dump it when they exit
+    multiprocessing.util.register_after_fork(profiler, _dump_at_exit)
+    active = profiler
+    return profiler
+
+
+def _dump_at_exit(profiler: Profiler) -> None:
+    # worker processes exit through os._exit, which skips the atexit handlers but runs the multiprocessing finalizers
+    multiprocessing.util.Finalize(None, profiler.dump, exitpriority=0)
+
+
+def disable() -> None:
+    global active
+    active = None
+
+
+def profiled(name: str) -> Callable[[FunctionType], FunctionType]:
+    """Record the cumulative time and number of calls of a function while profiling is enabled."""
+
+    def decorator(function: FunctionType) -> FunctionType:
+        if inspect.isgeneratorfunction(function):
+            return _profiled_generator(name, function)
+
+        @functools.wraps(function)
+        def wrapper(*args: object, **kwargs: object) -> object:
+            profiler = active
+            if profiler is None:
+                return function(*args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profiler.record(name, time.perf_counter() - start)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def _profiled_generator(name: str, function: FunctionType) -> FunctionType:
+    # the time spent in a generator is the time spent producing its items
+    @functools.wraps(function)
+    def wrapper(*args: object, **kwargs: object) -> Generator[object, None, object]:
+        profiler = active
+        if profiler is None:
+            return (yield from function(*args, **kwargs))
+
+        iterator = function(*args, **kwargs)
+        elapsed = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration as e:
+                    return e.value
+                finally:
+                    elapsed += time.perf_counter() - start
+
+                yield item
+        finally:
+            profiler.record(name, elapsed)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def print_summary(directory: str | os.PathLike[str], top: int = DEFAULT_TOP, stream: TextIO | None = None) -> None:
+    if active is not None:
+        active.dump()
+
+    (stream or sys.stderr).write(format_summary(summary(directory, top)) + "\n")
+
+
+def format_summary(merged: dict[str, Any]) -> str:
+    lines = ["flake8-cohesion profile", f"{'function':<40} {'calls':>10} {'total s':>10} {'per call ms':>12}"]
+    for name, (elapsed, calls) in sorted(merged["functions"].items(), key=lambda item: -item[1][0]):
+        lines.append(f"{name:<40} {calls:>10} {elapsed:>10.3f} {elapsed / calls * 1000 if calls else 0:>12.3f}")
+
+    lines.append("slowest files:")
+    lines.extend(f"  {elapsed * 1000:>10.2f} ms  {path}" for elapsed, path in merged["files"])
+    lines.append("slowest classes:")
+    lines.extend(f"  {elapsed * 1000:>10.2f} ms  {name}" for elapsed, name in merged["classes"])
+    if merged.get("counters"):
+        lines.append("counters:")
+        lines.extend(f"  {count:>10}  {name}" for name, count in sorted(merged["counters"].items()))
+
+    return "\n".join(lines)
+
+
+def summary(directory: str | os.PathLike[str], top: int = DEFAULT_TOP) -> dict[str, Any]:
+    """Return the merged profiles of all processes that dumped into a directory."""
+    documents = []
+    for path in sorted(pathlib.Path(directory).glob(f"{_FILE_PREFIX}*.json")):
+        with contextlib.suppress(OSError, ValueError), path.open(encoding="utf-8") as file:
+            documents.append(json.load(file))
+
+    return merge(documents, top)
+
+
+def merge(documents: Iterable[dict[str, Any]], top: int = DEFAULT_TOP) -> dict[str, Any]:
+    """Merge the profiles of several processes."""
+    functions: dict[str, FunctionStats] = {}
+    files: list[Timing] = []
+    classes: list[Timing] = []
+    counters: dict[str, int] = {}
+    for document in documents:
+        for name, (elapsed, calls) in document["functions"].items():
+            stats = functions.setdefault(name, [0.0, 0])
+            stats[0] += elapsed
+            stats[1] += calls
+
+        files.extend((float(elapsed), str(path)) for elapsed, path in document["files"])
+        classes.extend((float(elapsed), str(class_name)) for elapsed, class_name in document["classes"])
+        for name, count in document.get("counters", {}).items():
+            counters[name] = counters.get(name, 0) + count
+
+    return {
+        "functions": functions,
+        "files": heapq.nlargest(top, files),
+        "classes": heapq.nlargest(top, classes),
+        "counters": counters,
+    }
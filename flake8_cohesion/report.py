@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import csv
+import json
+from typing import TYPE_CHECKING
+
+from flake8_cohesion import extension
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from typing import TextIO
+
+    from flake8_cohesion.module import ClassResult
+
+
+FIELDS = ("name", "path", "line", "cohesion", "variable_count", "relevant_method_count")
+
+
+class Reporter:
+    """Write the class results of every file to a stream as soon as the file is finished.
+
+    The classes below the threshold are reported in the flake8 format, subclasses report them in other formats.
+    """
+
+    def __init__(self, stream: TextIO, cohesion_below: float) -> None:
+        self._stream = stream
+        self._cohesion_below = cohesion_below
+
+    def write(self, path: str, classes: Sequence[ClassResult]) -> None:
+        for class_result in classes:
+            self.write_class(path, class_result)
+
+        self._stream.flush()
+
+    def write_class(self, path: str, class_result: ClassResult) -> None:
+        _, lineno, col_offset, cohesion, _, _ = class_result
+        if cohesion <= self._cohesion_below:
+            message = extension.CohesionChecker._error_tmpl.format(cohesion)
+            self._stream.write(f"{path}:{lineno}:{col_offset + 1}: {message}\n")
+
+    @staticmethod
+    def _record(path: str, class_result: ClassResult) -> dict[str, str | int | float]:
+        name, lineno, _, cohesion, variable_count, relevant_method_count = class_result
+        return {
+            "name": name,
+            "path": f"{path}::{name}",
+            "line": lineno,
+            "cohesion": cohesion,
+            "variable_count": variable_count,
+            "relevant_method_count": relevant_method_count,
+        }
+
+
+class JsonLinesReporter(Reporter):
+    """Report every class as a JSON object per line."""
+
+    def write_class(self, path: str, class_result: ClassResult) -> None:
+        self._stream.write(json.dumps(self._record(path, class_result)) + "\n")
+
+
+class CsvReporter(Reporter):
+    """Report every class as a CSV row below a header row."""
+
+    def __init__(self, stream: TextIO, cohesion_below: float) -> None:
+        super().__init__(stream, cohesion_below)
+        self._writer = csv.DictWriter(stream, FIELDS, lineterminator="\n")
+        self._writer.writeheader()
+
+    def write_class(self, path: str, class_result: ClassResult) -> None:
+        self._writer.writerow(self._record(path, class_result))
+
+
+REPORTERS: dict[str, type[Reporter]] = {
+    "default": Reporter,
+    "jsonl": JsonLinesReporter,
+    "csv": CsvReporter,
+}
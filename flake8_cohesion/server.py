@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""Long-lived JSON-RPC 2.0 server scoring the documents of editor integrations, one JSON object per line."""
+
+from __future__ import annotations
+
+import collections
+import hashlib
+import json
+import pathlib
+import socketserver
+import sys
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import TypeVar
+
+import flake8_cohesion
+from flake8_cohesion import module
+from flake8_cohesion import parser
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterable
+
+    from flake8_cohesion.hierarchy import ClassIndex
+    from flake8_cohesion.module import ClassResult
+
+
+T = TypeVar("T")
+
+DEFAULT_MAX_DOCUMENTS = 256
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class RequestError(Exception):
+    """Error of a request that is answered with a JSON-RPC error object."""
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(code, message)
+        self.code = code
+        self.message = message
+
+
+class Document:
+    """Content hash and module of an open document, or the error its source could not be parsed with."""
+
+    __slots__ = ("digest", "module", "error")
+
+    def __init__(self, digest: str, file_module: module.Module | None, error: str | None = None) -> None:
+        self.digest = digest
+        self.module = file_module
+        self.error = error
+
+
+def class_record(class_result: ClassResult, cohesion_below: float) -> dict[str, Any]:
+    name, lineno, col_offset, cohesion, variable_count, relevant_method_count = class_result
+    return {
+        "name": name,
+        "line": lineno,
+        "column": col_offset + 1,
+        "cohesion": cohesion,
+        "variable_count": variable_count,
+        "relevant_method_count": relevant_method_count,
+        "violation": cohesion <= cohesion_below,
+    }
+
+
+class CohesionServer:
+    """Answer cohesion requests and keep the modules of the most recently used documents in memory.
+
+    Its methods are ``open`` and ``score`` of a document, ``class`` of a single class, ``close`` and ``shutdown``.
+    """
+
+    def __init__(
+        self,
+        cohesion_below: float = 50.0,
+        strict: bool = False,
+        ignore_decorators: Iterable[str] = (),
+        class_index: ClassIndex | None = None,
+        max_documents: int = DEFAULT_MAX_DOCUMENTS,
+    ) -> None:
+        self.cohesion_below = cohesion_below
+        self.strict = strict
+        self.ignore_decorators = tuple(ignore_decorators)
+        self.class_index = class_index
+        self.max_documents = max_documents
+        self.documents: collections.OrderedDict[str, Document] = collections.OrderedDict()
+        self.running = True
+        self._commands: dict[str, Callable[[], Any]] = {
+            "initialize": self.initialize,
+            "shutdown": self.shutdown,
+        }
+        self._methods: dict[str, Callable[[dict[str, Any]], Any]] = {
+            "open": self.score,
+            "score": self.score,
+            "class": self.score_class,
+            "close": self.close,
+        }
+
+    def document(self, path: str, source: str | bytes | None = None) -> Document:
+        """Return the document of a path, it is parsed again only if its source changed."""
+        if source is None:
+            source = pathlib.Path(path).read_bytes()
+
+        if isinstance(source, str):
+            source = source.encode("utf-8", "surrogatepass")
+
+        digest = hashlib.sha256(source).hexdigest()
+        document = self.documents.get(path)
+        if document is None or document.digest != digest:
+            document = self._parse(path, source, digest)
+            self.documents[path] = document
+            while len(self.documents) > self.max_documents:
+                self.documents.popitem(last=False)
+
+        self.documents.move_to_end(path)
+        return document
+
+    def _document(self, params: dict[str, Any]) -> Document:
+        source = params.get("source")
+        if source is not None and not isinstance(source, str):
+            raise RequestError(INVALID_PARAMS, "param 'source' must be of type str")
+
+        return self.document(_param(params, "path", str), source)
+
+    def _parse(self, path: str, source: bytes, digest: str) -> Document:
+        module_name = self.class_index.module_name(path) if self.class_index is not None else ""
+        try:
+            tree = parser.get_ast_node_from_string(source)
+        except (SyntaxError, ValueError) as e:
+            return Document(digest, None, f"{type(e).__name__}: {e}")
+
+        file_module = module.Module.from_tree(
+            tree,
+            self.strict,
+            ignore_decorators=self.ignore_decorators,
+            module_name=module_name,
+            class_index=self.class_index,
+            source=source,
+        )
+        return Document(digest, file_module)
+
+    def initialize(self) -> dict[str, Any]:
+        return {"name": "flake8-cohesion", "version": flake8_cohesion.__version__}
+
+    def score(self, params: dict[str, Any]) -> dict[str, Any]:
+        document = self._document(params)
+        if document.module is None:
+            return {"classes": [], "error": document.error}
+
+        classes = [class_record(class_result, self.cohesion_below) for class_result in document.module.class_results()]
+        return {"classes": classes, "error": None}
+
+    def score_class(self, params: dict[str, Any]) -> dict[str, Any]:
+        document = self._document(params)
+        name = _param(params, "name", str)
+        if document.module is None or name not in document.module.structure:
+            raise RequestError(INVALID_PARAMS, document.error or f"unknown class {name!r}")
+
+        class_metrics = document.module.class_metrics(name)
+        record = class_record(document.module.class_result(name), self.cohesion_below)
+        record.update((field, getattr(class_metrics, field)) for field in class_metrics._fields)
+        return record
+
+    def close(self, params: dict[str, Any]) -> bool:
+        return self.documents.pop(_param(params, "path", str), None) is not None
+
+    def shutdown(self) -> None:
+        self.running = False
+
+    def handle(self, message: str | bytes) -> dict[str, Any] | None:
+        """Return the response to a request, notifications without an ``id`` are not answered."""
+        try:
+            request = _request(message)
+        except RequestError as e:
+            return _error(None, e.code, e.message)
+
+        response = self._respond(request.get("id"), request["method"], request.get("params", {}))
+        return response if "id" in request else None
+
+    def _respond(self, request_id: object, method_name: str, params: object) -> dict[str, Any]:
+        try:
+            result = self._call(method_name, params)
+        except RequestError as e:
+            return _error(request_id, e.code, e.message)
+        except OSError as e:
+            return _error(request_id, INVALID_PARAMS, f"{type(e).__name__}: {e}")
+        except Exception as e:  # noqa: PIE786
+            # a single request must not stop the server, whatever error the analysis of a document raises
+            return _error(request_id, INTERNAL_ERROR, f"{type(e).__name__}: {e}")
+
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    def _call(self, method_name: str, params: object) -> object:
+        if method_name not in self._commands and method_name not in self._methods:
+            raise RequestError(METHOD_NOT_FOUND, f"unknown method {method_name!r}")
+
+        if not isinstance(params, dict):
+            raise RequestError(INVALID_PARAMS, "params must be an object")
+
+        if method_name in self._commands:
+            return self._commands[method_name]()
+
+        return self._methods[method_name](params)
+
+
+def _request(message: str | bytes) -> dict[str, Any]:
+    try:
+        request = json.loads(message)
+    except ValueError as e:
+        raise RequestError(PARSE_ERROR, str(e)) from e
+
+    if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+        raise RequestError(INVALID_REQUEST, "request must be an object with a method")
+
+    return request
+
+
+def _param(params: dict[str, Any], name: str, kind: type[T]) -> T:
+    value = params.get(name)
+    if not isinstance(value, kind):
+        raise RequestError(INVALID_PARAMS, f"param {name!r} must be of type {kind.__name__}")
+
+    return value
+
+
+def _error(request_id: object, code: int, message: str) -> dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def serve_stdio(server: CohesionServer) -> None:
+    """Answer the requests on stdin until it is closed or the server is shut down."""
+
+    def write(text: str) -> None:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    serve(server, sys.stdin, write)
+
+
+class _StreamHandler(socketserver.StreamRequestHandler):
+    server: _UnixServer
+
+    def handle(self) -> None:
+        def write(text: str) -> None:
+            self.wfile.write(text.encode("utf-8"))
+            self.wfile.flush()
+
+        serve(self.server.cohesion_server, self.rfile, write)
+
+
+class _UnixServer(socketserver.UnixStreamServer):
+    def __init__(self, path: str, cohesion_server: CohesionServer) -> None:
+        self.cohesion_server = cohesion_server
+        super().__init__(path, _StreamHandler)
+
+
+def serve_socket(server: CohesionServer, path: str) -> None:
+    """Answer the requests of one connection after another on a Unix socket until the server is shut down."""
+    with _UnixServer(path, server) as unix_server:
+        try:
+            while server.running:
+                unix_server.handle_request()
+        finally:
+            pathlib.Path(path).unlink()
+
+
+def serve(server: CohesionServer, lines: Iterable[str | bytes], write: Callable[[str], object]) -> None:
+    """Answer the requests of a stream of lines until it ends or the server is shut down."""
+    for line in lines:
+        if not line.strip():
+            continue
+
+        response = server.handle(line)
+        if response is not None:
+            write(json.dumps(response) + "\n")
+
+        if not server.running:
+            return
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""Split a scan across machines by a stable hash of the file paths and merge their partial results."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib
+from typing import TYPE_CHECKING
+from typing import Any
+
+import flake8_cohesion
+from flake8_cohesion import stats
+from flake8_cohesion import storage
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from collections.abc import Sequence
+
+    from flake8_cohesion.batch import FileResult
+    from flake8_cohesion.module import ClassResult
+
+    # the classes of a file
+    FileClasses = tuple[str, list[ClassResult]]
+
+
+# bumped whenever the meaning of partial results changes between releases of the same version
+PARTIAL_FORMAT = 1
+
+
+class IncompatibleShardsError(ValueError):
+    """Partial results of different shard counts or options are merged."""
+
+    def __init__(self) -> None:
+        super().__init__("partial results were scanned with different shard counts or options")
+
+
+class NoPartialResultsError(ValueError):
+    """No partial results are given to merge."""
+
+    def __init__(self) -> None:
+        super().__init__("no partial results to merge")
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Return the one-based index and the count of a shard given as ``i/N``."""
+    index, separator, count = value.partition("/")
+    if not separator or not index.strip().isdigit() or not count.strip().isdigit():
+        raise ValueError(f"shard must be given as i/N, not {value!r}")
+
+    if not 1 <= int(index) <= int(count):
+        raise ValueError(f"shard index must be between 1 and {int(count)}, not {int(index)}")
+
+    return int(index), int(count)
+
+
+def select(paths: Iterable[str], index: int, count: int) -> Iterator[str]:
+    """Yield the paths of a shard."""
+    return (path for path in paths if shard_of(path, count) == index)
+
+
+def shard_of(path: str | os.PathLike[str], count: int) -> int:
+    """Return the one-based shard of a file, it only depends on the path relative to the working directory."""
+    absolute_path = pathlib.Path(path).absolute()
+    try:
+        key = absolute_path.relative_to(pathlib.Path.cwd()).as_posix()
+    except ValueError:
+        # files outside of the working directory are keyed by their absolute path
+        key = absolute_path.as_posix()
+
+    digest = hashlib.blake2b(key.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count + 1
+
+
+class PartialResult:
+    """Per-class results, file and error counts and the cohesion histogram of one or more merged shards.
+
+    Partial results are only merged if they were scanned with the same options and of the same shard count, each
+    shard may only be merged once.
+    """
+
+    __slots__ = ("count", "shards", "strict", "ignore_decorators", "files", "errors", "classes", "histogram")
+
+    def __init__(
+        self,
+        shard: tuple[int, int] = (1, 1),
+        strict: bool = False,
+        ignore_decorators: Iterable[str] = (),
+    ) -> None:
+        index, self.count = shard
+        self.shards = {index}
+        self.strict = strict
+        self.ignore_decorators = tuple(sorted(set(ignore_decorators)))
+        self.files = 0
+        self.errors: list[tuple[str, str]] = []
+        self.classes: list[tuple[str, ClassResult]] = []
+        self.histogram = [0] * stats.HISTOGRAM_BUCKETS
+
+    def add(self, file_result: FileResult) -> None:
+        """Count a scanned file and its classes."""
+        self.files += 1
+        if file_result.error is not None:
+            self.errors.append((file_result.path, file_result.error))
+
+        for class_result in file_result.classes:
+            self.classes.append((file_result.path, class_result))
+            self.histogram[stats.histogram_bucket(class_result[3])] += 1
+
+    def violations(self, cohesion_below: float) -> int:
+        """Return the number of classes with a cohesion of ``cohesion_below`` or lower."""
+        return sum(class_result[3] <= cohesion_below for _, class_result in self.classes)
+
+    @property
+    def missing_shards(self) -> list[int]:
+        return [index for index in range(1, self.count + 1) if index not in self.shards]
+
+    def merge(self, other: PartialResult) -> None:
+        """Add the results of the shards of another partial result."""
+        if (other.count, other.strict, other.ignore_decorators) != (self.count, self.strict, self.ignore_decorators):
+            raise IncompatibleShardsError()
+
+        overlap = self.shards & other.shards
+        if overlap:
+            raise ValueError(f"shard {min(overlap)}/{self.count} is merged twice")
+
+        self.shards |= other.shards
+        self.files += other.files
+        self.errors.extend(other.errors)
+        self.classes.extend(other.classes)
+        self.histogram = [count + other_count for count, other_count in zip(self.histogram, other.histogram)]
+
+    def file_results(self) -> list[FileClasses]:
+        """Return the classes grouped by their file in the order of the paths."""
+        files: dict[str, list[ClassResult]] = {}
+        for path, class_result in sorted(self.classes, key=lambda item: (item[0], item[1][1], item[1][2])):
+            files.setdefault(path, []).append(class_result)
+
+        return list(files.items())
+
+    def save_to(self, path: str | os.PathLike[str]) -> None:
+        """Write the partial result to a file atomically."""
+        document = {
+            "version": flake8_cohesion.__version__,
+            "format": PARTIAL_FORMAT,
+            "count": self.count,
+            "shards": sorted(self.shards),
+            "strict": self.strict,
+            "ignore_decorators": list(self.ignore_decorators),
+            "files": self.files,
+            "errors": self.errors,
+            "classes": [[path, *class_result] for path, class_result in self.classes],
+            "histogram": self.histogram,
+        }
+        storage.atomic_write_json(path, document)
+
+    @classmethod
+    def load_from(cls, path: str | os.PathLike[str]) -> PartialResult:
+        """Return a partial result written by :meth:`save_to`.
+
+        Raises ValueError if the file is invalid or was written by another version.
+        """
+        with pathlib.Path(path).open(encoding="utf-8") as file:
+            document = json.load(file)
+
+        try:
+            partial_result = cls._from_document(document)
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"invalid partial result: {type(e).__name__}: {e}") from e
+
+        if len(partial_result.histogram) != stats.HISTOGRAM_BUCKETS:
+            raise ValueError(f"invalid partial result: {len(partial_result.histogram)} histogram buckets")
+
+        return partial_result
+
+    @classmethod
+    def _from_document(cls, document: dict[str, Any]) -> PartialResult:
+        if (document["version"], document["format"]) != (flake8_cohesion.__version__, PARTIAL_FORMAT):
+            raise ValueError(f"partial result of version {document['version']} cannot be merged")
+
+        shard = (0, int(document["count"]))
+        partial_result = cls(shard, bool(document["strict"]), document["ignore_decorators"])
+        partial_result.shards = {int(index) for index in document["shards"]}
+        partial_result.files = int(document["files"])
+        partial_result.errors = [(str(error_path), str(error)) for error_path, error in document["errors"]]
+        partial_result.classes = [
+            (
+                str(class_path),
+                (str(name), int(lineno), int(col_offset), float(cohesion), int(variables), int(functions)),
+            )
+            for class_path, name, lineno, col_offset, cohesion, variables, functions in document["classes"]
+        ]
+        partial_result.histogram = [int(count) for count in document["histogram"]]
+        return partial_result
+
+
+def merge(paths: Sequence[str | os.PathLike[str]]) -> PartialResult:
+    """Return the merged partial results of several files."""
+    partial_results = [PartialResult.load_from(path) for path in paths]
+    if not partial_results:
+        raise NoPartialResultsError()
+
+    result, *others = partial_results
+    for partial_result in others:
+        result.merge(partial_result)
+
+    return result
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""Cohesion histograms and percentiles per directory, their memory does not grow with the number of classes."""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import pathlib
+from typing import TYPE_CHECKING
+from typing import Any
+
+import flake8_cohesion
+from flake8_cohesion import storage
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Sequence
+
+    from flake8_cohesion.module import ClassResult
+
+
+# bumped whenever the meaning of persisted summaries changes between releases of the same version
+STATS_FORMAT = 1
+# buckets of ten percentage points, a cohesion of 100% is counted in the last bucket
+HISTOGRAM_BUCKETS = 10
+# cohesion is rounded to two decimals by Module.class_cohesion_percentage
+SKETCH_RESOLUTION = 0.01
+PERCENTILES = (50, 90, 99)
+
+
+class ResolutionMismatchError(ValueError):
+    """Statistics of different sketch resolutions are merged."""
+
+    def __init__(self, resolution: float, other_resolution: float) -> None:
+        super().__init__(f"statistics of resolutions {resolution} and {other_resolution} cannot be merged")
+
+
+def histogram_bucket(cohesion: float) -> int:
+    """Return the histogram bucket of a cohesion percentage."""
+    return min(max(int(cohesion // (100 / HISTOGRAM_BUCKETS)), 0), HISTOGRAM_BUCKETS - 1)
+
+
+class QuantileSketch:
+    """Counts of cohesion values quantized to ``resolution`` percentage points."""
+
+    __slots__ = ("resolution", "counts")
+
+    def __init__(self, resolution: float = SKETCH_RESOLUTION) -> None:
+        self.resolution = resolution
+        self.counts: dict[int, int] = {}
+
+    def add(self, cohesion: float, count: int = 1) -> None:
+        key = round(cohesion / self.resolution)
+        self.counts[key] = self.counts.get(key, 0) + count
+
+    def merge(self, other: QuantileSketch) -> None:
+        if other.resolution != self.resolution:
+            raise ResolutionMismatchError(self.resolution, other.resolution)
+
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+
+    def quantiles(self, percentiles: Sequence[float]) -> list[float | None]:
+        """Return the nearest-rank percentiles of the counted values, None if nothing was counted."""
+        total = sum(self.counts.values())
+        if not total:
+            return [None] * len(percentiles)
+
+        ranks = [max(math.ceil(percentile / 100 * total), 1) for percentile in percentiles]
+        result: list[float | None] = [None] * len(percentiles)
+        cumulative = 0
+        pending = sorted(range(len(ranks)), key=ranks.__getitem__)
+        for key in sorted(self.counts):
+            cumulative += self.counts[key]
+            while pending and ranks[pending[0]] <= cumulative:
+                result[pending.pop(0)] = round(key * self.resolution, 2)
+
+            if not pending:
+                break
+
+        return result
+
+
+class CohesionStats:
+    """Count, sum, extremes, histogram and quantile sketch of the cohesion of a set of classes."""
+
+    __slots__ = ("count", "total", "minimum", "maximum", "histogram", "sketch")
+
+    def __init__(self, resolution: float = SKETCH_RESOLUTION) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.minimum: float | None = None
+        self.maximum: float | None = None
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+        self.sketch = QuantileSketch(resolution)
+
+    def add(self, cohesion: float) -> None:
+        self.count += 1
+        self.total += cohesion
+        self.minimum = cohesion if self.minimum is None else min(self.minimum, cohesion)
+        self.maximum = cohesion if self.maximum is None else max(self.maximum, cohesion)
+        self.histogram[histogram_bucket(cohesion)] += 1
+        self.sketch.add(cohesion)
+
+    def merge(self, other: CohesionStats) -> None:
+        if not other.count:
+            return
+
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(value for value in (self.minimum, other.minimum) if value is not None)
+        self.maximum = max(value for value in (self.maximum, other.maximum) if value is not None)
+        self.histogram = [count + other_count for count, other_count in zip(self.histogram, other.histogram)]
+        self.sketch.merge(other.sketch)
+
+    @property
+    def mean(self) -> float | None:
+        return round(self.total / self.count, 2) if self.count else None
+
+    def percentiles(self, percentiles: Sequence[float] = PERCENTILES) -> dict[str, float | None]:
+        values = self.sketch.quantiles(percentiles)
+        return {f"p{percentile:g}": value for percentile, value in zip(percentiles, values)}
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON compatible summary, the percentiles are only informative and not read back."""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "mean": self.mean,
+            **self.percentiles(),
+            "histogram": self.histogram,
+            "sketch": [[key, count] for key, count in sorted(self.sketch.counts.items())],
+        }
+
+    @classmethod
+    def from_dict(cls, document: dict[str, Any], resolution: float = SKETCH_RESOLUTION) -> CohesionStats:
+        stats = cls(resolution)
+        stats.count = int(document["count"])
+        stats.total = float(document["total"])
+        stats.minimum = None if document["minimum"] is None else float(document["minimum"])
+        stats.maximum = None if document["maximum"] is None else float(document["maximum"])
+        stats.histogram = [int(count) for count in document["histogram"]]
+        stats.sketch.counts = {int(key): int(count) for key, count in document["sketch"]}
+        if len(stats.histogram) != HISTOGRAM_BUCKETS:
+            raise ValueError(f"{len(stats.histogram)} histogram buckets instead of {HISTOGRAM_BUCKETS}")
+
+        return stats
+
+
+def _directory(path: str) -> str:
+    # the directory of a file, files of the working directory are in the empty directory
+    parent = pathlib.PurePath(os.path.normpath(path)).parent
+    return "" if parent == pathlib.PurePath() else str(parent)
+
+
+def _roll_up(directory: str, depth: int) -> str:
+    # the first depth components of a directory, the root of absolute directories is kept
+    parts = directory.split(os.sep) if directory else []
+    root = parts[:1] if parts and not parts[0] else []
+    components = parts[1:] if root else parts
+    return os.sep.join(root + components[:depth]) or (os.sep if root else "")
+
+
+class Aggregator:
+    """Cohesion statistics of the classes of every directory of a scan.
+
+    The statistics of a directory only cover the files directly inside of it, :meth:`summary` rolls them up to
+    the directories of a given depth or to the whole repository.
+    """
+
+    __slots__ = ("resolution", "directories")
+
+    def __init__(self, resolution: float = SKETCH_RESOLUTION) -> None:
+        self.resolution = resolution
+        self.directories: dict[str, CohesionStats] = {}
+
+    def add(self, path: str, cohesion: float) -> None:
+        """Count the cohesion of a class of a file."""
+        directory = _directory(path)
+        stats = self.directories.get(directory)
+        if stats is None:
+            stats = self.directories[directory] = CohesionStats(self.resolution)
+
+        stats.add(cohesion)
+
+    def add_classes(self, path: str, classes: Iterable[ClassResult]) -> None:
+        """Count the cohesion of the classes of a file as returned by ``Module.class_results``."""
+        for class_result in classes:
+            self.add(path, class_result[3])
+
+    def merge(self, other: Aggregator) -> None:
+        """Add the statistics of another aggregator, e.g. of another worker or shard."""
+        if other.resolution != self.resolution:
+            raise ResolutionMismatchError(self.resolution, other.resolution)
+
+        for directory, other_stats in other.directories.items():
+            stats = self.directories.get(directory)
+            if stats is None:
+                stats = self.directories[directory] = CohesionStats(self.resolution)
+
+            stats.merge(other_stats)
+
+    def total(self) -> CohesionStats:
+        """Return the statistics of all classes."""
+        result = CohesionStats(self.resolution)
+        for stats in self.directories.values():
+            result.merge(stats)
+
+        return result
+
+    def summary(self, depth: int | None = None) -> dict[str, CohesionStats]:
+        """Return the statistics per directory, directories below ``depth`` path components are rolled up."""
+        if depth is None:
+            return dict(sorted(self.directories.items()))
+
+        result: dict[str, CohesionStats] = {}
+        for directory, stats in self.directories.items():
+            key = _roll_up(directory, depth)
+            rolled_up = result.get(key)
+            if rolled_up is None:
+                rolled_up = result[key] = CohesionStats(self.resolution)
+
+            rolled_up.merge(stats)
+
+        return dict(sorted(result.items()))
+
+    def save_to(self, path: str | os.PathLike[str], depth: int | None = None) -> None:
+        """Write the summary and the total of all classes to a file atomically, it can be loaded and merged again."""
+        document = {
+            "version": flake8_cohesion.__version__,
+            "format": STATS_FORMAT,
+            "resolution": self.resolution,
+            "total": self.total().to_dict(),
+            "directories": {directory: stats.to_dict() for directory, stats in self.summary(depth).items()},
+        }
+        storage.atomic_write_json(path, document)
+
+    @classmethod
+    def load_from(cls, path: str | os.PathLike[str]) -> Aggregator:
+        """Return the statistics written by :meth:`save_to`.
+
+        Raises ValueError if the file is invalid or was written by another version.
+        """
+        with pathlib.Path(path).open(encoding="utf-8") as file:
+            document = json.load(file)
+
+        try:
+            return cls._from_document(document)
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"invalid statistics: {type(e).__name__}: {e}") from e
+
+    @classmethod
+    def _from_document(cls, document: dict[str, Any]) -> Aggregator:
+        if (document["version"], document["format"]) != (flake8_cohesion.__version__, STATS_FORMAT):
+            raise ValueError(f"statistics of version {document['version']} cannot be merged")
+
+        aggregator = cls(float(document["resolution"]))
+        aggregator.directories = {
+            str(directory): CohesionStats.from_dict(stats, aggregator.resolution)
+            for directory, stats in document["directories"].items()
+        }
+        return aggregator
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import pathlib
+import tempfile
+
+
+def atomic_write_json(path: str | os.PathLike[str], document: object) -> None:
+    """Write a JSON document to a temporary file that replaces the file, readers never see a partial document."""
+    target = pathlib.Path(path)
+    file_descriptor, temporary_name = tempfile.mkstemp(dir=target.absolute().parent, suffix=".tmp")
+    temporary_path = pathlib.Path(temporary_name)
+    try:
+        with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+            json.dump(document, file)
+
+        temporary_path.replace(target)
+    except (OSError, TypeError, ValueError):
+        # the document could not be written or serialized
+        with contextlib.suppress(OSError):
+            temporary_path.unlink()
+
+        raise
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from flake8_cohesion import profiling
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    HAS_NUMPY = False
+else:
+    HAS_NUMPY = True
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from collections.abc import Sequence
+
+    from flake8_cohesion.module import ClassInfo
+    from flake8_cohesion.module import Module
+
+
+# upper bound of the number of array cells allocated for a single batch of classes
+DEFAULT_MAX_CELLS = 1 << 22
+
+
+class NumpyRequiredError(ImportError):
+    """The vectorized engine is used without the optional numpy dependency."""
+
+    def __init__(self) -> None:
+        super().__init__("the vectorized engine requires numpy, install flake8-cohesion[numpy]", name="numpy")
+
+
+class Incidence:
+    """Boolean methods × variables incidence matrix of the relevant methods of a class.
+
+    Names are stripped of leading and trailing underscores. The first ``variable_count`` columns are the variables
+    of the class, the remaining columns are names only used by its methods, e.g. attributes that are called in
+    another method. They count towards the cohesion percentage just like in ``Module.class_cohesion_percentage``.
+    """
+
+    __slots__ = ("methods", "variables", "variable_count", "rows")
+
+    def __init__(self, class_structure: ClassInfo) -> None:
+        functions = [(name, function) for name, function in class_structure.functions.items() if function.relevant]
+        variables = sorted({name.strip("_") for name in class_structure.variables})
+        columns = {name: column for column, name in enumerate(variables)}
+        self.variable_count = len(variables)
+        self.rows: list[list[int]] = []
+        for _, function in functions:
+            row = []
+            for variable_name in {name.strip("_") for name in function.variables}:
+                column = columns.get(variable_name)
+                if column is None:
+                    column = columns[variable_name] = len(variables)
+                    variables.append(variable_name)
+
+                row.append(column)
+
+            self.rows.append(sorted(row))
+
+        self.methods = tuple(name for name, _ in functions)
+        self.variables = tuple(variables)
+
+    @property
+    def dimensions(self) -> tuple[int, int]:
+        """Return the number of methods and the number of columns."""
+        return len(self.methods), len(self.variables)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Return the incidence matrix as a boolean array."""
+        require_numpy()
+        matrix = np.zeros(self.dimensions, dtype=bool)
+        for row, columns in enumerate(self.rows):
+            matrix[row, columns] = True
+
+        return matrix
+
+
+class ClassMetrics:
+    """Cohesion metrics of a class computed from its incidence matrix.
+
+    ``cohesion`` is the percentage of ``Module.class_cohesion_percentage``. ``lcom1`` is the number of pairs of
+    relevant methods that share no class variable, ``lcom2`` is that number minus the number of pairs sharing one,
+    but at least 0, and ``lcom5`` is the Henderson-Sellers lack of cohesion between 0 and 2, 0 if the class has
+    fewer than two relevant methods or no variables.
+    """
+
+    __slots__ = ("cohesion", "lcom1", "lcom2", "lcom5")
+
+    def __init__(self, cohesion: float, lcom1: int, lcom2: int, lcom5: float) -> None:
+        self.cohesion = cohesion
+        self.lcom1 = lcom1
+        self.lcom2 = lcom2
+        self.lcom5 = lcom5
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ClassMetrics):
+            return NotImplemented
+
+        return (self.cohesion, self.lcom1, self.lcom2, self.lcom5) == (
+            other.cohesion,
+            other.lcom1,
+            other.lcom2,
+            other.lcom5,
+        )
+
+    def __repr__(self) -> str:
+        fields = f"cohesion={self.cohesion!r}, lcom1={self.lcom1!r}, lcom2={self.lcom2!r}, lcom5={self.lcom5!r}"
+        return f"{type(self).__name__}({fields})"
+
+
+def score_module(file_module: Module, max_cells: int = DEFAULT_MAX_CELLS) -> dict[str, ClassMetrics]:
+    """Return the metrics of every class of a module and memoize their cohesion in the module structure."""
+    structure = file_module.structure
+    metrics = dict(zip(structure, score(list(structure.values()), max_cells)))
+    for class_name, class_metrics in metrics.items():
+        if structure[class_name].cohesion is None:
+            structure[class_name].cohesion = class_metrics.cohesion
+
+    return metrics
+
+
+@profiling.profiled("vectorized.score")
+def score(classes: Sequence[ClassInfo], max_cells: int = DEFAULT_MAX_CELLS) -> list[ClassMetrics]:
+    """Return the metrics of many classes, possibly of different modules, in as few array passes as possible.
+
+    Classes of similar shape are padded to a common shape and scored together in batches of at most ``max_cells``
+    array cells.
+    """
+    require_numpy()
+    incidences = [Incidence(class_structure) for class_structure in classes]
+    results: list[ClassMetrics | None] = [None] * len(incidences)
+    for batch in batches(incidences, max_cells):
+        for index, metrics in zip(batch, _score_batch([incidences[index] for index in batch])):
+            results[index] = metrics
+
+    return results  # type: ignore[return-value]
+
+
+def batches(incidences: Sequence[Incidence], max_cells: int = DEFAULT_MAX_CELLS) -> Iterator[list[int]]:
+    """Yield the indices of incidences of similar shape whose padded arrays fit into ``max_cells`` cells.
+
+    A single incidence larger than ``max_cells`` is yielded as a batch of its own.
+    """
+    order = sorted(range(len(incidences)), key=lambda index: incidences[index].dimensions)
+    batch: list[int] = []
+    methods = variables = 0
+    for index in order:
+        index_methods, index_variables = incidences[index].dimensions
+        batch_methods = max(methods, index_methods)
+        batch_variables = max(variables, index_variables)
+        # the incidence and the method overlap arrays
+        cells = (len(batch) + 1) * batch_methods * (batch_variables + batch_methods)
+        if batch and cells > max_cells:
+            yield batch
+            batch = []
+            batch_methods, batch_variables = index_methods, index_variables
+
+        batch.append(index)
+        methods, variables = batch_methods, batch_variables
+
+    if batch:
+        yield batch
+
+
+def _score_batch(incidences: Sequence[Incidence]) -> list[ClassMetrics]:
+    methods = max(incidence.dimensions[0] for incidence in incidences)
+    variables = max(incidence.dimensions[1] for incidence in incidences)
+
+    class_indices = []
+    row_indices = []
+    column_indices = []
+    for class_index, incidence in enumerate(incidences):
+        for row_index, row in enumerate(incidence.rows):
+            class_indices.extend([class_index] * len(row))
+            row_indices.extend([row_index] * len(row))
+            column_indices.extend(row)
+
+    matrix = np.zeros((len(incidences), methods, variables), dtype=bool)
+    matrix[class_indices, row_indices, column_indices] = True
+
+    method_counts = np.array([incidence.dimensions[0] for incidence in incidences], dtype=np.int64)
+    variable_counts = np.array([incidence.variable_count for incidence in incidences], dtype=np.int64)
+
+    # cohesion percentage over all columns, exactly like the pure python calculation
+    function_variable_counts = matrix.sum(axis=(1, 2))
+    class_variable_counts = variable_counts * method_counts
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cohesions = np.where(
+            class_variable_counts == 0,
+            100.0,
+            (function_variable_counts / class_variable_counts) * 100,
+        )
+
+    # the lcom metrics only consider the variables of the class
+    class_matrix = matrix & (np.arange(variables) < variable_counts[:, None])[:, None, :]
+    weights = class_matrix.astype(np.float32)
+    sharing = np.matmul(weights, weights.transpose(0, 2, 1)) > 0
+    valid = np.arange(methods) < method_counts[:, None]
+    pairs = np.triu(np.ones((methods, methods), dtype=bool), k=1) & valid[:, :, None] & valid[:, None, :]
+    sharing_pairs = (sharing & pairs).sum(axis=(1, 2))
+    all_pairs = method_counts * (method_counts - 1) // 2
+    lcom1 = all_pairs - sharing_pairs
+    lcom2 = np.maximum(lcom1 - sharing_pairs, 0)
+
+    accesses = class_matrix.sum(axis=(1, 2))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lcom5 = np.where(
+            (method_counts > 1) & (variable_counts > 0),
+            (method_counts - accesses / variable_counts) / (method_counts - 1),
+            0.0,
+        )
+
+    return [
+        ClassMetrics(round(float(cohesion), 2), int(pair_count), int(pair_difference), float(henderson_sellers))
+        for cohesion, pair_count, pair_difference, henderson_sellers in zip(cohesions, lcom1, lcom2, lcom5)
+    ]
+
+
+def require_numpy() -> None:
+    """Raise an ImportError if the optional numpy dependency is not installed."""
+    if not HAS_NUMPY:
+        raise NumpyRequiredError()
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+import textwrap
+
+import pytest
+
+from flake8_cohesion import batch
+from flake8_cohesion import module
+
+LOW_COHESION_CLASS = textwrap.dedent(
+    """
+class Cls:
+    def func(self):
+        self.variable1 = 'foo'
+    def func2(self):
+        self.variable2 = 'bar'
+"""
+)
+
+HIGH_COHESION_CLASS = textwrap.dedent(
+    """
+class Cls:
+    def func(self):
+        self.variable = 'foo'
+"""
+)
+
+
+class TestBatch:
+    def test_discover(self, tmp_path):
+        (tmp_path / "b.py").write_text("", encoding="utf-8")
+        (tmp_path / "a.py").write_text("", encoding="utf-8")
+        (tmp_path / "c.txt").write_text("", encoding="utf-8")
+        (tmp_path / "__pycache__").mkdir()
+        (tmp_path / "__pycache__" / "d.py").write_text("", encoding="utf-8")
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "e.py").write_text("", encoding="utf-8")
+
+        result = [path[len(str(tmp_path)) + 1 :] for path in batch.discover([str(tmp_path)])]
+        expected = ["a.py", "b.py", "pkg/e.py"]
+
+        assert result == expected
+
+    def test_discover_exclude(self, tmp_path):
+        (tmp_path / "a.py").write_text("", encoding="utf-8")
+        (tmp_path / "build").mkdir()
+        (tmp_path / "build" / "b.py").write_text("", encoding="utf-8")
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "c.py").write_text("", encoding="utf-8")
+        (tmp_path / "pkg" / "d_pb2.py").write_text("", encoding="utf-8")
+
+        exclude = ["build", "*_pb2.py", str(tmp_path / "a.py")]
+        result = [path[len(str(tmp_path)) + 1 :] for path in batch.discover([str(tmp_path)], exclude)]
+        expected = ["pkg/c.py"]
+
+        assert result == expected
+
+    def test_score_file(self, tmp_path):
+        path = tmp_path / "a.py"
+        path.write_text(LOW_COHESION_CLASS, encoding="utf-8")
+
+        file_result = batch.score_file(str(path))
+        result = (file_result.path, file_result.classes, file_result.error)
+        expected = (str(path), [("Cls", 2, 0, 50.0, 2, 2)], None)
+
+        assert result == expected
+
+    def test_score_file_source(self):
+        file_result = batch.score_file(("a.py", LOW_COHESION_CLASS.encode("utf-8")))
+        result = (file_result.path, file_result.classes, file_result.error)
+        expected = ("a.py", [("Cls", 2, 0, 50.0, 2, 2)], None)
+
+        assert result == expected
+
+    def test_score_file_syntax_error(self, tmp_path):
+        path = tmp_path / "a.py"
+        path.write_text("a )= 5", encoding="utf-8")
+
+        result = batch.score_file(str(path))
+
+        assert result.classes == []
+        assert result.error.startswith("SyntaxError")
+
+    @pytest.mark.parametrize("executor", ["process", "thread"])
+    def test_scan_pool(self, tmp_path, executor):
+        paths = []
+        for i in range(5):
+            path = tmp_path / f"{i}.py"
+            path.write_text(LOW_COHESION_CLASS, encoding="utf-8")
+            paths.append(str(path))
+
+        file_results = batch.scan(paths, workers=2, chunk_size=2, executor=executor)
+        result = sorted((file_result.path, file_result.classes) for file_result in file_results)
+        expected = [(path, [("Cls", 2, 0, 50.0, 2, 2)]) for path in sorted(paths)]
+
+        assert result == expected
+
+    def test_score_many(self, tmp_path):
+        path = tmp_path / "a.py"
+        path.write_text(LOW_COHESION_CLASS, encoding="utf-8")
+
+        records = batch.score_many([path, ("b.py", HIGH_COHESION_CLASS)])
+        result = [(record.path, record.name, record.lineno, record.col_offset, record.cohesion) for record in records]
+        expected = [(str(path), "Cls", 2, 0, 50.0), ("b.py", "Cls", 2, 0, 100.0)]
+
+        assert result == expected
+
+    def test_score_many_max_violations(self):
+        sources = [(f"{i}.py", HIGH_COHESION_CLASS if i % 2 else LOW_COHESION_CLASS) for i in range(10)]
+
+        records = batch.score_many(sources, cohesion_below=50.0, max_violations=3, chunk_size=1)
+        result = [record.path for record in records]
+        expected = ["0.py", "2.py", "4.py"]
+
+        assert result == expected
+
+    def test_score_many_max_violations_requires_threshold(self):
+        with pytest.raises(ValueError, match="cohesion_below"):
+            list(batch.score_many([], max_violations=1))
+
+    def test_score_many_on_error(self):
+        errors = []
+
+        def on_error(path, error):
+            errors.append(path)
+
+        records = batch.score_many([("a.py", "a )= 5"), ("b.py", HIGH_COHESION_CLASS)], on_error=on_error)
+        result = ([record.path for record in records], errors)
+        expected = (["b.py"], ["a.py"])
+
+        assert result == expected
+
+    def test_module_from_paths(self, tmp_path):
+        path = tmp_path / "a.py"
+        path.write_bytes(b"# -*- coding: latin-1 -*-\nclass Cls:\n    name = '\xe9'\n")
+
+        result = [(path, file_module.classes) for path, file_module in module.Module.from_paths([path])]
+        expected = [(str(path), ["Cls"])]
+
+        assert result == expected
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+import os
+import textwrap
+
+import pytest
+
+from flake8_cohesion import cache
+from flake8_cohesion import extension
+from flake8_cohesion import module
+from flake8_cohesion import parser
+
+
+class TestCache:
+    def test_cache_miss(self, tmp_path):
+        result_cache = cache.ResultCache(tmp_path)
+
+        result = result_cache.get(cache.cache_key(b"", strict=False))
+
+        assert result is None
+
+    def test_cache_key_ignore_decorators(self):
+        source = b"class Cls: pass"
+
+        result = cache.cache_key(source, strict=False, ignore_decorators=["overload", "fixture"])
+
+        assert result == cache.cache_key(source, strict=False, ignore_decorators=["fixture", "overload"])
+        assert result != cache.cache_key(source, strict=False)
+
+    def test_cache_hit(self, tmp_path):
+        result_cache = cache.ResultCache(tmp_path)
+        key = cache.cache_key(b"class Cls: pass", strict=False)
+        result_cache.set(key, [("Cls", 1, 0, 100.0, 0, 0)])
+
+        result = result_cache.get(key)
+        expected = [("Cls", 1, 0, 100.0, 0, 0)]
+
+        assert result == expected
+
+    def test_cache_key_strict(self):
+        result = cache.cache_key(b"class Cls: pass", strict=True)
+        expected = cache.cache_key(b"class Cls: pass", strict=False)
+
+        assert result != expected
+
+    def test_cache_key_version(self, monkeypatch):
+        expected = cache.cache_key(b"class Cls: pass", strict=False)
+        monkeypatch.setattr("flake8_cohesion.__version__", "0.0.0")
+
+        result = cache.cache_key(b"class Cls: pass", strict=False)
+
+        assert result != expected
+
+    def test_cache_corrupt_entry(self, tmp_path):
+        result_cache = cache.ResultCache(tmp_path)
+        key = cache.cache_key(b"", strict=False)
+        (tmp_path / (key + ".json")).write_text("[1, 2", encoding="utf-8")
+
+        result = result_cache.get(key)
+
+        assert result is None
+
+    def test_cache_evict_least_recently_used(self, tmp_path):
+        result_cache = cache.ResultCache(tmp_path, max_size=0)
+        keys = [cache.cache_key(str(i).encode(), strict=False) for i in range(3)]
+        for i, key in enumerate(keys):
+            result_cache.set(key, [("Cls", 1, 0, 100.0, 0, 0)])
+            os.utime(tmp_path / (key + ".json"), (i, i))
+        result_cache.max_size = 2 * (tmp_path / (keys[0] + ".json")).stat().st_size
+        result_cache.get(keys[0])
+
+        result_cache.evict()
+        result = sorted(path.stem for path in tmp_path.iterdir())
+        expected = [keys[0]]
+
+        assert result == expected
+
+    def test_cache_evict_on_open(self, tmp_path):
+        result_cache = cache.ResultCache(tmp_path)
+        keys = [cache.cache_key(str(i).encode(), strict=False) for i in range(3)]
+        for i, key in enumerate(keys):
+            result_cache.set(key, [("Cls", 1, 0, 100.0, 0, 0)])
+            os.utime(tmp_path / (key + ".json"), (i, i))
+        entry_size = (tmp_path / (keys[0] + ".json")).stat().st_size
+
+        cache.ResultCache(tmp_path, max_size=3 * entry_size - 1)
+        result = sorted(path.stem for path in tmp_path.iterdir())
+        expected = sorted(keys[1:])
+
+        assert result == expected
+
+    def test_extension_cache_skips_module(self, tmp_path, monkeypatch):
+        python_string = textwrap.dedent(
+            """
+        class Cls:
+            variable1 = 'foo'
+            variable2 = 'bar'
+            def func(self):
+                self.variable1 = 'baz'
+            def func2(self):
+                self.variable2 = 'bazz'
+        """
+        )
+        lines = python_string.splitlines(keepends=True)
+        ast_node = parser.get_ast_node_from_string(python_string)
+        monkeypatch.setattr(extension.CohesionChecker, "_cohesion_below", 75.0)
+        monkeypatch.setattr(extension.CohesionChecker, "_cache", cache.ResultCache(tmp_path))
+        expected = list(extension.CohesionChecker(ast_node, lines).run())
+
+        def fail(*args, **kwargs):
+            pytest.fail("module must not be created on a cache hit")
+
+        monkeypatch.setattr(module, "Module", fail)
+        result = list(extension.CohesionChecker(ast_node, lines).run())
+
+        assert result == expected
+        assert result == [(2, 0, extension.CohesionChecker._error_tmpl.format(50.0), extension.CohesionChecker)]
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+import io
+import json
+import textwrap
+
+import pytest
+
+from flake8_cohesion import cli
+from flake8_cohesion import extension
+from flake8_cohesion import module
+
+LOW_COHESION_CLASS = textwrap.dedent(
+    """
+class Cls:
+    def func(self):
+        self.variable1 = 'foo'
+    def func2(self):
+        self.variable2 = 'bar'
+"""
+)
+
+
+class TestCli:
+    def test_main(self, tmp_path, capsys):
+        path = tmp_path / "a.py"
+        path.write_text(LOW_COHESION_CLASS, encoding="utf-8")
+
+        exit_code = cli.main([str(tmp_path), "--workers", "1"])
+        result = capsys.readouterr().out
+        expected = f"{path}:2:1: {extension.CohesionChecker._error_tmpl.format(50.0)}\n"
+
+        assert exit_code == 1
+        assert result == expected
+
+    def test_main_below(self, tmp_path, capsys):
+        path = tmp_path / "a.py"
+        path.write_text(LOW_COHESION_CLASS, encoding="utf-8")
+
+        exit_code = cli.main([str(tmp_path), "--workers", "1", "--cohesion-below", "40"])
+        result = capsys.readouterr().out
+
+        assert exit_code == 0
+        assert result == ""
+
+    def test_main_diff(self, tmp_path, capsys, monkeypatch):
+        path = tmp_path / "a.py"
+        path.write_text(LOW_COHESION_CLASS + LOW_COHESION_CLASS.replace("Cls", "Cls2"), encoding="utf-8")
+        diff_string = "+++ b/a.py\n@@ -10 +10 @@\n"
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr("sys.stdin", io.StringIO(diff_string))
+
+        exit_code = cli.main(["--diff", "--workers", "1"])
+        result = capsys.readouterr().out
+        expected = f"a.py:8:1: {extension.CohesionChecker._error_tmpl.format(50.0)}\n"
+
+        assert exit_code == 1
+        assert result == expected
+
+    def test_main_memo_size(self, tmp_path, capsys, monkeypatch):
+        monkeypatch.setattr(module, "structure_memo", module.StructureMemo(0))
+        (tmp_path / "a.py").write_text(LOW_COHESION_CLASS + LOW_COHESION_CLASS, encoding="utf-8")
+
+        cli.main([str(tmp_path), "--workers", "1", "--cohesion-memo-size", "16"])
+        capsys.readouterr()
+        result = (module.structure_memo.maxsize, module.structure_memo.hits, module.structure_memo.misses)
+        expected = (16, 1, 1)
+
+        assert result == expected
+
+    def test_main_serve_diff(self, capsys):
+        with pytest.raises(SystemExit) as exc_info:
+            cli.main(["--serve", "--diff"])
+
+        result = exc_info.value.code
+        expected = 2
+
+        assert result == expected
+        assert "--serve can not be combined with --diff" in capsys.readouterr().err
+
+    def test_main_class_index(self, tmp_path, capsys, monkeypatch):
+        (tmp_path / "base.py").write_text(
+            "class Base:\n    def __init__(self):\n        self.a = 1\n        self.b = 2\n", encoding="utf-8"
+        )
+        (tmp_path / "derived.py").write_text(
+            "from base import Base\n\nclass Derived(Base):\n    def func1(self):\n        return self.a + self.b\n",
+            encoding="utf-8",
+        )
+        monkeypatch.chdir(tmp_path)
+
+        exit_code = cli.main([".", "--workers", "1", "--class-index", "index.json"])
+        result = capsys.readouterr().out
+
+        assert exit_code == 0
+        assert result == ""
+        assert (tmp_path / "index.json").is_file()
+
+    def test_main_ignore_decorators(self, tmp_path, capsys):
+        path = tmp_path / "a.py"
+        python_string = textwrap.dedent(
+            """
+        class Cls:
+            def func(self):
+                self.variable1 = self.variable2
+            @overload
+            def func2(self):
+                self.variable3 = 'bar'
+        """
+        )
+        path.write_text(python_string, encoding="utf-8")
+
+        exit_code = cli.main([str(path), "--workers", "1", "--cohesion-ignore-decorators", "typing.overload"])
+        result = (exit_code, capsys.readouterr().out)
+        expected = (0, "")
+
+        assert result == expected
+
+    def test_main_shard_merge(self, tmp_path, capsys, monkeypatch):
+        for index in range(8):
+            (tmp_path / f"module{index}.py").write_text(LOW_COHESION_CLASS, encoding="utf-8")
+        monkeypatch.chdir(tmp_path)
+
+        exit_codes = [
+            cli.main([".", "--workers", "1", "--shard", f"{index}/2", "--partial", f"{index}.json"]) for index in (1, 2)
+        ]
+        shard_output = capsys.readouterr().out
+        exit_code = cli.main(["merge", "1.json", "2.json"])
+        result = capsys.readouterr().out
+
+        assert exit_codes == [1, 1]
+        assert sorted(result.splitlines()) == sorted(shard_output.splitlines())
+        assert len(result.splitlines()) == 8
+        assert exit_code == 1
+
+    def test_main_merge_missing_shard(self, tmp_path, capsys, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        cli.main([".", "--workers", "1", "--shard", "1/2", "--partial", "1.json"])
+
+        exit_code = cli.main(["merge", "1.json"])
+        result = capsys.readouterr().err
+
+        assert exit_code == 1
+        assert result == "flake8-cohesion merge: missing shards 2/2\n"
+
+    def test_main_stats(self, tmp_path, capsys, monkeypatch):
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "a.py").write_text(LOW_COHESION_CLASS, encoding="utf-8")
+        (tmp_path / "b.py").write_text(LOW_COHESION_CLASS.replace("variable2", "variable1"), encoding="utf-8")
+        monkeypatch.chdir(tmp_path)
+
+        cli.main(["pkg", "b.py", "--workers", "1", "--stats", "stats.json"])
+        with open("stats.json", encoding="utf-8") as file:
+            document = json.load(file)
+        result = (
+            {directory: summary["p50"] for directory, summary in document["directories"].items()},
+            document["total"]["count"],
+        )
+        expected = ({"": 100.0, "pkg": 50.0}, 2)
+
+        assert result == expected
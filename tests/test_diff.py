@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+import subprocess
+import textwrap
+
+from flake8_cohesion import diff
+
+
+class TestDiff:
+    def test_parse_unified_diff(self):
+        diff_string = textwrap.dedent(
+            """\
+        diff --git a/pkg/a.py b/pkg/a.py
+        index 1111111..2222222 100644
+        --- a/pkg/a.py
+        +++ b/pkg/a.py
+        @@ -3 +3 @@ class Cls:
+        -    x = 1
+        +    x = 2
+        @@ -10,0 +11,2 @@ class Cls:
+        +    def func(self):
+        +        pass
+        @@ -20,2 +22,0 @@ class Cls:
+        -    y = 1
+        -    z = 2
+        diff --git a/b.py b/b.py
+        deleted file mode 100644
+        --- a/b.py
+        +++ /dev/null
+        @@ -1 +0,0 @@
+        -x = 1
+        """
+        )
+
+        result = diff.parse_unified_diff(diff_string.splitlines(keepends=True))
+        expected = {"pkg/a.py": [(3, 3), (11, 12), (22, 22)]}
+
+        assert result == expected
+
+    def test_overlaps(self):
+        result = [diff.overlaps(5, 10, [(1, 4)]), diff.overlaps(5, 10, [(1, 5)]), diff.overlaps(5, 10, [(10, 12)])]
+        expected = [False, True, True]
+
+        assert result == expected
+
+    def test_sorted_line_ranges(self):
+        ranges = [(20, 22), (1, 4), (3, 8), (12, 12)]
+
+        line_ranges = diff.SortedLineRanges(ranges)
+        result = [line_ranges.overlaps(start, end) for start in range(25) for end in range(start, 25)]
+        expected = [diff.overlaps(start, end, ranges) for start in range(25) for end in range(start, 25)]
+
+        assert result == expected
+        assert (line_ranges.starts, line_ranges.ends) == ([1, 12, 20], [8, 12, 22])
+
+    def test_git_diff_outside_of_cwd(self, tmp_path):
+        def git(*args):
+            command = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args]
+            subprocess.run(command, cwd=tmp_path, check=True, capture_output=True)
+
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "pkg" / "a.py").write_text("class Cls:\n    pass\n", encoding="utf-8")
+        git("init")
+        git("add", ".")
+        git("commit", "-m", "initial")
+        (tmp_path / "pkg" / "a.py").write_text("class Cls:\n    variable = 1\n", encoding="utf-8")
+
+        result = [
+            diff.parse_unified_diff(diff.git_diff("HEAD", cwd=str(tmp_path / directory))) for directory in ("", "sub")
+        ]
+        expected = [{"pkg/a.py": [(2, 2)]}, {"../pkg/a.py": [(2, 2)]}]
+
+        assert result == expected
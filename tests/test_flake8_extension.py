@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 
 import textwrap
+import types
 
 from flake8_cohesion import extension
 from flake8_cohesion import parser
+from flake8_cohesion import profiling
 
 
 class TestFlake8Extension:
@@ -105,3 +107,135 @@ class TestFlake8Extension:
         ]
 
         assert result == expected
+
+    def test_extension_metrics(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls:
+            def func1(self):
+                self.variable1 = 'foo'
+            def func2(self):
+                self.variable2 = 'bar'
+        """
+        )
+
+        ast_node = parser.get_ast_node_from_string(python_string)
+        checker = extension.CohesionChecker(ast_node)
+        checker._cohesion_below = 0.0
+        checker._strict = False
+        checker._max_lcom4 = 1
+        checker._min_tcc = 0.5
+        checker._min_lcc = 0.0
+
+        result = list(checker.run())
+        expected = [
+            (2, 0, extension.CohesionChecker._lcom4_error_tmpl.format(2), extension.CohesionChecker),
+            (2, 0, extension.CohesionChecker._tcc_error_tmpl.format(0.0), extension.CohesionChecker),
+        ]
+
+        assert result == expected
+
+    def test_extension_metrics_disabled(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls:
+            def func1(self):
+                self.variable1 = 'foo'
+            def func2(self):
+                self.variable2 = 'bar'
+        """
+        )
+
+        ast_node = parser.get_ast_node_from_string(python_string)
+        checker = extension.CohesionChecker(ast_node)
+        checker._cohesion_below = 0.0
+        checker._strict = False
+
+        result = list(checker.run())
+
+        assert result == []
+
+    def test_extension_budget(self):
+        python_string = textwrap.dedent(
+            """
+        class Big:
+            def func1(self):
+                self.variable1 = 1
+            def func2(self):
+                self.variable2 = 2
+            def func3(self):
+                self.variable3 = 3
+        class Small:
+            def func(self):
+                self.variable = 1
+        """
+        )
+
+        ast_node = parser.get_ast_node_from_string(python_string)
+        checker = extension.CohesionChecker(ast_node)
+        checker._cohesion_below = 50.0
+        checker._strict = False
+        checker._budget = parser.AnalysisBudget(max_nodes=10)
+
+        result = list(checker.run())
+        expected = [
+            (2, 0, extension.CohesionChecker._budget_class_tmpl.format(50.0, 2, 3), extension.CohesionChecker),
+        ]
+
+        assert result == expected
+
+    def test_extension_budget_expired(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls:
+            def func1(self):
+                self.variable1 = 'foo'
+        """
+        )
+
+        ast_node = parser.get_ast_node_from_string(python_string)
+        checker = extension.CohesionChecker(ast_node)
+        checker._cohesion_below = 100.0
+        checker._strict = False
+        checker._budget = parser.AnalysisBudget(max_seconds=0.0)
+
+        result = list(checker.run())
+        expected = [(1, 0, extension.CohesionChecker._budget_file_tmpl.format(0.0), extension.CohesionChecker)]
+
+        assert result == expected
+
+    def test_extension_class_index_exclude(self, tmp_path, monkeypatch):
+        (tmp_path / "a.py").write_text("class Included:\n    pass\n", encoding="utf-8")
+        (tmp_path / "build").mkdir()
+        (tmp_path / "build" / "b.py").write_text("class Excluded:\n    pass\n", encoding="utf-8")
+        (tmp_path / "c_pb2.py").write_text("class Generated:\n    pass\n", encoding="utf-8")
+        options = types.SimpleNamespace(
+            cohesion_below=50.0,
+            cohesion_strict=False,
+            cohesion_ignore_decorators=[],
+            cohesion_cache_dir=None,
+            cohesion_cache_size=64,
+            cohesion_memo_size=0,
+            cohesion_profile=None,
+            cohesion_class_index="index.json",
+            cohesion_max_lcom4=None,
+            cohesion_min_tcc=None,
+            cohesion_min_lcc=None,
+            cohesion_max_nodes=None,
+            cohesion_max_seconds=None,
+            filenames=["."],
+            exclude=["build"],
+            extend_exclude=["*_pb2.py"],
+        )
+        for name in ("_cohesion_below", "_strict", "_ignore_decorators", "_max_lcom4", "_min_tcc", "_min_lcc"):
+            monkeypatch.setattr(extension.CohesionChecker, name, getattr(extension.CohesionChecker, name))
+        for name in ("_cache", "_class_index", "_budget"):
+            monkeypatch.setattr(extension.CohesionChecker, name, None)
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delenv(profiling.ENVIRONMENT_VARIABLE, raising=False)
+        extension.CohesionChecker.parse_options(options)
+
+        result = sorted(extension.CohesionChecker._class_index.classes)
+        expected = ["a.Included"]
+
+        assert result == expected
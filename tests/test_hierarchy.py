@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+import os
+import textwrap
+
+from flake8_cohesion import hierarchy
+from flake8_cohesion import module
+
+BASE = textwrap.dedent(
+    """
+class Base:
+    def __init__(self):
+        self.variable = 1
+    def func(self):
+        return self.variable
+"""
+)
+
+DERIVED = textwrap.dedent(
+    """
+from pkg.base import Base
+
+class Derived(Base):
+    def func(self):
+        return self.variable + 1
+    def other(self):
+        return self.variable
+
+class Grandchild(Derived):
+    pass
+"""
+)
+
+
+def write_package(root):
+    (root / "pkg").mkdir()
+    (root / "pkg" / "__init__.py").write_text("", encoding="utf-8")
+    (root / "pkg" / "base.py").write_text(BASE, encoding="utf-8")
+    (root / "pkg" / "derived.py").write_text(DERIVED, encoding="utf-8")
+    return [str(root / "pkg" / name) for name in ("__init__.py", "base.py", "derived.py")]
+
+
+class TestHierarchy:
+    def test_module_name(self):
+        result = (
+            hierarchy.module_name(os.path.join("root", "pkg", "mod.py"), "root"),
+            hierarchy.module_name(os.path.join("pkg", "__init__.py")),
+        )
+        expected = ("pkg.mod", "pkg.__init__")
+
+        assert result == expected
+
+    def test_update(self, tmp_path):
+        index = hierarchy.ClassIndex(tmp_path)
+        indexed_files = index.update(write_package(tmp_path))
+
+        result = (indexed_files, sorted(index.classes), index.classes["pkg.derived.Derived"].bases)
+        expected = (3, ["pkg.base.Base", "pkg.derived.Derived", "pkg.derived.Grandchild"], ("pkg.base.Base",))
+
+        assert result == expected
+
+    def test_update_unchanged(self, tmp_path):
+        paths = write_package(tmp_path)
+        index = hierarchy.ClassIndex(tmp_path)
+        index.update(paths)
+
+        result = index.update(paths)
+
+        assert result == 0
+
+    def test_inherited_methods(self, tmp_path):
+        index = hierarchy.ClassIndex(tmp_path)
+        index.update(write_package(tmp_path))
+
+        inherited_methods = index.inherited_methods(["pkg.derived.Derived"])
+        result = {method_name: sorted(method_info.variables) for method_name, method_info in inherited_methods.items()}
+        expected = {"func": ["variable"], "other": ["variable"], "__init__": ["variable"]}
+
+        assert result == expected
+
+    def test_inherited_methods_cyclic(self, tmp_path):
+        path = tmp_path / "a.py"
+        path.write_text("class A(B):\n    def a(self):\n        pass\nclass B(A):\n    pass\n", encoding="utf-8")
+        index = hierarchy.ClassIndex(tmp_path)
+        index.update([str(path)])
+
+        result = sorted(index.inherited_methods(["a.B"]))
+
+        assert result == ["a"]
+
+    def test_lookup_refreshes_changed_file(self, tmp_path):
+        paths = write_package(tmp_path)
+        index = hierarchy.ClassIndex(tmp_path)
+        index.update(paths)
+        index.save_to(tmp_path / "index.json")
+        changed_source = "class Base:\n    def changed(self):\n        pass\n"
+        (tmp_path / "pkg" / "base.py").write_text(changed_source, encoding="utf-8")
+
+        loaded = hierarchy.ClassIndex.load_from(tmp_path / "index.json", tmp_path)
+        result = sorted(loaded.inherited_methods(["pkg.base.Base"]))
+
+        assert result == ["changed"]
+
+    def test_save_load(self, tmp_path):
+        index = hierarchy.ClassIndex(tmp_path)
+        index.update(write_package(tmp_path))
+        index.save_to(tmp_path / "index.json")
+
+        loaded = hierarchy.ClassIndex.load_from(tmp_path / "index.json", tmp_path)
+        result = (sorted(loaded.files), dict(loaded.classes["pkg.base.Base"].methods["__init__"]))
+        expected = (
+            [os.path.join("pkg", name) for name in ("__init__.py", "base.py", "derived.py")],
+            dict(index.classes["pkg.base.Base"].methods["__init__"]),
+        )
+
+        assert result == expected
+
+    def test_load_other_options(self, tmp_path):
+        index = hierarchy.ClassIndex(tmp_path)
+        index.update(write_package(tmp_path))
+        index.save_to(tmp_path / "index.json")
+
+        result = (
+            hierarchy.ClassIndex.load_from(tmp_path / "index.json", tmp_path, strict=True).classes,
+            hierarchy.ClassIndex.load_from(tmp_path / "index.json", tmp_path, ignore_decorators=["cache"]).classes,
+        )
+        expected = ({}, {})
+
+        assert result == expected
+
+    def test_load_invalid(self, tmp_path):
+        path = tmp_path / "index.json"
+        path.write_text("{}", encoding="utf-8")
+
+        result = hierarchy.ClassIndex.load_from(path, tmp_path).classes
+
+        assert result == {}
+
+    def test_module_inherits_methods(self, tmp_path):
+        index = hierarchy.ClassIndex(tmp_path)
+        index.update(write_package(tmp_path))
+
+        python_module = module.Module.from_string(DERIVED, module_name="pkg.derived", class_index=index)
+        result = {
+            class_name: (sorted(class_structure.functions), python_module.class_cohesion_percentage(class_name))
+            for class_name, class_structure in python_module.structure.items()
+        }
+        expected = {
+            "Derived": (["__init__", "func", "other"], 100.0),
+            "Grandchild": (["__init__", "func", "other"], 100.0),
+        }
+
+        assert result == expected
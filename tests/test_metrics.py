@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+import textwrap
+
+from flake8_cohesion import metrics
+from flake8_cohesion import module
+
+SOURCE = textwrap.dedent(
+    """
+class Cls:
+    def __init__(self):
+        self.a = 1
+        self.b = 2
+    def func1(self):
+        return self.a
+    def func2(self):
+        return self.b
+    def func3(self):
+        return self.func1() + self.c
+    def func4(self):
+        return self.d
+    @property
+    def prop(self):
+        return self.a + self.b + self.c + self.d
+"""
+)
+
+
+class TestMetrics:
+    def test_union_find(self):
+        sets = metrics.UnionFind(5)
+        sets.union(0, 1)
+        sets.union_all([2, 3, 1])
+
+        result = (sets.count, sets.find(3) == sets.find(0), sets.find(4) == sets.find(0), sets.connected_pairs())
+        expected = (2, True, False, 6)
+
+        assert result == expected
+
+    def test_incidence_index(self):
+        python_module = module.Module.from_string(SOURCE)
+
+        index = metrics.IncidenceIndex(python_module.structure["Cls"])
+        result = (index.methods, index.attributes, index.calls, index.methods_by_attribute)
+        expected = (
+            ("__init__", "func1", "func2", "func3", "func4"),
+            (frozenset({"a", "b"}), frozenset({"a"}), frozenset({"b"}), frozenset({"c"}), frozenset({"d"})),
+            (frozenset(), frozenset(), frozenset(), frozenset({1}), frozenset()),
+            {"a": [0, 1], "b": [0, 2], "c": [3], "d": [4]},
+        )
+
+        assert result == expected
+
+    def test_calculate(self):
+        python_module = module.Module.from_string(SOURCE)
+
+        result = metrics.calculate(metrics.IncidenceIndex(python_module.structure["Cls"]))
+        # __init__ shares with func1 and func2, func3 reaches a through func1
+        expected = metrics.Metrics(8, 6, 3, 2, 4 / 10, 6 / 10)
+
+        assert result == expected
+
+    def test_calculate_single_method(self):
+        python_module = module.Module.from_string(
+            textwrap.dedent(
+                """
+            class Cls:
+                def func(self):
+                    self.variable = 1
+            """
+            )
+        )
+
+        result = metrics.class_metrics(python_module.structure["Cls"])
+        expected = metrics.Metrics(0, 0, 1, 1, 1.0, 1.0)
+
+        assert result == expected
+
+    def test_calculate_empty(self):
+        python_module = module.Module.from_string("class Cls:\n    pass\n")
+
+        result = metrics.class_metrics(python_module.structure["Cls"])
+        expected = metrics.Metrics(0, 0, 0, 0, 1.0, 1.0)
+
+        assert result == expected
+
+    def test_calculate_recursive_calls(self):
+        python_module = module.Module.from_string(
+            textwrap.dedent(
+                """
+            class Cls:
+                def func1(self):
+                    self.variable = self.func2()
+                def func2(self):
+                    return self.func1() + self.func2()
+            """
+            )
+        )
+
+        result = metrics.class_metrics(python_module.structure["Cls"])
+        expected = metrics.Metrics(1, 1, 2, 1, 1.0, 1.0)
+
+        assert result == expected
@@ -4,6 +4,7 @@ import collections
 import textwrap
 
 from flake8_cohesion import module
+from flake8_cohesion import parser
 
 
 class TestModule:
@@ -99,9 +100,7 @@ class TestModule:
         )
 
         python_module = module.Module.from_string(python_string)
-        python_module.filter_below(40)
-
-        result = python_module.classes
+        result = list(python_module.filter_below(40))
 
         assert result == []
 
@@ -116,9 +115,7 @@ class TestModule:
         )
 
         python_module = module.Module.from_string(python_string, strict=True)
-        python_module.filter_below(60)
-
-        result = python_module.classes
+        result = list(python_module.filter_below(60))
         expected = ["Cls"]
 
         assert result == expected
@@ -134,9 +131,7 @@ class TestModule:
         )
 
         python_module = module.Module.from_string(python_string, strict=True)
-        python_module.filter_below(50)
-
-        result = python_module.classes
+        result = list(python_module.filter_below(50))
         expected = ["Cls"]
 
         assert result == expected
@@ -152,9 +147,7 @@ class TestModule:
         )
 
         python_module = module.Module.from_string(python_string, strict=True)
-        python_module.filter_above(60)
-
-        result = python_module.classes
+        result = list(python_module.filter_above(60))
 
         assert result == []
 
@@ -169,9 +162,7 @@ class TestModule:
         )
 
         python_module = module.Module.from_string(python_string)
-        python_module.filter_above(40)
-
-        result = python_module.classes
+        result = list(python_module.filter_above(40))
         expected = ["Cls"]
 
         assert result == expected
@@ -187,9 +178,7 @@ class TestModule:
         )
 
         python_module = module.Module.from_string(python_string)
-        python_module.filter_above(50)
-
-        result = python_module.classes
+        result = list(python_module.filter_above(50))
         expected = ["Cls"]
 
         assert result == expected
@@ -289,7 +278,7 @@ class TestModule:
 
         python_module = module.Module.from_string(python_string)
 
-        result = python_module.structure["Cls"]["col_offset"]
+        result = python_module.structure["foo.<locals>.Cls"]["col_offset"]
         expected = 4
 
         assert result == expected
@@ -432,3 +421,503 @@ class TestModule:
         expected = 35.71
 
         assert result == expected
+
+    def test_module_structure_mapping_view(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls:
+            def func(self):
+                self.variable = 'foo'
+            @property
+            def prop(self):
+                return self.variable
+        """
+        )
+
+        python_module = module.Module.from_string(python_string)
+
+        result = dict(python_module.structure["Cls"]["functions"]["prop"])
+        expected = {
+            "variables": frozenset(["variable"]),
+            "bounded": True,
+            "staticmethod": False,
+            "classmethod": False,
+            "property": True,
+            "abstractmethod": False,
+            "passing": False,
+        }
+
+        assert result == expected
+
+    def test_module_structure_flags(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls:
+            def func(self):
+                pass
+        """
+        )
+
+        python_module = module.Module.from_string(python_string)
+
+        result = python_module.structure["Cls"].functions["func"].flags
+        expected = module.MethodFlag.BOUNDED | module.MethodFlag.PASSING
+
+        assert result == expected
+
+    def test_module_structure_interned_variables(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls1:
+            def func(self):
+                self.variable = 'foo'
+        class Cls2:
+            def func(self):
+                self.variable = 'bar'
+        """
+        )
+
+        python_module = module.Module.from_string(python_string)
+
+        (result,) = python_module.structure["Cls1"].variables
+        (expected,) = python_module.structure["Cls2"].variables
+
+        assert result is expected
+
+    def test_module_relevant_functions(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls:
+            def func(self):
+                self.variable = 'foo'
+            @staticmethod
+            def func2():
+                return 'bar'
+            def func3(self):
+                pass
+        """
+        )
+
+        python_module = module.Module.from_string(python_string)
+
+        result = python_module.relevant_functions("Cls")
+        expected = ["func"]
+
+        assert result == expected
+
+    def test_module_class_results(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls:
+            def func(self):
+                self.variable1 = 'foo'
+            def func2(self):
+                self.variable2 = 'bar'
+        """
+        )
+
+        python_module = module.Module.from_string(python_string)
+
+        result = python_module.class_results()
+        expected = [("Cls", 2, 0, 50.0, 2, 2)]
+
+        assert result == expected
+
+    def test_module_line_ranges(self):
+        python_string = textwrap.dedent(
+            """\
+        class Cls1:
+            def func(self):
+                self.variable = 'foo'
+        class Cls2:
+            class Cls3:
+                pass
+            def func(self):
+                self.variable = 'bar'
+        """
+        )
+
+        python_module = module.Module.from_string(python_string, line_ranges=[(8, 8)])
+
+        result = python_module.classes
+        expected = ["Cls2"]
+
+        assert result == expected
+
+    def test_module_from_tree(self, monkeypatch):
+        monkeypatch.setattr(module, "structure_memo", module.StructureMemo())
+        python_string = textwrap.dedent(
+            """
+        class Cls:
+            def __init__(self):
+                self.variable = 1
+        """
+        )
+        tree = parser.get_ast_node_from_string(python_string)
+
+        python_module = module.Module.from_tree(tree, source=python_string)
+        result = (python_module.classes, python_module.class_cohesion_percentage("Cls"), len(module.structure_memo))
+        expected = (["Cls"], 100.0, 1)
+
+        assert result == expected
+        assert python_module._module_ast_node is tree
+
+    def test_module_from_class_nodes(self):
+        python_string = textwrap.dedent(
+            """\
+        from pkg import Base
+        class Cls1:
+            pass
+        def func():
+            class Cls2(Base):
+                class Cls3:
+                    def func(self):
+                        self.variable = 1
+        """
+        )
+        tree = parser.get_ast_node_from_string(python_string)
+        cls1, cls2, cls3 = parser.get_module_classes(tree)
+
+        python_module = module.Module.from_class_nodes([cls3, cls2], tree, module_name="mod")
+        result = {class_name: class_structure.bases for class_name, class_structure in python_module.structure.items()}
+        expected = {"func.<locals>.Cls2": ("pkg.Base",), "func.<locals>.Cls2.Cls3": ()}
+
+        assert result == expected
+
+    def test_module_from_class_nodes_without_tree(self):
+        python_string = "class Outer:\n    class Inner:\n        def func(self):\n            self.variable = 1\n"
+        tree = parser.get_ast_node_from_string(python_string)
+        inner = parser.get_module_classes(tree)[1]
+
+        python_module = module.Module.from_class_nodes([inner])
+        result = (python_module.classes, python_module.structure["Inner"].lineno)
+        expected = (["Inner"], 2)
+
+        assert result == expected
+
+    def test_module_lazy_cohesion(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls1:
+            def func(self):
+                self.variable = 'foo'
+        class Cls2:
+            def func(self):
+                self.variable = 'bar'
+        """
+        )
+
+        python_module = module.Module.from_string(python_string)
+        python_module.class_cohesion_percentage("Cls1")
+
+        result = [class_structure.cohesion for class_structure in python_module.structure.values()]
+        expected = [100.0, None]
+
+        assert result == expected
+
+    def test_module_filter_keeps_structure(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls1:
+            def func(self):
+                self.variable = 'foo'
+        class Cls2:
+            def func(self):
+                self.variable1 = 'bar'
+            def func2(self):
+                self.variable2 = 'baz'
+        """
+        )
+
+        python_module = module.Module.from_string(python_string)
+
+        result = (list(python_module.filter_below(50)), python_module.classes)
+        expected = (["Cls2"], ["Cls1", "Cls2"])
+
+        assert result == expected
+
+    def test_module_duplicate_nested_class_names(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls1:
+            class Meta:
+                def func(self):
+                    self.variable = 'foo'
+        class Cls2:
+            class Meta:
+                def func(self):
+                    self.variable1 = 'bar'
+                def func2(self):
+                    self.variable2 = 'baz'
+        """
+        )
+
+        python_module = module.Module.from_string(python_string)
+
+        result = {
+            class_name: python_module.class_cohesion_percentage(class_name) for class_name in python_module.classes
+        }
+        expected = {"Cls1": 100.0, "Cls2": 100.0, "Cls1.Meta": 100.0, "Cls2.Meta": 50.0}
+
+        assert result == expected
+
+    def test_module_class_hierarchy(self):
+        python_string = textwrap.dedent(
+            """
+        class Outer:
+            class Inner:
+                class Innermost:
+                    pass
+        """
+        )
+
+        python_module = module.Module.from_string(python_string)
+
+        result = (
+            python_module.parent("Outer"),
+            python_module.children("Outer"),
+            python_module.parent("Outer.Inner.Innermost"),
+            python_module.structure["Outer.Inner"].name,
+        )
+        expected = (None, ["Outer.Inner"], "Outer.Inner", "Inner")
+
+        assert result == expected
+
+    def test_module_class_redefinition(self):
+        python_string = textwrap.dedent(
+            """
+        if condition:
+            class Cls:
+                def func(self):
+                    self.variable = 'foo'
+                class Inner:
+                    pass
+        else:
+            class Cls:
+                def func1(self):
+                    self.variable1 = 'foo'
+                def func2(self):
+                    self.variable2 = 'bar'
+                class Inner:
+                    pass
+        """
+        )
+
+        python_module = module.Module.from_string(python_string)
+
+        result = (
+            {class_name: python_module.class_cohesion_percentage(class_name) for class_name in python_module.classes},
+            python_module.children("Cls@9"),
+            python_module.parent("Cls@9.Inner"),
+            python_module.children("Cls"),
+        )
+        expected = (
+            {"Cls": 100.0, "Cls@9": 50.0, "Cls.Inner": 100.0, "Cls@9.Inner": 100.0},
+            ["Cls@9.Inner"],
+            "Cls@9",
+            ["Cls.Inner"],
+        )
+
+        assert result == expected
+
+    def test_module_class_metrics(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls:
+            def func1(self):
+                self.variable1 = 'foo'
+            def func2(self):
+                self.variable2 = self.func1()
+            def func3(self):
+                self.variable3 = 'bar'
+        """
+        )
+
+        python_module = module.Module.from_string(python_string)
+
+        metrics = python_module.class_metrics("Cls")
+        result = (metrics.lcom1, metrics.lcom3, metrics.lcom4, metrics.tcc, metrics.lcc)
+        expected = (3, 3, 2, 1 / 3, 1 / 3)
+
+        assert result == expected
+        assert python_module.class_metrics("Cls") is metrics
+        assert python_module.structure["Cls"].functions["func2"].calls == frozenset(["func1"])
+
+    def test_module_async_methods(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls:
+            async def func1(self):
+                self.variable1 = await self.fetch()
+            async def func2(self):
+                self.variable2 = 'bar'
+            async def fetch(self):
+                pass
+        """
+        )
+
+        python_module = module.Module.from_string(python_string)
+
+        result = (python_module.relevant_functions("Cls"), python_module.class_cohesion_percentage("Cls"))
+        expected = (["func1", "func2"], 50.0)
+
+        assert result == expected
+
+    def test_module_ignore_decorators(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls:
+            def func1(self):
+                self.variable1 = 'foo'
+            @functools.cached_property
+            def func2(self):
+                self.variable2 = 'bar'
+            @pytest.fixture(scope="class")
+            def func3(self):
+                self.variable3 = 'baz'
+        """
+        )
+
+        python_module = module.Module.from_string(
+            python_string,
+            ignore_decorators=["functools.cached_property", "fixture"],
+        )
+
+        result = python_module.relevant_functions("Cls")
+        expected = ["func1"]
+
+        assert result == expected
+
+    def test_decorator_table(self):
+        table = module.decorator_table(frozenset(["overload", "property"]))
+
+        result = [
+            table.classify(frozenset(["overload", "other"])),
+            table.classify(frozenset(["property"])),
+            table.classify(frozenset()),
+        ]
+        expected = [int(module.MethodFlag.IGNORED), int(module.MethodFlag.PROPERTY), 0]
+
+        assert result == expected
+        assert module.decorator_table(frozenset()) is module.DEFAULT_DECORATOR_TABLE
+
+    def test_module_structure_memo(self, monkeypatch):
+        monkeypatch.setattr(module, "structure_memo", module.StructureMemo())
+        python_string = textwrap.dedent(
+            """
+        class Serializer1(Base):
+            class Meta:
+                fields = []
+            def func(self):
+                self.variable = 1
+
+        class Serializer2(Base):
+            class Meta:
+                fields = []
+            def func(self):
+                self.variable = 1
+        """
+        )
+
+        python_module = module.Module.from_string(python_string, module_name="pkg.serializers")
+        result = {
+            class_name: (
+                class_structure.name,
+                class_structure.lineno,
+                class_structure.parent,
+                class_structure.children,
+                class_structure.bases,
+                sorted(class_structure.variables),
+            )
+            for class_name, class_structure in python_module.structure.items()
+        }
+        expected = {
+            "Serializer1": ("Serializer1", 2, None, ("Serializer1.Meta",), ("pkg.serializers.Base",), ["variable"]),
+            "Serializer2": ("Serializer2", 8, None, ("Serializer2.Meta",), ("pkg.serializers.Base",), ["variable"]),
+            "Serializer1.Meta": ("Meta", 3, "Serializer1", (), (), []),
+            "Serializer2.Meta": ("Meta", 9, "Serializer2", (), (), []),
+        }
+
+        assert result == expected
+        assert list(result) == list(module.Module(parser.get_ast_node_from_string(python_string)).structure)
+        assert (module.structure_memo.hits, module.structure_memo.misses) == (1, 1)
+
+    def test_module_structure_memo_from_path(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(module, "structure_memo", module.StructureMemo())
+        python_string = textwrap.dedent(
+            """
+        def factory():
+            class Local:
+                def func(self):
+                    self.variable = 1
+            return Local
+
+        class Cls:
+            class Inner:
+                pass
+            def func(self):
+                self.variable = 1
+        """
+        )
+        path = tmp_path / "a.py"
+        path.write_text(python_string, encoding="utf-8")
+        python_module = module.Module(parser.get_ast_node_from_string(python_string))
+        expected = [
+            (class_name, class_structure.lineno, sorted(class_structure.variables))
+            for class_name, class_structure in python_module.structure.items()
+        ]
+
+        for _ in range(2):
+            result = [
+                (class_name, class_structure.lineno, sorted(class_structure.variables))
+                for class_name, class_structure in module.Module.from_path(path).structure.items()
+            ]
+
+            assert result == expected
+        assert (module.structure_memo.hits, module.structure_memo.misses) == (1, 1)
+
+    def test_module_structure_memo_options(self, monkeypatch):
+        monkeypatch.setattr(module, "structure_memo", module.StructureMemo())
+        python_string = "class Cls:\n    variable = 1\n    def func(self):\n        pass\n"
+
+        for strict in (False, True, True):
+            module.Module.from_string(python_string, strict).structure  # noqa: B018
+        module.Module.from_string(python_string, ignore_decorators=["fixture"]).structure  # noqa: B018
+        result = (module.structure_memo.hits, module.structure_memo.misses, len(module.structure_memo))
+
+        assert result == (1, 3, 3)
+
+    def test_structure_memo_lru(self):
+        memo = module.StructureMemo(maxsize=2)
+        templates = ()
+
+        memo.set((b"a", False, module.DEFAULT_DECORATOR_TABLE), templates)
+        memo.set((b"b", False, module.DEFAULT_DECORATOR_TABLE), templates)
+        memo.get((b"a", False, module.DEFAULT_DECORATOR_TABLE))
+        memo.set((b"c", False, module.DEFAULT_DECORATOR_TABLE), templates)
+        result = [memo.get((key, False, module.DEFAULT_DECORATOR_TABLE)) for key in (b"a", b"b", b"c")]
+
+        assert result == [templates, None, templates]
+        memo.resize(0)
+        assert len(memo) == 0
+
+    def test_module_budget(self, monkeypatch):
+        monkeypatch.setattr(module, "structure_memo", module.StructureMemo())
+        python_string = textwrap.dedent(
+            """
+        class Cls:
+            def func1(self):
+                self.variable1 = 1
+            def func2(self):
+                self.variable2 = 2
+        """
+        )
+
+        python_module = module.Module.from_string(python_string, budget=parser.AnalysisBudget(max_nodes=1))
+        class_structure = python_module.structure["Cls"]
+        result = (list(class_structure.functions), class_structure.truncated, class_structure.skipped_methods)
+        expected = (["func1"], True, 1)
+
+        assert result == expected
+        assert not python_module.budget_exceeded
+        assert len(module.structure_memo) == 0
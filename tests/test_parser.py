@@ -2,6 +2,7 @@
 
 import ast
 import textwrap
+import timeit
 
 import pytest
 
@@ -161,6 +162,61 @@ class TestParser:
 
         assert set(result) == set(expected)
 
+    def test_get_class_methods_async(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls:
+            def func1(self):
+                pass
+            async def func2(self):
+                async def func3():
+                    pass
+                await func3()
+        """
+        )
+
+        node = parser.get_ast_node_from_string(python_string)
+        methods = [method for cls in parser.get_module_classes(node) for method in parser.get_class_methods(cls)]
+        result = [method.name for method in methods]
+        expected = ["func1", "func2"]
+
+        assert result == expected
+
+    def test_async_method_predicates(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls:
+            async def func1(self):
+                pass
+            @staticmethod
+            async def func2():
+                pass
+            @abc.abstractmethod
+            async def func3(self):
+                await self.func1()
+        """
+        )
+
+        node = parser.get_ast_node_from_string(python_string)
+        methods = [method for cls in parser.get_module_classes(node) for method in parser.get_class_methods(cls)]
+        result = [
+            (
+                parser.get_object_name(method),
+                parser.is_class_method_bound(method),
+                parser.is_class_method_staticmethod(method),
+                parser.is_class_method_abstractmethod(method),
+                parser.is_class_method_only_passing(method),
+            )
+            for method in methods
+        ]
+        expected = [
+            ("func1", True, False, False, True),
+            ("func2", False, True, False, False),
+            ("func3", True, False, True, False),
+        ]
+
+        assert result == expected
+
     def test_bound_method_is_bound(self):
         python_string = textwrap.dedent(
             """
@@ -728,3 +784,394 @@ class TestParser:
         expected = [True]
 
         assert set(result) == set(expected)
+
+    @pytest.mark.parametrize(
+        ("python_string", "expected"),
+        [
+            ("name", "name"),
+            ("obj.attr", "attr"),
+            ("obj.method()", "method"),
+            ("factory()()", "factory"),
+            ("items[0]()", "items"),
+            ("(lambda: 1)()", "<lambda>"),
+            ("(a or b)()", "<BoolOp>"),
+            ("f'{a}'.format()", "format"),
+        ],
+        ids=["name", "attribute", "call", "call_call", "subscript", "lambda", "bool_op", "constant"],
+    )
+    def test_get_object_name(self, python_string, expected):
+        (statement,) = parser.get_ast_node_from_string(python_string).body
+
+        result = parser.get_object_name(statement.value)
+
+        assert result == expected
+
+    def test_get_class_variables_unpacking(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls:
+            a, (b, *c) = 1, (2, 3)
+            [d] = [4]
+        """
+        )
+
+        node = parser.get_ast_node_from_string(python_string)
+        (cls,) = parser.get_module_classes(node)
+        result = parser.get_all_class_variable_names(cls, strict=True)
+        expected = {"a", "b", "c", "d"}
+
+        assert result == expected
+
+    def test_collect_classes_order(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls1:
+            class Cls2:
+                pass
+        class Cls3:
+            pass
+        """
+        )
+
+        node = parser.get_ast_node_from_string(python_string)
+        result = [parsed_class.name for parsed_class in parser.collect_classes(node)]
+        expected = [cls.name for cls in parser.get_module_classes(node)]
+
+        assert result == expected
+
+    def test_collect_classes_methods(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls:
+            @staticmethod
+            def func1(arg1):
+                pass
+            def func2(self):
+                def func3(arg2):
+                    pass
+                pass
+            def func4(self):
+                pass
+        """
+        )
+
+        node = parser.get_ast_node_from_string(python_string)
+        (parsed_class,) = parser.collect_classes(node)
+        result = [(method.name, method.bounded, method.passing, method.decorators) for method in parsed_class.methods]
+        expected = [
+            ("func1", False, False, frozenset(["staticmethod"])),
+            ("func2", True, True, frozenset()),
+            ("func4", True, True, frozenset()),
+        ]
+
+        assert result == expected
+
+    def test_collect_classes_method_calls(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls:
+            def func1(self):
+                self.func2()
+                other.func3()
+                helper()
+            def func2(self):
+                def nested():
+                    return self.func1(self.attr)
+                return nested
+        """
+        )
+
+        node = parser.get_ast_node_from_string(python_string)
+        (parsed_class,) = parser.collect_classes(node)
+        result = {method.name: method.method_calls for method in parsed_class.methods}
+        expected = {"func1": {"func2"}, "func2": {"func1"}}
+
+        assert result == expected
+
+    def test_collect_classes_async_methods(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls:
+            async def func1(self):
+                pass
+            @property
+            async def func2(self):
+                async with self.lock:
+                    return self.attr1
+            async def func3(self):
+                async def nested():
+                    self.attr2 = await self.func2
+                return nested
+        """
+        )
+
+        node = parser.get_ast_node_from_string(python_string)
+        (parsed_class,) = parser.collect_classes(node)
+        result = [
+            (method.name, method.bounded, method.passing, method.decorators, method.instance_variable_names)
+            for method in parsed_class.methods
+        ]
+        expected = [
+            ("func1", True, True, frozenset(), set()),
+            ("func2", True, False, frozenset(["property"]), {"lock", "attr1"}),
+            ("func3", True, False, frozenset(), {"attr2", "func2"}),
+        ]
+
+        assert result == expected
+
+    def test_collect_classes_instance_variables(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls1:
+            def func1(self):
+                self.attr1 = 5
+                self.func2()
+            def func2(self):
+                self.attr2 = self.attr1
+                class Cls2:
+                    def func3(self):
+                        self.attr3 = 6
+        """
+        )
+
+        node = parser.get_ast_node_from_string(python_string)
+        parsed_classes = parser.collect_classes(node)
+        result = {
+            parsed_class.name: (
+                parsed_class.instance_variable_names,
+                {method.name: method.instance_variable_names for method in parsed_class.methods},
+            )
+            for parsed_class in parsed_classes
+        }
+        expected = {
+            cls.name: (
+                parser.get_all_class_variable_names(cls, strict=False),
+                {
+                    method.name: parser.get_all_class_variable_names_used_in_method(method)
+                    for method in parser.get_class_methods(cls)
+                },
+            )
+            for cls in parser.get_module_classes(node)
+        }
+
+        assert result == expected
+
+    def test_collect_classes_strict_variables(self):
+        python_string = textwrap.dedent(
+            """
+        class Cls:
+            attr1 = attr2 = 5
+            def func(self):
+                self.attr3 = 6
+        """
+        )
+
+        node = parser.get_ast_node_from_string(python_string)
+        (parsed_class,) = parser.collect_classes(node)
+        result = parsed_class.variable_names(strict=True)
+        expected = {"attr1", "attr2", "attr3"}
+
+        assert result == expected
+
+    def test_get_classes_in_lines(self):
+        python_string = textwrap.dedent(
+            """\
+        class Cls1:
+            pass
+        def func():
+            class Cls2:
+                class Cls3:
+                    pass
+        @decorator
+        class Cls4:
+            pass
+        """
+        )
+
+        node = parser.get_ast_node_from_string(python_string)
+        result = [(scope, cls.name) for scope, cls in parser.get_classes_in_lines(node, [(5, 5), (7, 7)])]
+        expected = [("func.<locals>", "Cls2"), ("", "Cls4")]
+
+        assert result == expected
+
+    def test_get_class_scopes(self):
+        python_string = textwrap.dedent(
+            """\
+        class Cls1:
+            class Cls2:
+                class Cls3:
+                    pass
+        def func():
+            class Cls4:
+                pass
+        """
+        )
+
+        node = parser.get_ast_node_from_string(python_string)
+        cls1, cls2, cls4, cls3 = parser.get_module_classes(node)
+        other = parser.get_module_classes(parser.get_ast_node_from_string("class Other:\n    pass\n"))[0]
+        result = [(scope, cls.name) for scope, cls in parser.get_class_scopes(node, [cls4, cls3, cls2, other])]
+        expected = [("", "Other"), ("Cls1", "Cls2"), ("func.<locals>", "Cls4")]
+
+        assert result == expected
+
+    @pytest.mark.parametrize(
+        ("content", "python_string"),
+        [
+            (b"", ""),
+            (b"# -*- coding: latin-1 -*-\nname = '\xe9'\n", "name = '\xe9'\n"),
+            (b"\xef\xbb\xbfname = '\xc3\xa9'\n", "name = '\xe9'\n"),
+        ],
+        ids=["empty", "coding_cookie", "bom"],
+    )
+    def test_get_ast_node_from_file(self, tmp_path, content, python_string):
+        path = tmp_path / "a.py"
+        path.write_bytes(content)
+
+        result = ast.dump(parser.get_ast_node_from_file(path))
+        expected = ast.dump(ast.parse(python_string))
+
+        assert result == expected
+
+    def test_collect_classes_qualname(self):
+        python_string = textwrap.dedent(
+            """\
+        class Outer:
+            class Inner:
+                pass
+            def method(self):
+                class Local:
+                    pass
+        async def func():
+            class Local:
+                pass
+        """
+        )
+
+        node = parser.get_ast_node_from_string(python_string)
+        result = {
+            parsed_class.qualname: parsed_class.parent and parsed_class.parent.qualname
+            for parsed_class in parser.collect_classes(node)
+        }
+        expected = {
+            "Outer": None,
+            "Outer.Inner": "Outer",
+            "Outer.method.<locals>.Local": "Outer",
+            "func.<locals>.Local": None,
+        }
+
+        assert result == expected
+
+    def test_get_class_fingerprint(self):
+        source = textwrap.dedent(
+            """\
+        class First(Base):
+            def func(self):
+                self.variable = 1
+        @decorator
+        class Second(Base):
+            def func(self):
+                self.variable = 1
+        @decorator
+        class Third(Base):
+            def func(self):
+                self.variable = 1
+        class Fourth(Other):
+            def func(self):
+                self.variable = 1
+        """
+        ).encode()
+
+        node = parser.get_ast_node_from_string(source)
+        lines = parser.SourceLines(source)
+        result = [parser.get_class_fingerprint(class_node, lines) for class_node in node.body]
+
+        assert result[1] == result[2]
+        assert len({result[0], result[1], result[3]}) == 3
+
+    def test_get_class_fingerprint_name_in_keyword(self):
+        source = b"class s:\n    pass\nclass t:\n    pass\nclass las:\n    pass\n"
+
+        node = parser.get_ast_node_from_string(source)
+        lines = parser.SourceLines(source)
+        result = [parser.get_class_fingerprint(class_node, lines) for class_node in node.body]
+
+        assert result[0] == result[1] == result[2]
+
+    def test_source_lines(self):
+        source = b"class Cls:\r\n    pass\rx = 1\n\ny = 2"
+
+        lines = parser.SourceLines(source)
+        result = (list(lines), lines[-1], lines.span(1, 3), len(lines))
+        expected = (source.splitlines(keepends=True), b"y = 2", b"    pass\rx = 1\n", 5)
+
+        assert result == expected
+        with pytest.raises(IndexError):
+            lines[5]
+
+    def test_collect_classes_budget(self):
+        python_string = textwrap.dedent(
+            """\
+        class Cls:
+            def func1(self):
+                self.variable1 = 1
+            def func2(self):
+                self.variable2 = 2
+            class Inner:
+                def func(self):
+                    self.variable = 1
+        """
+        )
+
+        node = parser.get_ast_node_from_string(python_string)
+        result = [
+            (parsed_class.qualname, [method.name for method in parsed_class.methods], parsed_class.skipped_methods)
+            for parsed_class in parser.collect_classes(node, budget=parser.AnalysisBudget(max_nodes=5).start())
+        ]
+        expected = [("Cls", ["func1"], 1), ("Cls.Inner", ["func"], 0)]
+
+        assert result == expected
+
+    def test_collect_classes_budget_expired(self):
+        node = parser.get_ast_node_from_string("class Cls:\n    def func(self):\n        pass\n")
+        budget = parser.AnalysisBudget(max_seconds=0.0).start()
+
+        result = parser.collect_classes(node, budget=budget)
+
+        assert result == []
+        assert budget.expired
+
+    def test_get_class_bases(self):
+        node = parser.get_ast_node_from_string("class Cls(Base, models.Model, Generic[T], make_base(), int): pass")
+
+        result = parser.get_class_bases(node.body[0], {"models": "django.db.models"}, "pkg.mod")
+        expected = ("pkg.mod.Base", "django.db.models.Model", "pkg.mod.Generic", "int")
+
+        assert result == expected
+
+    @pytest.mark.parametrize(
+        "get_names",
+        [
+            lambda node: [instance_variable.attr for instance_variable in parser.get_instance_variables(node)],
+            lambda node: [parsed_class.instance_variable_names for parsed_class in parser.collect_classes(node)],
+        ],
+        ids=["get_instance_variables", "collect_classes"],
+    )
+    def test_instance_variables_scale_linearly(self, get_names):
+        def synthetic_class(methods):
+            lines = ["class Cls:"]
+            for i in range(methods):
+                lines.append(f"    def func{i}(self):")
+                lines.append(f"        self.attr{i} = self.attr{i + 1}")
+                lines.append(f"        self.func{i + 1}()")
+            return "\n".join(lines)
+
+        def runtime(methods):
+            node = parser.get_ast_node_from_string(synthetic_class(methods))
+            return min(timeit.repeat(lambda: get_names(node), number=1, repeat=5))
+
+        small = runtime(500)
+        large = runtime(4000)
+
+        # eight times the nodes, a quadratic implementation would need about 64 times as long
+        assert large / small < 24
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+import textwrap
+import types
+
+import pytest
+
+from flake8_cohesion import extension
+from flake8_cohesion import parser
+from flake8_cohesion import profiling
+
+
+@pytest.fixture()
+def profile_directory(tmp_path, monkeypatch):
+    monkeypatch.delenv("FLAKE8_COHESION_PROFILE_OWNER", raising=False)
+    monkeypatch.setattr("atexit.register", lambda *args: None)
+    yield tmp_path
+    profiling.disable()
+
+
+class TestProfiling:
+    def test_profiled_disabled(self):
+        calls = []
+
+        @profiling.profiled("function")
+        def function():
+            calls.append(1)
+            return 5
+
+        result = function()
+
+        assert result == 5
+        assert calls == [1]
+        assert profiling.active is None
+
+    def test_extension_profile(self, profile_directory, monkeypatch):
+        python_string = textwrap.dedent(
+            """
+        class Cls:
+            def func(self):
+                self.variable = 'foo'
+        """
+        )
+        options = types.SimpleNamespace(
+            cohesion_below=50.0,
+            cohesion_strict=False,
+            cohesion_ignore_decorators=[],
+            cohesion_cache_dir=None,
+            cohesion_cache_size=64,
+            cohesion_memo_size=0,
+            cohesion_profile=str(profile_directory),
+            cohesion_class_index=None,
+            cohesion_max_lcom4=None,
+            cohesion_min_tcc=None,
+            cohesion_min_lcc=None,
+            cohesion_max_nodes=None,
+            cohesion_max_seconds=None,
+        )
+        monkeypatch.setattr(extension.CohesionChecker, "_cohesion_below", 50.0)
+        monkeypatch.setattr(extension.CohesionChecker, "_strict", False)
+        monkeypatch.setattr(extension.CohesionChecker, "_cache", None)
+        monkeypatch.setattr(extension.CohesionChecker, "_class_index", None)
+        monkeypatch.setattr(extension.CohesionChecker, "_max_lcom4", None)
+        monkeypatch.setattr(extension.CohesionChecker, "_min_tcc", None)
+        monkeypatch.setattr(extension.CohesionChecker, "_min_lcc", None)
+        monkeypatch.setattr(extension.CohesionChecker, "_budget", None)
+        extension.CohesionChecker.parse_options(options)
+
+        ast_node = parser.get_ast_node_from_string(python_string)
+        list(extension.CohesionChecker(ast_node, filename="a.py").run())
+        profiling.active.dump()
+        result = profiling.summary(profile_directory)
+
+        assert result["functions"]["CohesionChecker.run"][1] == 1
+        assert result["functions"]["Module.class_results"][1] == 1
+        assert result["functions"]["parser.collect_classes"][1] == 1
+        assert result["functions"]["Module._create_structure"][1] == 1
+        assert result["functions"]["Module.class_cohesion_percentage"][1] == 1
+        assert [path for _, path in result["files"]] == ["a.py"]
+        assert [name for _, name in result["classes"]] == ["a.py::Cls"]
+
+    def test_merge(self):
+        documents = [
+            {"functions": {"f": [1.0, 2]}, "files": [[0.5, "a.py"]], "classes": [[0.25, "a.py::Cls"]]},
+            {
+                "functions": {"f": [2.0, 3], "g": [1.0, 1]},
+                "files": [[1.5, "b.py"]],
+                "classes": [],
+                "counters": {"budget.truncated_classes": 2},
+            },
+        ]
+
+        result = profiling.merge(documents, top=1)
+        expected = {
+            "functions": {"f": [3.0, 5], "g": [1.0, 1]},
+            "files": [(1.5, "b.py")],
+            "classes": [(0.25, "a.py::Cls")],
+            "counters": {"budget.truncated_classes": 2},
+        }
+
+        assert result == expected
+
+    def test_profiled_generator(self, profile_directory):
+        @profiling.profiled("generator")
+        def generator():
+            yield from range(3)
+
+        profiler = profiling.enable(profile_directory)
+        result = list(generator())
+
+        assert result == [0, 1, 2]
+        assert profiler.functions["generator"][1] == 1
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+import io
+import json
+
+from flake8_cohesion import extension
+from flake8_cohesion import report
+
+CLASSES = [("Cls1", 2, 0, 50.0, 2, 2), ("Cls2", 8, 4, 100.0, 1, 1)]
+
+
+class TestReport:
+    def test_default_reporter(self):
+        stream = io.StringIO()
+
+        report.Reporter(stream, 75.0).write("a.py", CLASSES)
+        result = stream.getvalue()
+        expected = f"a.py:2:1: {extension.CohesionChecker._error_tmpl.format(50.0)}\n"
+
+        assert result == expected
+
+    def test_jsonl_reporter(self):
+        stream = io.StringIO()
+
+        report.JsonLinesReporter(stream, 75.0).write("a.py", CLASSES)
+        result = [json.loads(line) for line in stream.getvalue().splitlines()]
+        expected = [
+            {
+                "name": "Cls1",
+                "path": "a.py::Cls1",
+                "line": 2,
+                "cohesion": 50.0,
+                "variable_count": 2,
+                "relevant_method_count": 2,
+            },
+            {
+                "name": "Cls2",
+                "path": "a.py::Cls2",
+                "line": 8,
+                "cohesion": 100.0,
+                "variable_count": 1,
+                "relevant_method_count": 1,
+            },
+        ]
+
+        assert result == expected
+
+    def test_csv_reporter(self):
+        stream = io.StringIO()
+
+        reporter = report.CsvReporter(stream, 75.0)
+        reporter.write("a.py", CLASSES[:1])
+        reporter.write("b.py", CLASSES[1:])
+        result = stream.getvalue().splitlines()
+        expected = [
+            "name,path,line,cohesion,variable_count,relevant_method_count",
+            "Cls1,a.py::Cls1,2,50.0,2,2",
+            "Cls2,b.py::Cls2,8,100.0,1,1",
+        ]
+
+        assert result == expected
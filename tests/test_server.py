@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+import json
+import socket
+import textwrap
+import threading
+
+import pytest
+
+from flake8_cohesion import server
+
+SOURCE = textwrap.dedent(
+    """
+class Cls:
+    def __init__(self):
+        self.a = 1
+        self.b = 2
+    def func(self):
+        return self.a
+"""
+)
+
+
+def request(request_id, method, **params):
+    return json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+
+
+class TestServer:
+    def test_score(self):
+        cohesion_server = server.CohesionServer()
+
+        result = cohesion_server.handle(request(1, "open", path="a.py", source=SOURCE))
+        expected = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "result": {
+                "classes": [
+                    {
+                        "name": "Cls",
+                        "line": 2,
+                        "column": 1,
+                        "cohesion": 75.0,
+                        "variable_count": 2,
+                        "relevant_method_count": 2,
+                        "violation": False,
+                    },
+                ],
+                "error": None,
+            },
+        }
+
+        assert result == expected
+
+    def test_score_unchanged_source_is_not_parsed_again(self):
+        cohesion_server = server.CohesionServer()
+        cohesion_server.handle(request(1, "open", path="a.py", source=SOURCE))
+        document = cohesion_server.documents["a.py"]
+
+        cohesion_server.handle(request(2, "score", path="a.py", source=SOURCE))
+        unchanged = cohesion_server.documents["a.py"]
+        cohesion_server.handle(request(3, "score", path="a.py", source=SOURCE + "\n"))
+        changed = cohesion_server.documents["a.py"]
+
+        assert unchanged is document
+        assert changed is not document
+
+    def test_score_file(self, tmp_path):
+        path = tmp_path / "a.py"
+        path.write_text(SOURCE, encoding="utf-8")
+        cohesion_server = server.CohesionServer(cohesion_below=80.0)
+
+        response = cohesion_server.handle(request(1, "score", path=str(path)))
+        result = [record["violation"] for record in response["result"]["classes"]]
+
+        assert result == [True]
+
+    def test_score_syntax_error(self):
+        cohesion_server = server.CohesionServer()
+
+        response = cohesion_server.handle(request(1, "score", path="a.py", source="class Cls(:\n"))
+        result = (response["result"]["classes"], response["result"]["error"].split(":")[0])
+        expected = ([], "SyntaxError")
+
+        assert result == expected
+
+    def test_score_class(self):
+        cohesion_server = server.CohesionServer()
+
+        response = cohesion_server.handle(request(1, "class", path="a.py", source=SOURCE, name="Cls"))
+        result = {key: response["result"][key] for key in ("name", "cohesion", "lcom1", "lcom4", "tcc")}
+        expected = {"name": "Cls", "cohesion": 75.0, "lcom1": 0, "lcom4": 1, "tcc": 1.0}
+
+        assert result == expected
+
+    @pytest.mark.parametrize(
+        ("message", "code"),
+        [
+            ("{", server.PARSE_ERROR),
+            ('{"id": 1}', server.INVALID_REQUEST),
+            (request(1, "unknown"), server.METHOD_NOT_FOUND),
+            (request(1, "score"), server.INVALID_PARAMS),
+            (request(1, "score", path="a.py", source=1), server.INVALID_PARAMS),
+            (request(1, "score", path="missing.py"), server.INVALID_PARAMS),
+            (request(1, "class", path="a.py", source=SOURCE, name="Missing"), server.INVALID_PARAMS),
+        ],
+    )
+    def test_handle_error(self, message, code, monkeypatch, tmp_path):
+        monkeypatch.chdir(tmp_path)
+        cohesion_server = server.CohesionServer()
+
+        result = cohesion_server.handle(message)["error"]["code"]
+
+        assert result == code
+
+    def test_max_documents(self):
+        cohesion_server = server.CohesionServer(max_documents=2)
+
+        for path in ("a.py", "b.py", "c.py"):
+            cohesion_server.handle(request(1, "open", path=path, source=SOURCE))
+        cohesion_server.handle(request(2, "close", path="c.py"))
+        result = list(cohesion_server.documents)
+
+        assert result == ["b.py"]
+
+    def test_serve(self):
+        cohesion_server = server.CohesionServer()
+        lines = [
+            request(1, "initialize"),
+            "\n",
+            json.dumps({"jsonrpc": "2.0", "method": "open", "params": {"path": "a.py", "source": SOURCE}}),
+            request(2, "shutdown"),
+            request(3, "initialize"),
+        ]
+        output = []
+
+        server.serve(cohesion_server, lines, output.append)
+        result = [json.loads(line)["id"] for line in output]
+
+        assert result == [1, 2]
+        assert list(cohesion_server.documents) == ["a.py"]
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="requires Unix sockets")
+    def test_serve_socket(self, tmp_path):
+        path = str(tmp_path / "server.sock")
+        cohesion_server = server.CohesionServer()
+        thread = threading.Thread(target=server.serve_socket, args=(cohesion_server, path))
+        thread.start()
+        while not (tmp_path / "server.sock").exists():
+            pass
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(path)
+            messages = [request(1, "score", path="a.py", source=SOURCE), request(2, "shutdown")]
+            client.sendall("".join(message + "\n" for message in messages).encode())
+            result = [json.loads(line)["id"] for line in client.makefile("rb")]
+        thread.join(timeout=5)
+
+        assert result == [1, 2]
+        assert not thread.is_alive()
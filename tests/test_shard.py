@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+
+from flake8_cohesion import batch
+from flake8_cohesion import shard
+
+
+def class_result(name, cohesion):
+    return (name, 2, 0, cohesion, 2, 2)
+
+
+class TestShard:
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [("1/4", (1, 4)), ("4/4", (4, 4))],
+    )
+    def test_parse_shard(self, value, expected):
+        result = shard.parse_shard(value)
+
+        assert result == expected
+
+    @pytest.mark.parametrize("value", ["4", "0/4", "5/4", "a/4", "-1/4"])
+    def test_parse_shard_invalid(self, value):
+        with pytest.raises(ValueError):
+            shard.parse_shard(value)
+
+    def test_select(self):
+        paths = [f"pkg/module{index}.py" for index in range(100)]
+
+        shards = [list(shard.select(paths, index, 4)) for index in range(1, 5)]
+        result = sorted(path for shard_paths in shards for path in shard_paths)
+
+        assert result == sorted(paths)
+        assert all(shard_paths for shard_paths in shards)
+
+    def test_shard_of_is_stable(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+
+        result = (shard.shard_of("pkg/a.py", 8), shard.shard_of(str(tmp_path / "pkg" / "a.py"), 8))
+        expected = (shard.shard_of("./pkg/a.py", 8),) * 2
+
+        assert result == expected
+
+    def test_merge(self, tmp_path):
+        first = shard.PartialResult((1, 2))
+        first.add(batch.FileResult("b.py", [class_result("Cls1", 50.0)]))
+        first.add(batch.FileResult("c.py", [], "SyntaxError: invalid syntax"))
+        second = shard.PartialResult((2, 2))
+        second.add(batch.FileResult("a.py", [class_result("Cls2", 100.0), class_result("Cls3", 25.0)]))
+        first.save_to(tmp_path / "1.json")
+        second.save_to(tmp_path / "2.json")
+
+        merged = shard.merge([tmp_path / "1.json", tmp_path / "2.json"])
+        result = (
+            merged.files,
+            merged.errors,
+            merged.file_results(),
+            merged.histogram,
+            merged.violations(50.0),
+            merged.missing_shards,
+        )
+        expected = (
+            3,
+            [("c.py", "SyntaxError: invalid syntax")],
+            [
+                ("a.py", [class_result("Cls2", 100.0), class_result("Cls3", 25.0)]),
+                ("b.py", [class_result("Cls1", 50.0)]),
+            ],
+            [0, 0, 1, 0, 0, 1, 0, 0, 0, 1],
+            2,
+            [],
+        )
+
+        assert result == expected
+
+    def test_merge_missing_shard(self):
+        partial_result = shard.PartialResult((2, 3))
+
+        result = partial_result.missing_shards
+
+        assert result == [1, 3]
+
+    @pytest.mark.parametrize(
+        "other",
+        [shard.PartialResult((1, 2)), shard.PartialResult((2, 3)), shard.PartialResult((2, 2), strict=True)],
+        ids=["duplicate", "count", "options"],
+    )
+    def test_merge_incompatible(self, other):
+        partial_result = shard.PartialResult((1, 2))
+
+        with pytest.raises(ValueError):
+            partial_result.merge(other)
+
+    @pytest.mark.parametrize(
+        "document",
+        [{"version": "0.0.0", "format": shard.PARTIAL_FORMAT}, {}, []],
+        ids=["version", "keys", "type"],
+    )
+    def test_load_invalid(self, tmp_path, document):
+        path = tmp_path / "partial.json"
+        path.write_text(json.dumps(document), encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            shard.PartialResult.load_from(path)
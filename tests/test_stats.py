@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+
+import pytest
+
+from flake8_cohesion import stats
+
+
+class TestStats:
+    @pytest.mark.parametrize(
+        ("cohesion", "expected"),
+        [(0.0, 0), (9.99, 0), (50.0, 5), (99.99, 9), (100.0, 9)],
+    )
+    def test_histogram_bucket(self, cohesion, expected):
+        result = stats.histogram_bucket(cohesion)
+
+        assert result == expected
+
+    def test_quantiles(self):
+        sketch = stats.QuantileSketch()
+        for cohesion in range(1, 101):
+            sketch.add(float(cohesion))
+
+        result = sketch.quantiles([99, 50, 90, 0])
+        expected = [99.0, 50.0, 90.0, 1.0]
+
+        assert result == expected
+
+    def test_quantiles_exact(self):
+        values = [33.33, 12.5, 66.67, 12.5, 100.0, 0.0, 75.0]
+        sketch = stats.QuantileSketch()
+        for cohesion in values:
+            sketch.add(cohesion)
+
+        result = sketch.quantiles([50, 100])
+        expected = [sorted(values)[3], 100.0]
+
+        assert result == expected
+
+    def test_quantiles_empty(self):
+        result = stats.QuantileSketch().quantiles([50])
+
+        assert result == [None]
+
+    def test_cohesion_stats(self):
+        cohesion_stats = stats.CohesionStats()
+        for cohesion in (25.0, 50.0, 100.0):
+            cohesion_stats.add(cohesion)
+
+        result = cohesion_stats.to_dict()
+        expected = {
+            "count": 3,
+            "total": 175.0,
+            "minimum": 25.0,
+            "maximum": 100.0,
+            "mean": 58.33,
+            "p50": 50.0,
+            "p90": 100.0,
+            "p99": 100.0,
+            "histogram": [0, 0, 1, 0, 0, 1, 0, 0, 0, 1],
+            "sketch": [[2500, 1], [5000, 1], [10000, 1]],
+        }
+
+        assert result == expected
+
+    def test_merge(self):
+        first = stats.Aggregator()
+        first.add_classes(os.path.join("pkg", "a.py"), [("Cls1", 2, 0, 50.0, 2, 2)])
+        second = stats.Aggregator()
+        second.add(os.path.join("pkg", "b.py"), 100.0)
+        second.add(os.path.join("pkg", "sub", "c.py"), 0.0)
+        everything = stats.Aggregator()
+        for path, cohesion in (("a.py", 50.0), ("b.py", 100.0), ("c.py", 0.0)):
+            everything.add(path, cohesion)
+
+        first.merge(second)
+        result = {directory: cohesion_stats.to_dict() for directory, cohesion_stats in first.summary().items()}
+
+        assert sorted(result) == ["pkg", os.path.join("pkg", "sub")]
+        assert result["pkg"]["count"] == 2
+        assert first.total().to_dict() == everything.total().to_dict()
+
+    def test_summary_depth(self):
+        aggregator = stats.Aggregator()
+        for path in ("a.py", os.path.join("pkg", "a.py"), os.path.join("pkg", "sub", "a.py")):
+            aggregator.add(path, 100.0)
+
+        result = [
+            {directory: cohesion_stats.count for directory, cohesion_stats in aggregator.summary(depth).items()}
+            for depth in (0, 1)
+        ]
+        expected = [{"": 3}, {"": 1, "pkg": 2}]
+
+        assert result == expected
+
+    def test_save_load(self, tmp_path):
+        aggregator = stats.Aggregator()
+        aggregator.add(os.path.join("pkg", "a.py"), 12.5)
+        aggregator.add(os.path.join("pkg", "b.py"), 87.5)
+        aggregator.save_to(tmp_path / "stats.json")
+
+        loaded = stats.Aggregator.load_from(tmp_path / "stats.json")
+        result = {directory: cohesion_stats.to_dict() for directory, cohesion_stats in loaded.summary().items()}
+        expected = {directory: cohesion_stats.to_dict() for directory, cohesion_stats in aggregator.summary().items()}
+
+        assert result == expected
+
+    def test_load_invalid(self, tmp_path):
+        path = tmp_path / "stats.json"
+        path.write_text(json.dumps({"version": "0.0.0", "format": stats.STATS_FORMAT}), encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            stats.Aggregator.load_from(path)
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+
+from flake8_cohesion import storage
+
+
+class TestStorage:
+    def test_atomic_write_json(self, tmp_path):
+        path = tmp_path / "document.json"
+        path.write_text("[]", encoding="utf-8")
+
+        storage.atomic_write_json(path, {"key": [1, 2]})
+        result = (json.loads(path.read_text(encoding="utf-8")), sorted(tmp_path.iterdir()))
+        expected = ({"key": [1, 2]}, [path])
+
+        assert result == expected
+
+    def test_atomic_write_json_error(self, tmp_path):
+        path = tmp_path / "document.json"
+        path.write_text("[]", encoding="utf-8")
+
+        with pytest.raises(TypeError):
+            storage.atomic_write_json(path, {"key": object()})
+        result = (path.read_text(encoding="utf-8"), sorted(tmp_path.iterdir()))
+        expected = ("[]", [path])
+
+        assert result == expected
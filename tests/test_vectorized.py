@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+import textwrap
+
+import pytest
+
+from flake8_cohesion import module
+from flake8_cohesion import vectorized
+
+np = pytest.importorskip("numpy")
+
+SOURCE = textwrap.dedent(
+    """
+class Empty:
+    pass
+
+class Cls:
+    def __init__(self):
+        self.a = 1
+        self.b = 2
+        self._c = 3
+    def func1(self):
+        return self.a + self.b
+    def func2(self):
+        return self.b
+    def func3(self):
+        return self.c
+    @property
+    def prop(self):
+        return self.a
+
+class Called:
+    def func1(self):
+        self.variable = self.helper
+    def func2(self):
+        self.helper()
+
+class Outer:
+    def func(self):
+        self.variable = 1
+    class Inner:
+        def func1(self):
+            self.variable1 = 1
+        def func2(self):
+            self.variable2 = 2
+"""
+)
+
+
+class TestVectorized:
+    def test_incidence(self):
+        python_module = module.Module.from_string(SOURCE)
+
+        incidence = vectorized.Incidence(python_module.structure["Cls"])
+        result = (incidence.methods, incidence.variables, incidence.variable_count, incidence.matrix.tolist())
+        expected = (
+            ("__init__", "func1", "func2", "func3"),
+            ("a", "b", "c"),
+            3,
+            [[True, True, True], [True, True, False], [False, True, False], [False, False, True]],
+        )
+
+        assert result == expected
+
+    def test_incidence_method_only_names(self):
+        python_module = module.Module.from_string(SOURCE)
+
+        incidence = vectorized.Incidence(python_module.structure["Called"])
+        result = (incidence.variables, incidence.variable_count)
+        expected = (("variable", "helper"), 1)
+
+        assert result == expected
+
+    def test_score_matches_module(self):
+        python_module = module.Module.from_string(SOURCE)
+
+        result = [metrics.cohesion for metrics in vectorized.score(list(python_module.structure.values()))]
+        expected = [python_module.class_cohesion_percentage(class_name) for class_name in python_module.classes]
+
+        assert result == expected
+
+    def test_score_lcom(self):
+        python_module = module.Module.from_string(SOURCE)
+
+        result = vectorized.score([python_module.structure["Cls"]])
+        expected = [vectorized.ClassMetrics(58.33, 2, 0, (4 - 7 / 3) / 3)]
+
+        assert result == expected
+
+    def test_score_single_method(self):
+        python_module = module.Module.from_string(SOURCE)
+
+        result = vectorized.score([python_module.structure["Outer"], python_module.structure["Empty"]])
+        expected = [vectorized.ClassMetrics(33.33, 0, 0, 0.0), vectorized.ClassMetrics(100.0, 0, 0, 0.0)]
+
+        assert result == expected
+
+    def test_score_empty(self):
+        result = vectorized.score([])
+
+        assert result == []
+
+    def test_score_batches(self):
+        python_module = module.Module.from_string(SOURCE)
+        classes = list(python_module.structure.values())
+
+        result = vectorized.score(classes, max_cells=1)
+        expected = vectorized.score(classes)
+
+        assert result == expected
+
+    def test_batches(self):
+        python_module = module.Module.from_string(SOURCE)
+        incidences = [vectorized.Incidence(class_structure) for class_structure in python_module.structure.values()]
+
+        result = list(vectorized.batches(incidences, max_cells=40))
+        expected = [[0, 3, 2, 4], [1]]
+
+        assert result == expected
+
+    def test_score_module(self):
+        python_module = module.Module.from_string(SOURCE)
+
+        metrics = vectorized.score_module(python_module)
+        result = {
+            class_name: class_structure.cohesion for class_name, class_structure in python_module.structure.items()
+        }
+        expected = {class_name: class_metrics.cohesion for class_name, class_metrics in metrics.items()}
+
+        assert result == expected
+        assert list(metrics) == ["Empty", "Cls", "Called", "Outer", "Outer.Inner"]